@@ -0,0 +1,8 @@
+"""Motores de analisis y bots: busqueda, evaluadores y tablas."""
+from .search import ExpectiminimaxSearch, race_evaluator, terminal_value, ROLLS
+from .transposition import TranspositionTable
+from .bearoff import OneSidedBearoff
+from .twosided import TwoSidedBearoff
+
+__all__ = ["ExpectiminimaxSearch", "race_evaluator", "terminal_value", "ROLLS", "TranspositionTable", "OneSidedBearoff",
+           "TwoSidedBearoff"]
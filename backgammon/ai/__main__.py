@@ -0,0 +1,27 @@
+import argparse
+from . import bearoff, twosided
+
+
+def run() -> None:
+    parser = argparse.ArgumentParser(prog="python -m backgammon.ai",
+                                     description="Genera las bases de retiro")
+    parser.add_argument("path", help="Archivo de salida")
+    parser.add_argument("--checkers", type=int, default=None,
+                        help=f"Fichas maximas (por defecto {bearoff.MAX_CHECKERS}, o 6 con --two-sided)")
+    parser.add_argument("--two-sided", action="store_true", help="Base de dos lados (probabilidad de ganar)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Procesos para la base de dos lados (por defecto todos los nucleos)")
+    args = parser.parse_args()
+    if args.two_sided:
+        checkers = args.checkers or twosided.MAX_CHECKERS
+        total = twosided.build(args.path, checkers, workers=args.workers,
+                               progress=lambda layer, layers: print(f"\rcapa {layer}/{layers}", end="", flush=True))
+        print(f"\r{total}x{total} pares escritos en {args.path}")
+        return
+    total = bearoff.write(args.path, args.checkers or bearoff.MAX_CHECKERS,
+                          progress=lambda done, total: print(f"\r{done}/{total}", end="", flush=True))
+    print(f"\r{total} posiciones escritas en {args.path}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,207 @@
+"""
+Evaluacion vectorizada de muchas posiciones a la vez (requiere numpy).
+
+Un lote es un array 2-D de enteros (n, 28): una fila por tablero con el mismo layout que
+Board.state (puntos 0..23 con signo, barras 24/25, borne 26/27). Todas las funciones
+trabajan sobre el lote completo sin recorrer filas en Python.
+
+Las funciones por jugador devuelven (n, 2): columna 0 = WHITE, columna 1 = BLACK.
+Donde se pide player se puede pasar un Player o un array con Player.value por fila.
+"""
+from array import array
+import numpy as np
+from backgammon.core.board import Board, BAR_SLOT, BORNE_SLOT, STATE_SIZE, BAR_PIPS
+from backgammon.core.player import Player
+from backgammon.core.movegen import generate_plays
+
+WHITE_PIPS = np.arange(1, 25, dtype=np.int32)   #Pips de una ficha blanca en cada punto
+BLACK_PIPS = np.arange(24, 0, -1, dtype=np.int32)
+_INDEX = np.arange(24)
+
+FEATURE_NAMES = (
+    "pips", "opp_pips", "blots", "opp_blots", "points", "opp_points",
+    "bar", "opp_bar", "borne", "opp_borne", "contact",
+)
+_FEATURE_SCALE = np.array([100, 100, 15, 15, 12, 12, 15, 15, 15, 15, 1], dtype=np.float32)
+
+
+def as_batch(positions) -> np.ndarray:
+    """
+    Arma el lote (n, 28) int8 a partir de un array, una lista de Boards o de estados (array 'b').
+    """
+    if isinstance(positions, (Board, array)):
+        positions = [positions]
+    if isinstance(positions, np.ndarray):
+        batch = positions.astype(np.int8, copy=False)
+    else:
+        rows = [p.state if isinstance(p, Board) else p for p in positions]
+        batch = np.frombuffer(b"".join(bytes(r) for r in rows), dtype=np.int8).reshape(-1, STATE_SIZE)
+    if batch.ndim == 1:
+        batch = batch[None, :]
+    if batch.ndim != 2 or batch.shape[1] != STATE_SIZE:
+        raise ValueError(f"El lote debe tener forma (n, {STATE_SIZE})")
+    return batch
+
+
+def checker_counts(batch: np.ndarray) -> tuple:
+    """Fichas por punto (n, 24) de WHITE y de BLACK."""
+    points = batch[:, :24].astype(np.int16)
+    return np.maximum(-points, 0), np.maximum(points, 0)
+
+
+def _per_side(white, black) -> np.ndarray:
+    return np.stack((white, black), axis=1)
+
+
+def pip_counts(batch: np.ndarray) -> np.ndarray:
+    white, black = checker_counts(batch)
+    return _per_side(
+        white @ WHITE_PIPS + batch[:, BAR_SLOT[Player.WHITE]].astype(np.int32) * BAR_PIPS,
+        black @ BLACK_PIPS + batch[:, BAR_SLOT[Player.BLACK]].astype(np.int32) * BAR_PIPS,
+    )
+
+
+def blot_counts(batch: np.ndarray) -> np.ndarray:
+    """Puntos con una sola ficha."""
+    white, black = checker_counts(batch)
+    return _per_side((white == 1).sum(axis=1), (black == 1).sum(axis=1))
+
+
+def point_counts(batch: np.ndarray) -> np.ndarray:
+    """Puntos hechos (dos o mas fichas)."""
+    white, black = checker_counts(batch)
+    return _per_side((white >= 2).sum(axis=1), (black >= 2).sum(axis=1))
+
+
+def bar_counts(batch: np.ndarray) -> np.ndarray:
+    return _per_side(batch[:, BAR_SLOT[Player.WHITE]], batch[:, BAR_SLOT[Player.BLACK]]).astype(np.int32)
+
+
+def borne_counts(batch: np.ndarray) -> np.ndarray:
+    return _per_side(batch[:, BORNE_SLOT[Player.WHITE]], batch[:, BORNE_SLOT[Player.BLACK]]).astype(np.int32)
+
+
+def contact(batch: np.ndarray) -> np.ndarray:
+    """
+    True donde todavia hay contacto: la ficha mas atrasada de WHITE (que avanza hacia 0)
+    esta detras de la mas atrasada de BLACK (que avanza hacia 23). False = carrera pura.
+    """
+    white, black = checker_counts(batch)
+    white_back = np.where(white > 0, _INDEX, -1).max(axis=1)
+    white_back = np.where(batch[:, BAR_SLOT[Player.WHITE]] > 0, 24, white_back)
+    black_back = np.where(black > 0, _INDEX, 24).min(axis=1)
+    black_back = np.where(batch[:, BAR_SLOT[Player.BLACK]] > 0, -1, black_back)
+    return white_back > black_back
+
+
+def win_points(batch: np.ndarray, winner) -> np.ndarray:
+    """
+    Puntos (1/2/3) que gana winner en cada fila, como Board.win_points.
+    Solo tiene sentido en las filas donde winner ya retiro sus 15 fichas.
+    """
+    white_wins = _white_mask(batch, winner)
+    white, black = checker_counts(batch)
+    loser_borne = np.where(white_wins, batch[:, BORNE_SLOT[Player.BLACK]], batch[:, BORNE_SLOT[Player.WHITE]])
+    loser_bar = np.where(white_wins, batch[:, BAR_SLOT[Player.BLACK]], batch[:, BAR_SLOT[Player.WHITE]])
+    loser_in_home = np.where(white_wins, black[:, 0:6].sum(axis=1), white[:, 18:24].sum(axis=1))
+    backgammon = (loser_bar > 0) | (loser_in_home > 0)
+    return np.where(loser_borne > 0, 1, np.where(backgammon, 3, 2))
+
+
+def _white_mask(batch: np.ndarray, player):
+    if isinstance(player, Player):
+        return np.full(len(batch), player is Player.WHITE)
+    return np.asarray(player) < 0
+
+
+def _mine(values: np.ndarray, white_mask) -> tuple:#(n, 2) por color -> (propios, del rival)
+    return (np.where(white_mask, values[:, 0], values[:, 1]),
+            np.where(white_mask, values[:, 1], values[:, 0]))
+
+
+def features(batch: np.ndarray, player) -> np.ndarray:
+    """
+    Matriz (n, len(FEATURE_NAMES)) float32 desde el punto de vista de player, normalizada
+    a valores chicos (pips / 100, fichas / 15, puntos / 12).
+    """
+    white_mask = _white_mask(batch, player)
+    columns = []
+    for values in (pip_counts(batch), blot_counts(batch), point_counts(batch),
+                   bar_counts(batch), borne_counts(batch)):
+        columns.extend(_mine(values, white_mask))
+    columns.append(contact(batch))
+    return np.stack(columns, axis=1).astype(np.float32) / _FEATURE_SCALE
+
+
+class LinearEvaluator:
+    """
+    equity = tanh(features @ weights + bias), en (-1, 1) para el jugador que esta por tirar.
+    Sirve como evaluator de ExpectiminimaxSearch (llamado con un Board) y tiene
+    evaluate_states para lotes, que la busqueda usa para puntuar todas las jugadas juntas.
+    """
+
+    def __init__(self, weights=None, bias: float = 0.0):
+        if weights is None:
+            weights = np.zeros(len(FEATURE_NAMES), dtype=np.float32)
+        weights = np.asarray(weights, dtype=np.float32)
+        if weights.shape != (len(FEATURE_NAMES),):
+            raise ValueError(f"Se esperan {len(FEATURE_NAMES)} pesos ({', '.join(FEATURE_NAMES)})")
+        self.weights = weights
+        self.bias = float(bias)
+
+    @classmethod
+    def race(cls) -> "LinearEvaluator":
+        """Los mismos valores que race_evaluator: tanh((pips_rival - pips + 8) / 40)."""
+        weights = np.zeros(len(FEATURE_NAMES), dtype=np.float32)
+        weights[FEATURE_NAMES.index("pips")] = -100 / 40
+        weights[FEATURE_NAMES.index("opp_pips")] = 100 / 40
+        return cls(weights, bias=8 / 40)
+
+    def evaluate_states(self, batch, player) -> np.ndarray:
+        return np.tanh(features(as_batch(batch), player) @ self.weights + self.bias)
+
+    def __call__(self, board: Board, player: Player) -> float:
+        return float(self.evaluate_states(board.state, player)[0])
+
+
+class MLPEvaluator:
+    """
+    Red chica: una capa oculta tanh y salida tanh sobre las mismas features.
+    Sin pesos se inicializa al azar (seed) con valores chicos.
+    """
+
+    def __init__(self, hidden: int = 16, seed=None, w1=None, b1=None, w2=None, b2: float = 0.0):
+        rng = np.random.default_rng(seed)
+        inputs = len(FEATURE_NAMES)
+        self.w1 = np.asarray(w1 if w1 is not None else rng.normal(0, 1 / np.sqrt(inputs), (inputs, hidden)),
+                             dtype=np.float32)
+        hidden = self.w1.shape[1]
+        self.b1 = np.asarray(b1 if b1 is not None else np.zeros(hidden), dtype=np.float32)
+        self.w2 = np.asarray(w2 if w2 is not None else rng.normal(0, 1 / np.sqrt(hidden), hidden),
+                             dtype=np.float32)
+        self.b2 = float(b2)
+        if self.w1.shape[0] != inputs or self.b1.shape != (hidden,) or self.w2.shape != (hidden,):
+            raise ValueError("Dimensiones de pesos inconsistentes")
+
+    def evaluate_states(self, batch, player) -> np.ndarray:
+        h = np.tanh(features(as_batch(batch), player) @ self.w1 + self.b1)
+        return np.tanh(h @ self.w2 + self.b2)
+
+    def __call__(self, board: Board, player: Player) -> float:
+        return float(self.evaluate_states(board.state, player)[0])
+
+
+def evaluate_plays(board: Board, player: Player, dice, evaluator) -> tuple:
+    """
+    Genera las jugadas de la tirada y las puntua todas en una sola llamada.
+    Devuelve (jugadas, equities) con la equity de player despues de cada jugada
+    (las que terminan la partida valen sus puntos: 1, 2 o 3).
+    """
+    opponent = Player.BLACK if player is Player.WHITE else Player.WHITE
+    generated = generate_plays(board, player, dice)
+    batch = as_batch([state for _, state in generated])
+    values = -evaluator.evaluate_states(batch, opponent)
+    won = batch[:, BORNE_SLOT[player]] == 15
+    if won.any():
+        values = np.where(won, win_points(batch, player), values)
+    return [play for play, _ in generated], values
@@ -0,0 +1,268 @@
+"""
+Base de datos de retiro de un solo lado (one-sided bear-off).
+
+Para cada distribucion de hasta N fichas en los 6 puntos del home (sin contacto con el rival)
+guarda, calculado por programacion dinamica:
+-la cantidad esperada de tiradas para retirar todas las fichas
+-la distribucion: probabilidad de terminar en exactamente k tiradas (k < MAX_ROLLS)
+
+Las jugadas siguen las reglas de Board.move: maximo MAX_STACK fichas por punto y
+cualquier dado que sobra alcanza para retirar. En cada tirada se elige la jugada que
+minimiza las tiradas esperadas.
+
+Archivo: encabezado fijo (HEADER) y un registro por posicion, en el orden de position_index:
+float32 tiradas esperadas + MAX_ROLLS uint16 (probabilidad * 65535). Se abre con mmap
+(solo lectura), asi todos los procesos comparten las mismas paginas.
+Se genera con: python -m backgammon.ai <archivo>
+"""
+import math
+import mmap
+import struct
+from array import array
+from backgammon.core.board import Board, MAX_STACK
+from backgammon.core.player import Player
+
+MAGIC = b"BGBO"
+VERSION = 1
+POINTS = 6
+MAX_CHECKERS = 15
+MAX_ROLLS = 32  #La cola (>= MAX_ROLLS - 1 tiradas) se acumula en el ultimo casillero
+SCALE = 65535
+HEADER = struct.Struct("<4sHHHHI")  #magic, version, puntos, fichas maximas, tiradas, posiciones
+
+_ROLLS = tuple(
+    ((a, b), (1 if a == b else 2) / 36)
+    for a in range(1, 7) for b in range(a, 7)
+)
+
+
+def _combinations(n: int, k: int) -> int:
+    return math.comb(n, k) if 0 <= k <= n else 0
+
+
+def position_count(max_checkers: int = MAX_CHECKERS, points: int = POINTS) -> int:
+    """Cantidad de distribuciones de 0..max_checkers fichas en points puntos."""
+    return _combinations(max_checkers + points, points)
+
+
+def position_index(counts, max_checkers: int = MAX_CHECKERS) -> int:
+    """
+    Indice (orden lexicografico) de una distribucion. counts[i] = fichas a i+1 pips de salir.
+    """
+    points = len(counts)
+    rest = max_checkers
+    index = 0
+    for i, c in enumerate(counts):
+        free = points - i - 1
+        for v in range(c):
+            index += _combinations(rest - v + free, free)
+        rest -= c
+    if rest < 0:
+        raise ValueError(f"Mas de {max_checkers} fichas")
+    return index
+
+
+def positions(max_checkers: int = MAX_CHECKERS, points: int = POINTS):
+    """Todas las distribuciones en el orden de position_index."""
+    if points == 0:
+        yield ()
+        return
+    for c in range(max_checkers + 1):
+        for tail in positions(max_checkers - c, points - 1):
+            yield (c,) + tail
+
+
+def home_counts(board: Board, player: Player) -> tuple:
+    """Fichas de player en su home, ordenadas por distancia a la salida (1..6 pips)."""
+    if player is Player.WHITE:
+        return tuple(board.count_at(i) for i in range(6))
+    return tuple(board.count_at(23 - i) for i in range(6))
+
+
+def _moves(pos: tuple, die: int) -> list:
+    """Posiciones a las que se llega moviendo una ficha con die."""
+    result = []
+    for i, c in enumerate(pos):
+        if not c:
+            continue
+        dest = i - die
+        if dest < 0:
+            result.append(pos[:i] + (c - 1,) + pos[i + 1:])
+        elif pos[dest] < MAX_STACK:
+            p = list(pos)
+            p[i] -= 1
+            p[dest] += 1
+            result.append(tuple(p))
+    return result
+
+
+def plays(pos: tuple, dice) -> set:
+    """
+    Posiciones finales legales para la tirada (misma regla que movegen: usar la mayor
+    cantidad de dados y, si solo se puede usar uno de dos distintos, el mayor).
+    """
+    a, b = dice
+    orders = ((a, a, a, a),) if a == b else ((a, b), (b, a))
+    found = {}  #posicion -> (dados usados, primer dado)
+    best = 0
+    seen = set()
+
+    def walk(p, order, k, first):
+        nonlocal best
+        key = (p, order, k, first)
+        if key in seen:
+            return
+        seen.add(key)
+        nexts = _moves(p, order[k]) if k < len(order) else []
+        if not nexts:
+            best = max(best, k)
+            found.setdefault((p, k), set()).add(first)
+            return
+        for q in nexts:
+            walk(q, order, k + 1, order[0] if first is None else first)
+
+    for order in orders:
+        walk(pos, order, 0, None)
+    result = {p for (p, k) in found if k == best}
+    if best == 1 and a != b:
+        high = max(a, b)
+        with_high = {p for (p, k), firsts in found.items() if k == 1 and high in firsts}
+        if with_high:
+            result = with_high
+    return result
+
+
+def build(max_checkers: int = MAX_CHECKERS, progress=None) -> tuple:
+    """
+    Calcula la tabla. Devuelve (esperadas, distribuciones): array('d') y lista de listas,
+    indexadas con position_index. progress(hechas, total) se llama cada 1000 posiciones.
+    """
+    total = position_count(max_checkers)
+    expected = array('d', bytes(8 * total))
+    dists = [None] * total
+    empty = [0.0] * MAX_ROLLS
+    empty[0] = 1.0
+    dists[0] = empty
+
+    #Las jugadas siempre bajan los pips: procesando por pips los hijos ya estan calculados
+    order = sorted(positions(max_checkers), key=lambda p: sum((i + 1) * c for i, c in enumerate(p)))
+    index = {p: position_index(p, max_checkers) for p in order}
+    for done, pos in enumerate(order):
+        idx = index[pos]
+        if idx == 0:
+            continue
+        e = 1.0
+        dist = [0.0] * MAX_ROLLS
+        for dice, prob in _ROLLS:
+            child = min((index[q] for q in plays(pos, dice)), key=expected.__getitem__)
+            e += prob * expected[child]
+            child_dist = dists[child]
+            for k in range(MAX_ROLLS - 1):
+                dist[k + 1] += prob * child_dist[k]
+            dist[MAX_ROLLS - 1] += prob * child_dist[MAX_ROLLS - 1]
+        expected[idx] = e
+        dists[idx] = dist
+        if progress is not None and done % 1000 == 0:
+            progress(done, total)
+    return expected, dists
+
+
+def write(path: str, max_checkers: int = MAX_CHECKERS, progress=None) -> int:
+    """Genera la base y la escribe en path. Devuelve la cantidad de posiciones."""
+    expected, dists = build(max_checkers, progress)
+    total = len(expected)
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, POINTS, max_checkers, MAX_ROLLS, total))
+        for idx in range(total):
+            scaled = array('H', (min(SCALE, round(p * SCALE)) for p in dists[idx]))
+            f.write(struct.pack("<f", expected[idx]))
+            f.write(scaled.tobytes())
+    return total
+
+
+class OneSidedBearoff:
+    """
+    Lector de la base (mmap de solo lectura). Se puede pasar a otros procesos:
+    al deserializarse vuelve a mapear el mismo archivo.
+    """
+
+    RECORD = struct.Struct(f"<f{MAX_ROLLS}H")
+
+    def __init__(self, path: str):
+        self.__path__ = path
+        with open(path, "rb") as f:
+            self.__map__ = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, points, max_checkers, rolls, total = HEADER.unpack_from(self.__map__, 0)
+        if magic != MAGIC or version != VERSION or points != POINTS or rolls != MAX_ROLLS:
+            self.__map__.close()
+            raise ValueError(f"{path} no es una base de retiro valida")
+        if len(self.__map__) != HEADER.size + total * self.RECORD.size:
+            self.__map__.close()
+            raise ValueError(f"{path} esta incompleto")
+        self.__max_checkers__ = max_checkers
+        self.__size__ = total
+
+    def __getstate__(self):
+        return {"path": self.__path__}
+
+    def __setstate__(self, state):
+        self.__init__(state["path"])
+
+    def close(self) -> None:
+        self.__map__.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def max_checkers(self) -> int:
+        return self.__max_checkers__
+
+    def __len__(self) -> int:
+        return self.__size__
+
+    def __record__(self, counts) -> tuple:
+        idx = position_index(counts, self.__max_checkers__)
+        return self.RECORD.unpack_from(self.__map__, HEADER.size + idx * self.RECORD.size)
+
+    def expected_rolls(self, counts) -> float:
+        return self.__record__(counts)[0]
+
+    def distribution(self, counts) -> list:
+        """Probabilidad de terminar en exactamente k tiradas, k = 0..MAX_ROLLS-1."""
+        return [v / SCALE for v in self.__record__(counts)[1:]]
+
+    def covers(self, board: Board, player: Player) -> bool:
+        """True si player esta retirando y sus fichas entran en la base."""
+        return (board.can_bear_off(player)
+                and 15 - board.borne_count(player) <= self.__max_checkers__)
+
+    def win_probability(self, board: Board, player: Player) -> float:
+        """
+        Probabilidad de que player (que esta por tirar) gane la carrera si los dos estan
+        retirando: termina en n tiradas antes de que el rival termine en n - 1.
+        """
+        opponent = Player.BLACK if player is Player.WHITE else Player.WHITE
+        mine = self.distribution(home_counts(board, player))
+        theirs = self.distribution(home_counts(board, opponent))
+        win = 0.0
+        opp_left = 1.0  #P(el rival necesita al menos n tiradas)
+        for n in range(MAX_ROLLS):
+            win += mine[n] * opp_left
+            opp_left -= theirs[n]
+        return win
+
+    def evaluator(self, fallback):
+        """
+        Evaluador para la busqueda: si los dos jugadores estan en la base usa la probabilidad
+        exacta de ganar (equity 2p - 1, sin gammons); si no, fallback(board, player).
+        """
+        def evaluate(board: Board, player: Player) -> float:
+            opponent = Player.BLACK if player is Player.WHITE else Player.WHITE
+            if self.covers(board, player) and self.covers(board, opponent):
+                return 2 * self.win_probability(board, player) - 1
+            return fallback(board, player)
+        return evaluate
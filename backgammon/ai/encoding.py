@@ -0,0 +1,88 @@
+"""
+Codificacion de posiciones para redes neuronales, al estilo TD-Gammon (requiere numpy).
+
+Todo se ve desde el jugador que esta por mover: los puntos se ordenan por distancia a su
+salida (indice 0 = el punto 1 de su home), asi una posicion y su espejo con el otro color
+tienen el mismo vector. Por cada punto y cada lado hay 4 unidades:
+
+    [n >= 1, n >= 2, n >= 3, (n - 3) / 2 si n > 3]
+
+Despues vienen barra (n / 2), fichas retiradas (n / 15) y pips (/ 100), propias y del rival.
+En total INPUTS = 198 valores float32 por posicion.
+
+encode_batch escribe un lote completo (n, 28) en un array preallocado sin recorrer filas en
+Python; BatchEncoder guarda ese buffer para reusarlo entre lotes.
+"""
+import numpy as np
+from backgammon.core.board import Board
+from backgammon.core.player import Player
+from backgammon.ai.batch import as_batch, bar_counts, borne_counts, pip_counts, _mine, _white_mask
+
+UNITS = 4
+POINT_INPUTS = 24 * UNITS
+BAR_INPUT = 2 * POINT_INPUTS   #Propias, del rival
+BORNE_INPUT = BAR_INPUT + 2
+PIPS_INPUT = BORNE_INPUT + 2
+INPUTS = PIPS_INPUT + 2
+_INDEX = np.arange(24)
+
+
+def encode_batch(positions, player, out: np.ndarray | None = None) -> np.ndarray:
+    """
+    Codifica un lote (ver as_batch) desde el punto de vista de player (Player o array de
+    Player.value por fila). Con out (n, INPUTS) float32 contiguo escribe ahi y lo devuelve.
+    """
+    batch = as_batch(positions)
+    n = len(batch)
+    if out is None:
+        out = np.empty((n, INPUTS), dtype=np.float32)
+    elif out.shape != (n, INPUTS) or out.dtype != np.float32 or not out.flags.c_contiguous:
+        raise ValueError(f"out debe ser un array float32 contiguo de forma ({n}, {INPUTS})")
+    white = _white_mask(batch, player)
+
+    order = np.where(white[:, None], _INDEX, _INDEX[::-1])
+    points = np.take_along_axis(batch[:, :24], order, axis=1).astype(np.int16)
+    points *= np.where(white, -1, 1).astype(np.int16)[:, None]  #Fichas propias en positivo
+    units = out[:, :BAR_INPUT].reshape(n, 2, 24, UNITS)
+    for side, counts in enumerate((np.maximum(points, 0), np.maximum(-points, 0))):
+        unit = units[:, side]
+        unit[..., 0] = counts >= 1
+        unit[..., 1] = counts >= 2
+        unit[..., 2] = counts >= 3
+        unit[..., 3] = np.maximum(counts - 3, 0) / 2
+
+    for column, values, scale in ((BAR_INPUT, bar_counts(batch), 2),
+                                  (BORNE_INPUT, borne_counts(batch), 15),
+                                  (PIPS_INPUT, pip_counts(batch), 100)):
+        mine, theirs = _mine(values, white)
+        out[:, column] = mine / scale
+        out[:, column + 1] = theirs / scale
+    return out
+
+
+def encode(board: Board, player: Player, out: np.ndarray | None = None) -> np.ndarray:
+    """Vector (INPUTS,) de una sola posicion."""
+    if out is not None:
+        encode_batch(board.state, player, out.reshape(1, INPUTS))
+        return out
+    return encode_batch(board.state, player)[0]
+
+
+class BatchEncoder:
+    """
+    Buffer de capacity filas que se reusa: encode devuelve una vista de las primeras n filas,
+    valida hasta la siguiente llamada. Los lotes mas grandes agrandan el buffer.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.__buffer__ = np.empty((capacity, INPUTS), dtype=np.float32)
+
+    @property
+    def capacity(self) -> int:
+        return len(self.__buffer__)
+
+    def encode(self, positions, player) -> np.ndarray:
+        batch = as_batch(positions)
+        if len(batch) > self.capacity:
+            self.__buffer__ = np.empty((len(batch), INPUTS), dtype=np.float32)
+        return encode_batch(batch, player, self.__buffer__[:len(batch)])
@@ -0,0 +1,162 @@
+"""
+Red neuronal de evaluacion en NumPy puro (sin GPU) entrenada con TD(lambda) por self-play.
+
+Entrada: la codificacion de backgammon.ai.encoding (INPUTS valores desde el que mueve),
+una capa oculta tanh y salida tanh: equity en (-1, 1) para el jugador indicado.
+Los parametros viven en un solo vector float32 (w1, b1, w2, b2 uno detras del otro); los
+pesos son vistas de ese vector, asi se guardan con np.save y se cargan con mmap sin copiar
+(varios procesos sirviendo la misma red comparten las paginas).
+
+TDTrainer juega muchas partidas a la vez con LockstepSimulator, la red elige las jugadas de
+los dos lados, y despues de cada turno aplica TD(lambda) con una traza de elegibilidad por
+partida. El objetivo final es +1 / -1 (gana / pierde, sin distinguir gammons).
+"""
+import time
+import numpy as np
+from backgammon.core.board import Board
+from backgammon.core.player import Player
+from backgammon.ai.encoding import INPUTS, BatchEncoder
+from backgammon.selfplay.lockstep import LockstepSimulator, EvaluatorBatchPolicy
+from backgammon.selfplay.selfplay import SelfPlayStats
+
+HIDDEN = 40
+
+
+def parameter_count(hidden: int) -> int:
+    return INPUTS * hidden + hidden + hidden + 1
+
+
+class NeuralEvaluator:
+    """
+    Evaluador para ExpectiminimaxSearch (llamado con un Board), EvaluatorBatchPolicy y
+    EvaluatorPolicy: evaluate_states puntua lotes (n, 28) con una sola pasada.
+    Sin params se inicializa al azar (seed) con valores chicos.
+    """
+
+    def __init__(self, hidden: int = HIDDEN, seed=None, params=None):
+        if params is None:
+            rng = np.random.default_rng(seed)
+            params = np.zeros(parameter_count(hidden), dtype=np.float32)
+            params[:INPUTS * hidden] = rng.normal(0, 1 / np.sqrt(INPUTS), INPUTS * hidden)
+            params[INPUTS * hidden + hidden:-1] = rng.normal(0, 1 / np.sqrt(hidden), hidden)
+        if params.ndim != 1 or params.dtype != np.float32 or (len(params) - 1) % (INPUTS + 2):
+            raise ValueError(f"params debe ser un vector float32 de largo hidden * {INPUTS + 2} + 1")
+        hidden = (len(params) - 1) // (INPUTS + 2)
+        self.params = params
+        self.w1 = params[:INPUTS * hidden].reshape(INPUTS, hidden)
+        self.b1 = params[INPUTS * hidden:INPUTS * hidden + hidden]
+        self.w2 = params[INPUTS * hidden + hidden:-1]
+        self.b2 = params[-1:]
+        self.__encoder__ = BatchEncoder()
+
+    @property
+    def hidden(self) -> int:
+        return len(self.b1)
+
+    def save(self, path: str) -> None:
+        """Guarda los parametros como .npy (se recomienda usar esa extension)."""
+        np.save(path, self.params)
+
+    @classmethod
+    def load(cls, path: str, mode: str | None = "r") -> "NeuralEvaluator":
+        """
+        Carga una red guardada con save. mode es el mmap_mode de np.load: "r" solo lectura
+        (para servir), "c" copia al escribir y "r+" entrena sobre el archivo; None la lee entera.
+        """
+        return cls(params=np.load(path, mmap_mode=mode))
+
+    def forward(self, inputs: np.ndarray) -> tuple:
+        """(salida (n,), capa oculta (n, hidden)) para entradas ya codificadas."""
+        hidden = np.tanh(inputs @ self.w1 + self.b1)
+        return np.tanh(hidden @ self.w2 + self.b2), hidden
+
+    def gradients(self, inputs: np.ndarray) -> tuple:
+        """(salida (n,), gradiente de cada salida respecto de params (n, len(params)))."""
+        output, hidden = self.forward(inputs)
+        n, size = len(inputs), self.hidden
+        d_out = 1 - output * output
+        d_hidden = (d_out[:, None] * self.w2) * (1 - hidden * hidden)
+        grads = np.empty((n, len(self.params)), dtype=np.float32)
+        outer = grads[:, :INPUTS * size].reshape(n, INPUTS, size)  #Vista: escribe sobre grads
+        np.multiply(inputs[:, :, None], d_hidden[:, None, :], out=outer)
+        grads[:, INPUTS * size:INPUTS * size + size] = d_hidden
+        grads[:, INPUTS * size + size:-1] = d_out[:, None] * hidden
+        grads[:, -1] = d_out
+        return output, grads
+
+    def evaluate_states(self, batch, player) -> np.ndarray:
+        return self.forward(self.__encoder__.encode(batch, player))[0]
+
+    def __call__(self, board: Board, player: Player) -> float:
+        return float(self.evaluate_states(board.state, player)[0])
+
+
+class TDTrainer:
+    """
+    Entrena network (con params escribibles) por TD(lambda): alpha es el paso, lam el lambda.
+    Las actualizaciones de las partidas simultaneas se suman en cada turno, asi que alpha va
+    mas chico que el 0.1 de una sola partida (TD-Gammon).
+    """
+
+    def __init__(self, network: NeuralEvaluator, alpha: float = 0.003, lam: float = 0.7, max_turns: int = 2000):
+        if not network.params.flags.writeable:
+            raise ValueError("Los parametros son de solo lectura: cargar la red con mode='c' o 'r+'")
+        policy = EvaluatorBatchPolicy(network)
+        self.__network__ = network
+        self.__simulator__ = LockstepSimulator(policy, policy, max_turns=max_turns)
+        self.__alpha__ = alpha
+        self.__lambda__ = lam
+
+    def train(self, games: int, seed=None, parallel: int = 128, progress=None) -> SelfPlayStats:
+        """
+        Juega games partidas de entrenamiento de a parallel por vez.
+        progress(jugadas, games) se llama al terminar cada tanda.
+        """
+        rng = np.random.default_rng(seed)
+        stats = SelfPlayStats()
+        done = 0
+        t0 = time.perf_counter()
+        while done < games:
+            n = min(parallel, games - done)
+            episode = _Episode(self.__network__, n, self.__alpha__, self.__lambda__)
+            result = self.__simulator__.run(n, seed=rng.integers(1 << 63), before_turn=episode)
+            episode.finish(result.winners)
+            stats.merge(result.stats())
+            stats.elapsed = time.perf_counter() - t0
+            done += n
+            if progress is not None:
+                progress(done, games)
+        return stats
+
+
+class _Episode:#before_turn de LockstepSimulator: trazas y actualizaciones TD de una tanda
+    def __init__(self, network: NeuralEvaluator, games: int, alpha: float, lam: float):
+        self.network = network
+        self.alpha = alpha
+        self.lam = lam
+        self.encoder = BatchEncoder(games)
+        self.traces = np.zeros((games, len(network.params)), dtype=np.float32)
+        self.values = np.zeros(games, dtype=np.float32)  #Ultimo valor visto, desde WHITE
+        self.seen = np.zeros(games, dtype=bool)
+
+    def update(self, rows: np.ndarray, targets: np.ndarray) -> None:
+        delta = targets - self.values[rows]
+        step = self.alpha * (delta @ self.traces[rows])
+        self.network.params += step.astype(np.float32)
+
+    def __call__(self, turn, batch, rows, signs, dice) -> None:
+        output, grads = self.network.gradients(self.encoder.encode(batch[rows], signs))
+        white = np.where(signs == Player.WHITE.value, 1, -1).astype(np.float32)
+        values = output * white
+        old = rows[self.seen[rows]]
+        if len(old):
+            self.update(old, values[self.seen[rows]])
+        self.traces[rows] = self.lam * self.traces[rows] + grads * white[:, None]
+        self.values[rows] = values
+        self.seen[rows] = True
+
+    def finish(self, winners: np.ndarray) -> None:
+        """Ultima actualizacion hacia el resultado (+1 si gano WHITE); las cortadas no cuentan."""
+        rows = np.flatnonzero((winners != 0) & self.seen)
+        if len(rows):
+            self.update(rows, np.where(winners[rows] == Player.WHITE.value, 1.0, -1.0).astype(np.float32))
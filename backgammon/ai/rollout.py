@@ -0,0 +1,219 @@
+"""
+Rollouts: juega una posicion hasta el final muchas veces (con LockstepSimulator, requiere numpy)
+y estima la equity y las probabilidades de ganar, gammon y backgammon con intervalos de confianza.
+
+Reduccion de varianza:
+-dados rotados: las primeras rotate_turns tiradas recorren las 36 combinaciones en orden
+ permutado (cuadrado latino: la tirada del turno k depende de los k primeros digitos en base 36
+ del numero de prueba). Cada bloque de 36 pruebas, o de pares si son antiteticas, tiene las 36
+ en cada uno de esos turnos y cada bloque de 36**k todas las combinaciones de los k turnos
+-secuencias antiteticas: las pruebas van de a pares y la segunda usa 7 - dado en cada tirada
+-ajuste por suerte: con un evaluador base, en cada turno se resta la suerte de la tirada
+ (valor con la tirada que salio menos el promedio sobre las 21 tiradas). Cada tirada se valora
+ jugandola con el evaluador base (movimiento por movimiento, como EvaluatorBatchPolicy).
+ La suerte se usa como variable de control (media 0): a cada estimacion (equity y cada
+ probabilidad) se le resta c * suerte, con c = cov(muestras, suerte) / var(suerte) calculado
+ por regresion sobre las mismas pruebas (control_variate)
+
+Los valores son del jugador que esta por tirar, en puntos (1 simple, 2 gammon, 3 backgammon)
+y sin dado de doblar. Las partidas cortadas por max_turns cuentan como 0.
+"""
+import math
+import time
+import numpy as np
+from backgammon.core.board import Board, BORNE_SLOT
+from backgammon.core.player import Player
+from backgammon.ai.batch import LinearEvaluator, win_points
+from backgammon.ai.search import ROLLS
+from backgammon.selfplay.lockstep import LockstepSimulator, EvaluatorBatchPolicy
+
+ROLL_DICE = np.array([dice for dice, _ in ROLLS], dtype=np.int64)
+ROLL_PROBS = np.array([prob for _, prob in ROLLS])
+ROLL_INDEX = np.zeros((7, 7), dtype=np.int64)  #ROLL_INDEX[a, b] = posicion de la tirada en ROLLS
+for _k, (_a, _b) in enumerate(ROLL_DICE):
+    ROLL_INDEX[_a, _b] = ROLL_INDEX[_b, _a] = _k
+
+
+class RolloutDice:
+    """
+    Fuente de dados para LockstepSimulator.run(rolls=...): rotados en los primeros turnos
+    y antiteticos por pares. start es el numero de la primera prueba del lote.
+    """
+
+    def __init__(self, seed=None, rotate_turns: int = 2, antithetic: bool = True, start: int = 0):
+        self.__rng__ = np.random.default_rng(seed)
+        self.__orders__ = [self.__rng__.permutation(36) for _ in range(rotate_turns)]
+        self.__antithetic__ = antithetic
+        self.__start__ = start
+
+    def __call__(self, turn: int, rows: np.ndarray) -> np.ndarray:
+        trials = self.__start__ + rows
+        stream = trials // 2 if self.__antithetic__ else trials
+        if turn <= len(self.__orders__):
+            index = np.zeros_like(stream)
+            for _ in range(turn):   #Suma de los primeros digitos en base 36
+                index += stream % 36
+                stream = stream // 36
+            outcome = self.__orders__[turn - 1][index % 36]
+            dice = np.stack((outcome // 6 + 1, outcome % 6 + 1), axis=1)
+        else:
+            streams, inverse = np.unique(stream, return_inverse=True)
+            dice = self.__rng__.integers(1, 7, size=(len(streams), 2))[inverse]
+        if self.__antithetic__:
+            dice = np.where((trials % 2 == 1)[:, None], 7 - dice, dice)
+        return dice
+
+
+class LuckTracker:
+    """
+    before_turn para LockstepSimulator: acumula por prueba la suerte de cada tirada segun
+    evaluator (evaluate_states), con signo desde el punto de vista de root (Player.value).
+    """
+
+    def __init__(self, evaluator, games: int, root: int, turns: int | None = None):
+        policy = EvaluatorBatchPolicy(evaluator)
+        self.__evaluator__ = evaluator
+        self.__player__ = LockstepSimulator(policy, policy)
+        self.__root__ = root
+        self.__turns__ = turns
+        self.luck = np.zeros(games)
+
+    def roll_values(self, batch: np.ndarray, signs: np.ndarray) -> np.ndarray:
+        """(m, 21): valor para el que tira de jugar cada una de las 21 tiradas."""
+        m = len(batch)
+        after = np.repeat(batch, len(ROLLS), axis=0)
+        movers = np.repeat(signs, len(ROLLS))
+        self.__player__.play_turn(after, np.arange(len(after)), movers, np.tile(ROLL_DICE, (m, 1)))
+        values = -self.__evaluator__.evaluate_states(after, -movers)
+        borne = np.where(movers < 0, after[:, BORNE_SLOT[Player.WHITE]], after[:, BORNE_SLOT[Player.BLACK]])
+        won = borne == 15
+        if won.any():
+            values = np.where(won, win_points(after, movers), values)
+        return values.reshape(m, len(ROLLS))
+
+    def __call__(self, turn, batch, rows, signs, rolls) -> None:
+        if self.__turns__ is not None and turn > self.__turns__:
+            return
+        values = self.roll_values(batch[rows], signs)
+        actual = values[np.arange(len(rows)), ROLL_INDEX[rolls[:, 0], rolls[:, 1]]]
+        luck = actual - values @ ROLL_PROBS
+        self.luck[rows] += np.where(signs == self.__root__, luck, -luck)
+
+
+def control_variate(samples: np.ndarray, control: np.ndarray) -> np.ndarray:
+    """samples - c * control con el c que minimiza la varianza (control tiene media 0)."""
+    variance = control.var()
+    if len(samples) < 2 or variance == 0:
+        return samples
+    c = np.cov(samples, control)[0, 1] / variance
+    return samples - c * control
+
+
+class Estimate:
+    """Media con intervalo de confianza (mean +- half_width)."""
+
+    def __init__(self, samples: np.ndarray, z: float):
+        n = len(samples)
+        self.mean = float(samples.mean()) if n else 0.0
+        self.std_error = float(samples.std(ddof=1) / math.sqrt(n)) if n > 1 else math.inf
+        self.half_width = z * self.std_error
+
+    @property
+    def interval(self) -> tuple:
+        return (self.mean - self.half_width, self.mean + self.half_width)
+
+    def __str__(self):
+        return f"{self.mean:.4f} +- {self.half_width:.4f}"
+
+
+class RolloutResult:
+    """
+    Estimaciones del rollout (del jugador que tiraba en la posicion). Cada muestra es una
+    prueba, o el promedio de un par si las secuencias son antiteticas.
+    """
+
+    OUTCOMES = ("win", "win_gammon", "win_backgammon", "lose_gammon", "lose_backgammon")
+
+    def __init__(self, points: np.ndarray, luck: np.ndarray, antithetic: bool, z: float, elapsed: float):
+        self.trials = len(points)
+        self.elapsed = elapsed
+        samples = {
+            "equity": points,
+            "win": points > 0,
+            "win_gammon": points >= 2,
+            "win_backgammon": points == 3,
+            "lose_gammon": points <= -2,
+            "lose_backgammon": points == -3,
+        }
+        if antithetic:
+            luck = luck.reshape(-1, 2).mean(axis=1)
+        self.estimates = {}
+        for name, values in samples.items():
+            values = np.asarray(values, dtype=np.float64)
+            if antithetic:
+                values = values.reshape(-1, 2).mean(axis=1)
+            self.estimates[name] = Estimate(control_variate(values, luck), z)
+            setattr(self, name, self.estimates[name])
+
+    def __str__(self):
+        lines = [f"Rollout: {self.trials} pruebas en {self.elapsed:.2f}s"]
+        for name in ("equity",) + self.OUTCOMES:
+            lines.append(f"{name:16} {self.estimates[name]}")
+        return "\n".join(lines)
+
+
+class Rollout:
+    """
+    policy: politica vectorizada para los dos lados (por defecto EvaluatorBatchPolicy con
+    LinearEvaluator.race()). baseline: evaluador para el ajuste por suerte (None = sin ajuste),
+    luck_turns: cuantos turnos de cada prueba se miden (None = todos).
+    """
+
+    def __init__(self, policy=None, baseline=None, rotate_turns: int = 2, antithetic: bool = True,
+                 max_turns: int = 2000, z: float = 1.96, luck_turns: int | None = None):
+        policy = policy if policy is not None else EvaluatorBatchPolicy(LinearEvaluator.race())
+        self.__simulator__ = LockstepSimulator(policy, policy, max_turns=max_turns)
+        self.__baseline__ = baseline
+        self.__luck_turns__ = luck_turns
+        self.__rotate_turns__ = rotate_turns
+        self.__antithetic__ = antithetic
+        self.__z__ = z
+
+    def run(self, board: Board, player: Player, trials: int = 1296, seed=None,
+            max_error: float | None = None, batch_size: int = 1296, min_trials: int = 144) -> RolloutResult:
+        """
+        Juega la posicion hasta trials veces (player esta por tirar). Con max_error corta antes,
+        al terminar un lote, si la mitad del intervalo de la equity ya es menor.
+        """
+        if trials < 2:
+            raise ValueError("trials debe ser al menos 2")
+        if self.__antithetic__:
+            trials += trials % 2
+            batch_size += batch_size % 2
+        rng = np.random.default_rng(seed)
+        start = np.frombuffer(bytes(board.state), dtype=np.int8)
+        points, luck = [], []
+        done = 0
+        t0 = time.perf_counter()
+        while done < trials:
+            games = min(batch_size, trials - done)
+            dice = RolloutDice(rng.integers(1 << 63), self.__rotate_turns__, self.__antithetic__, start=done)
+            tracker = None
+            if self.__baseline__ is not None:
+                tracker = LuckTracker(self.__baseline__, games, player.value, self.__luck_turns__)
+            result = self.__simulator__.run(
+                games, seed=rng.integers(1 << 63),
+                states=np.tile(start, (games, 1)),
+                players=np.full(games, player.value), rolls=dice, before_turn=tracker,
+            )
+            sign = np.where(result.winners == player.value, 1, -1)
+            points.append(np.where(result.winners == 0, 0, sign * result.points.astype(np.int64)))
+            luck.append(tracker.luck if tracker is not None else np.zeros(games))
+            done += games
+            if max_error is not None and done >= min_trials and done < trials:
+                partial = RolloutResult(np.concatenate(points), np.concatenate(luck),
+                                        self.__antithetic__, self.__z__, 0.0)
+                if partial.equity.half_width <= max_error:
+                    break
+        return RolloutResult(np.concatenate(points), np.concatenate(luck), self.__antithetic__, self.__z__,
+                             time.perf_counter() - t0)
@@ -0,0 +1,246 @@
+"""
+Busqueda expectiminimax para elegir jugadas.
+
+Los nodos alternan: nodo de azar (el jugador va a tirar, promedio sobre las 21 tiradas
+distintas) -> nodo max (elige la mejor jugada para esa tirada) -> nodo de azar del rival...
+Todo se expresa en forma negamax: cada valor es la equity del jugador que esta por tirar.
+
+En los nodos de azar se poda con Star1 (cotas del promedio usando los limites
+[lower, upper] del evaluador) y Star2 (primero se sondea la mejor jugada ordenada de cada
+tirada para tener una cota inferior). Las jugadas se ordenan con el evaluador estatico.
+
+Profundidad (ply): 1 = la mejor jugada segun el evaluador estatico,
+2 = ademas promedia la mejor respuesta del rival en cada tirada, 3 = un nivel mas.
+"""
+import math
+import time
+from backgammon.core.board import Board
+from backgammon.core.player import Player
+from backgammon.core.movegen import generate_plays
+from backgammon.ai.transposition import TranspositionTable, EXACT, LOWER, UPPER
+
+#Las 21 tiradas distintas con su probabilidad (los dobles 1/36, el resto 2/36)
+ROLLS = tuple(
+    ((a, b), (1 if a == b else 2) / 36)
+    for a in range(1, 7) for b in range(a, 7)
+)
+
+
+def opponent_of(player: Player) -> Player:
+    return Player.BLACK if player is Player.WHITE else Player.WHITE
+
+
+def terminal_value(board: Board, player: Player) -> float | None:
+    """Valor exacto si la partida termino (+puntos si gano player, -puntos si perdio), sino None."""
+    if board.borne_count(player) == 15:
+        return float(board.win_points(player))
+    opponent = opponent_of(player)
+    if board.borne_count(opponent) == 15:
+        return -float(board.win_points(opponent))
+    return None
+
+
+def race_evaluator(board: Board, player: Player) -> float:
+    """
+    Evaluador estatico simple: diferencia de pips (el que tira tiene ~8 pips de ventaja)
+    llevada a (-1, 1). Es el evaluador por defecto de la busqueda.
+    """
+    diff = board.pip_count(opponent_of(player)) - board.pip_count(player) + 8
+    return math.tanh(diff / 40)
+
+
+class SearchTimeout(Exception):
+    """Se agoto el tiempo de la busqueda (uso interno de best_play)."""
+
+
+class ExpectiminimaxSearch:
+    """
+    evaluator(board, player) -> equity de player (que esta por tirar), dentro de [lower, upper].
+    Los valores terminales son +-1/2/3 (simple, gammon, backgammon).
+    table (TranspositionTable) guarda los nodos de azar ya buscados (clave = hash con el lado que tira).
+    Si el evaluador tiene evaluate_states(estados, player) (ver backgammon.ai.batch) las jugadas
+    de cada tirada se puntuan todas juntas en una sola llamada.
+    """
+
+    def __init__(self, evaluator=race_evaluator, lower: float = -3.0, upper: float = 3.0, star2: bool = True,
+                 table: TranspositionTable | None = None):
+        if lower >= upper:
+            raise ValueError("lower debe ser menor que upper")
+        self.__evaluator__ = evaluator
+        self.__batch__ = getattr(evaluator, "evaluate_states", None)
+        self.__lower__ = lower
+        self.__upper__ = upper
+        self.__star2__ = star2
+        self.__table__ = table
+        self.__deadline__ = None
+        self.nodes = 0
+
+    @property
+    def table(self) -> TranspositionTable | None:
+        return self.__table__
+
+    #Evaluacion estatica
+
+    def static_value(self, board: Board, player: Player) -> float:
+        value = terminal_value(board, player)
+        if value is not None:
+            return value
+        value = self.__evaluator__(board, player)
+        return min(max(value, self.__lower__), self.__upper__)
+
+    def ordered_children(self, board: Board, player: Player, dice) -> list:
+        """
+        Jugadas de player para dice ordenadas de mejor a peor segun el evaluador estatico.
+        Devuelve [(valor_1ply, jugada, tablero_resultante)].
+        """
+        opponent = opponent_of(player)
+        generated = generate_plays(board, player, dice)
+        values = None
+        if self.__batch__ is not None and len(generated) > 1:
+            values = self.__batch__([state for _, state in generated], opponent)
+        children = []
+        for k, (play, state) in enumerate(generated):
+            after = Board.from_state(state)
+            if values is None:
+                value = self.static_value(after, opponent)
+            else:
+                value = terminal_value(after, opponent)
+                if value is None:
+                    value = min(max(float(values[k]), self.__lower__), self.__upper__)
+            children.append((-value, play, after))
+        children.sort(key=lambda child: child[0], reverse=True)
+        return children
+
+    #Nodos
+
+    def chance_value(self, board: Board, player: Player, depth: int,
+                     alpha: float | None = None, beta: float | None = None) -> float:
+        """Equity esperada de player antes de tirar, buscando depth plies."""
+        self.nodes += 1
+        lower, upper = self.__lower__, self.__upper__
+        alpha = lower if alpha is None else alpha
+        beta = upper if beta is None else beta
+
+        value = terminal_value(board, player)
+        if value is not None:
+            return value
+        if depth <= 0:
+            return self.static_value(board, player)
+
+        table = self.__table__
+        if table is not None:
+            key = board.zobrist_hash(player)
+            entry = table.probe(key, depth)
+            if entry is not None:
+                stored, flag = entry
+                if (flag == EXACT or (flag == LOWER and stored >= beta)
+                        or (flag == UPPER and stored <= alpha)):
+                    return stored
+            value = self.__chance_value__(board, player, depth, alpha, beta)
+            flag = UPPER if value <= alpha else LOWER if value >= beta else EXACT
+            table.store(key, depth, value, flag)
+            return value
+        return self.__chance_value__(board, player, depth, alpha, beta)
+
+    def __chance_value__(self, board: Board, player: Player, depth: int, alpha: float, beta: float) -> float:
+        lower, upper = self.__lower__, self.__upper__
+        rolls = [(dice, prob, self.ordered_children(board, player, dice)) for dice, prob in ROLLS]
+
+        #Star2: la primera jugada ordenada de cada tirada da una cota inferior del nodo max
+        probes = [None] * len(rolls)
+        bounds = [lower] * len(rolls)
+        if self.__star2__:
+            bound_sum = 0.0
+            for i, (dice, prob, children) in enumerate(rolls):
+                probes[i] = self.__child_value__(children[0], player, depth, lower, upper)
+                bounds[i] = probes[i]
+                bound_sum += prob * probes[i]
+            if bound_sum >= beta:
+                return bound_sum
+
+        #Star1 con las cotas inferiores (sondeadas o lower)
+        known = 0.0
+        rest_prob = 1.0
+        rest_low = sum(prob * bounds[i] for i, (_, prob, _) in enumerate(rolls))
+        for i, (dice, prob, children) in enumerate(rolls):
+            rest_prob -= prob
+            rest_low -= prob * bounds[i]
+            rest_high = rest_prob * upper
+            a = (alpha - known - rest_high) / prob
+            b = (beta - known - rest_low) / prob
+            v = self.__max_value__(player, children, depth, max(a, lower), min(b, upper), probes[i])
+            if v <= a:
+                return known + prob * v + rest_high
+            if v >= b:
+                return known + prob * v + rest_low
+            known += prob * v
+        return known
+
+    def max_value(self, board: Board, player: Player, dice, depth: int,
+                  alpha: float | None = None, beta: float | None = None) -> float:
+        """Equity de player despues de elegir la mejor jugada para dice."""
+        alpha = self.__lower__ if alpha is None else alpha
+        beta = self.__upper__ if beta is None else beta
+        children = self.ordered_children(board, player, dice)
+        return self.__max_value__(player, children, depth, alpha, beta, None)
+
+    def __child_value__(self, child, player: Player, depth: int, alpha: float, beta: float) -> float:
+        static, _, after = child
+        if depth <= 1:
+            return static
+        return -self.chance_value(after, opponent_of(player), depth - 1, -beta, -alpha)
+
+    def __max_value__(self, player, children, depth, alpha, beta, first_value) -> float:
+        if self.__deadline__ is not None and time.perf_counter() > self.__deadline__:
+            raise SearchTimeout()
+        self.nodes += 1
+        best = None
+        for k, child in enumerate(children):
+            if k == 0 and first_value is not None:
+                v = first_value
+            else:
+                v = self.__child_value__(child, player, depth, alpha, beta)
+            if best is None or v > best:
+                best = v
+                if v > alpha:
+                    alpha = v
+                if v >= beta:
+                    break
+        return best
+
+    #Raiz
+
+    def search_root(self, board: Board, player: Player, dice, depth: int) -> tuple:
+        """(jugada, equity) de la mejor jugada buscando depth plies."""
+        children = self.ordered_children(board, player, dice)
+        best_play, best = children[0][1], None
+        alpha = self.__lower__
+        for child in children:
+            v = self.__child_value__(child, player, depth, alpha, self.__upper__)
+            if best is None or v > best:
+                best_play, best = child[1], v
+                alpha = max(alpha, v)
+        return best_play, best
+
+    def best_play(self, board: Board, player: Player, dice, depth: int = 2,
+                  time_limit: float | None = None) -> tuple:
+        """
+        Profundizacion iterativa de 1 a depth plies. Con time_limit (segundos) devuelve
+        el resultado de la ultima profundidad completa. Devuelve (jugada, equity, profundidad).
+        """
+        if depth < 1:
+            raise ValueError("depth debe ser al menos 1")
+        if self.__table__ is not None:
+            self.__table__.new_search()
+        play, value = self.search_root(board, player, dice, 1)
+        result = (play, value, 1)
+        self.__deadline__ = None if time_limit is None else time.perf_counter() + time_limit
+        try:
+            for d in range(2, depth + 1):
+                play, value = self.search_root(board, player, dice, d)
+                result = (play, value, d)
+        except SearchTimeout:
+            pass
+        finally:
+            self.__deadline__ = None
+        return result
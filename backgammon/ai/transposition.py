@@ -0,0 +1,131 @@
+"""
+Tabla de transposicion con memoria acotada.
+
+Las entradas viven en arrays preasignados (modulo array), una columna por campo:
+clave de 64 bits (hash de Zobrist con el lado que mueve), equity, profundidad,
+tipo de cota y generacion (numero de busqueda en que se guardo).
+
+Cada clave cae en un bucket de dos lugares:
+-lugar 0: se queda con la entrada mas profunda (o se pisa si es de una busqueda vieja)
+-lugar 1: siempre se pisa con lo mas reciente
+"""
+from array import array
+
+EXACT = 0  #El valor es exacto
+LOWER = 1  #El valor es una cota inferior (la busqueda corto por arriba)
+UPPER = 2  #El valor es una cota superior (la busqueda corto por abajo)
+
+ENTRY_BYTES = 8 + 8 + 1 + 1 + 2  #clave, valor, profundidad, tipo, generacion
+EMPTY = -1
+
+
+class TranspositionTable:
+    """
+    max_bytes limita la memoria de las entradas (la tabla nunca crece despues de crearse).
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        buckets = max_bytes // (2 * ENTRY_BYTES)
+        if buckets < 1:
+            raise ValueError(f"max_bytes debe ser al menos {2 * ENTRY_BYTES}")
+        self.__buckets__ = buckets
+        capacity = 2 * buckets
+        self.__keys__ = array('Q', bytes(8 * capacity))
+        self.__values__ = array('d', bytes(8 * capacity))
+        self.__depths__ = array('b', [EMPTY]) * capacity
+        self.__flags__ = array('b', bytes(capacity))
+        self.__ages__ = array('H', bytes(2 * capacity))
+        self.__generation__ = 0
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    @property
+    def capacity(self) -> int:
+        return 2 * self.__buckets__
+
+    @property
+    def memory_bytes(self) -> int:
+        return self.capacity * ENTRY_BYTES
+
+    def __len__(self) -> int:#Entradas ocupadas (O(capacidad), solo para reportes)
+        return self.capacity - self.__depths__.count(EMPTY)
+
+    def new_search(self) -> None:
+        """Marca el comienzo de otra busqueda: las entradas anteriores pasan a ser reemplazables."""
+        self.__generation__ = (self.__generation__ + 1) & 0xFFFF
+
+    def clear(self) -> None:
+        self.__depths__ = array('b', [EMPTY]) * self.capacity
+        self.__generation__ = 0
+        self.hits = self.misses = self.stores = self.evictions = 0
+
+    def probe(self, key: int, depth: int):
+        """
+        Busca key con al menos depth de profundidad. Devuelve (valor, tipo) o None.
+        """
+        slot = 2 * (key % self.__buckets__)
+        keys = self.__keys__
+        depths = self.__depths__
+        for i in (slot, slot + 1):
+            if depths[i] != EMPTY and keys[i] == key:
+                if depths[i] >= depth:
+                    self.hits += 1
+                    self.__ages__[i] = self.__generation__
+                    return self.__values__[i], self.__flags__[i]
+                break
+        self.misses += 1
+        return None
+
+    def store(self, key: int, depth: int, value: float, flag: int = EXACT) -> None:
+        slot = 2 * (key % self.__buckets__)
+        keys = self.__keys__
+        depths = self.__depths__
+        ages = self.__ages__
+        generation = self.__generation__
+
+        if depths[slot] != EMPTY and keys[slot] == key:
+            i = slot
+        elif depths[slot + 1] != EMPTY and keys[slot + 1] == key:
+            i = slot + 1
+        elif depths[slot] == EMPTY:
+            i = slot
+        elif depth >= depths[slot] or ages[slot] != generation:
+            #Lo que estaba en el lugar 0 baja al lugar 1 (pisando lo que hubiera ahi)
+            if depths[slot + 1] != EMPTY:
+                self.evictions += 1
+            self.__move_entry__(slot, slot + 1)
+            i = slot
+        else:
+            if depths[slot + 1] != EMPTY:
+                self.evictions += 1
+            i = slot + 1
+
+        if keys[i] == key and depths[i] != EMPTY and depth < depths[i] and ages[i] == generation:
+            return  #Ya hay un resultado mas profundo de esta misma busqueda
+        keys[i] = key
+        self.__values__[i] = value
+        depths[i] = min(depth, 127)
+        self.__flags__[i] = flag
+        ages[i] = generation
+        self.stores += 1
+
+    def __move_entry__(self, src: int, dest: int) -> None:#Copia la entrada src sobre dest
+        self.__keys__[dest] = self.__keys__[src]
+        self.__values__[dest] = self.__values__[src]
+        self.__depths__[dest] = self.__depths__[src]
+        self.__flags__[dest] = self.__flags__[src]
+        self.__ages__[dest] = self.__ages__[src]
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "capacity": self.capacity,
+            "memory_bytes": self.memory_bytes,
+        }
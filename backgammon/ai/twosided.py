@@ -0,0 +1,213 @@
+"""
+Base de datos de retiro de dos lados (two-sided bear-off).
+
+Para cada par de distribuciones de hasta N fichas en el home (el que tira, el rival) guarda
+la probabilidad exacta de que gane el que esta por tirar (sin dado de doblar ni gammons):
+
+    P(a, b) = suma sobre tiradas de prob * max sobre jugadas a' de (1 - P(b, a'))
+
+Cada jugada baja los pips, asi que P(a, b) solo depende de pares con menos pips en total.
+Se construye por capas (pips(a) + pips(b)); los pares de una capa son independientes y se
+reparten entre un pool de procesos que escriben sobre el mismo archivo de trabajo mapeado.
+
+Archivo: encabezado (HEADER) y una matriz de uint16 (probabilidad * 65535) indexada por
+position_index(a) * posiciones + position_index(b). El lector mapea el archivo recien
+en la primera consulta. Se genera con: python -m backgammon.ai <archivo> --two-sided
+"""
+import mmap
+import os
+import struct
+from multiprocessing import get_context
+from backgammon.core.board import Board
+from backgammon.core.player import Player
+from backgammon.ai.bearoff import (
+    POINTS, SCALE, _ROLLS, home_counts, plays, position_count, position_index, positions,
+)
+
+MAGIC = b"BGB2"
+VERSION = 1
+MAX_CHECKERS = 6  #6 fichas: 924 posiciones por lado, 853776 pares (1.6 MB)
+HEADER = struct.Struct("<4sHHHI")  #magic, version, puntos, fichas maximas, posiciones
+CHUNK_SIZE = 4096
+
+_worker = {}  #Estado de cada proceso del pool (lo carga _init_worker)
+
+
+def successor_table(max_checkers: int):
+    """
+    Matriz (posiciones, 21, M) con los indices de las posiciones a las que se llega con
+    cada tirada (las filas cortas se rellenan repitiendo la primera jugada).
+    """
+    import numpy as np
+    all_positions = list(positions(max_checkers))
+    children = [
+        [sorted(position_index(q, max_checkers) for q in plays(pos, dice)) for dice, _ in _ROLLS]
+        for pos in all_positions
+    ]
+    width = max(len(c) for row in children for c in row)
+    table = np.empty((len(all_positions), len(_ROLLS), width), dtype=np.int32)
+    for i, row in enumerate(children):
+        for r, c in enumerate(row):
+            table[i, r, :len(c)] = c
+            table[i, r, len(c):] = c[0]
+    pips = np.array([sum((i + 1) * c for i, c in enumerate(p)) for p in all_positions], dtype=np.int32)
+    return table, pips
+
+
+def _init_worker(work_path: str, size: int, children, weights) -> None:
+    import numpy as np
+    _worker["probs"] = np.memmap(work_path, dtype=np.float32, mode="r+", shape=(size, size))
+    _worker["children"] = children
+    _worker["weights"] = weights
+
+
+def _solve_chunk(task) -> int:#Corre en el proceso worker: calcula y escribe un bloque de pares
+    a, b = task
+    probs = _worker["probs"]
+    values = probs[b[:, None, None], _worker["children"][a]]  #P(b, a') para cada tirada y jugada
+    probs[a, b] = (_worker["weights"] * (1.0 - values.min(axis=2))).sum(axis=1)
+    return len(a)
+
+
+def build(path: str, max_checkers: int = MAX_CHECKERS, workers: int | None = 1,
+          chunk_size: int = CHUNK_SIZE, progress=None) -> int:
+    """
+    Genera la base en path. workers=None usa todos los nucleos, 1 corre en este proceso.
+    progress(capa, capas) se llama al terminar cada capa. Devuelve la cantidad de posiciones por lado.
+    """
+    import numpy as np
+    if not 1 <= max_checkers <= 15:
+        raise ValueError("max_checkers debe estar entre 1 y 15")
+    size = position_count(max_checkers)
+    children, pips = successor_table(max_checkers)
+    weights = np.array([prob for _, prob in _ROLLS], dtype=np.float32)
+
+    work_path = path + ".work"
+    probs = np.memmap(work_path, dtype=np.float32, mode="w+", shape=(size, size))
+    probs[0, 1:] = 1.0  #El que tira ya no tiene fichas: gano
+    probs[1:, 0] = 0.0  #El rival ya no tiene fichas: perdio
+    probs.flush()
+
+    total = (pips[:, None] + pips[None, :]).ravel()
+    order = np.argsort(total, kind="stable")
+    bounds = np.concatenate(([0], np.cumsum(np.bincount(total))))
+    layers = len(bounds) - 1
+
+    workers = workers or os.cpu_count() or 1
+    init_args = (work_path, size, children, weights)
+    pool = get_context().Pool(workers, _init_worker, init_args) if workers > 1 else None
+    if pool is None:
+        _init_worker(*init_args)
+    try:
+        for layer in range(1, layers):
+            cells = order[bounds[layer]:bounds[layer + 1]]
+            a, b = np.divmod(cells, size)
+            keep = (a != 0) & (b != 0)
+            a, b = a[keep], b[keep]
+            tasks = [(a[i:i + chunk_size], b[i:i + chunk_size]) for i in range(0, len(a), chunk_size)]
+            if pool is None:
+                for task in tasks:
+                    _solve_chunk(task)
+            else:
+                for _ in pool.imap_unordered(_solve_chunk, tasks):
+                    pass
+            if progress is not None:
+                progress(layer, layers - 1)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+        _worker.clear()
+
+    probs.flush()
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, POINTS, max_checkers, size))
+        f.write(np.rint(np.asarray(probs) * SCALE).astype("<u2").tobytes())
+    del probs
+    os.remove(work_path)
+    return size
+
+
+class TwoSidedBearoff:
+    """
+    Lector de la base. El archivo se mapea (solo lectura) en la primera consulta;
+    al pasarlo a otro proceso se vuelve a mapear alla.
+    """
+
+    CELL = struct.Struct("<H")
+
+    def __init__(self, path: str):
+        self.__path__ = path
+        self.__map__ = None
+        self.__max_checkers__ = None
+        self.__size__ = None
+
+    def __getstate__(self):
+        return {"path": self.__path__}
+
+    def __setstate__(self, state):
+        self.__init__(state["path"])
+
+    def __load__(self) -> None:
+        with open(self.__path__, "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, points, max_checkers, size = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION or points != POINTS:
+            data.close()
+            raise ValueError(f"{self.__path__} no es una base de retiro de dos lados valida")
+        if len(data) != HEADER.size + size * size * self.CELL.size:
+            data.close()
+            raise ValueError(f"{self.__path__} esta incompleto")
+        self.__map__ = data
+        self.__max_checkers__ = max_checkers
+        self.__size__ = size
+
+    @property
+    def loaded(self) -> bool:
+        return self.__map__ is not None
+
+    @property
+    def max_checkers(self) -> int:
+        if self.__map__ is None:
+            self.__load__()
+        return self.__max_checkers__
+
+    def close(self) -> None:
+        if self.__map__ is not None:
+            self.__map__.close()
+            self.__map__ = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def probability(self, on_roll, other) -> float:
+        """Probabilidad de que gane el que tira, con distribuciones de home on_roll y other."""
+        if self.__map__ is None:
+            self.__load__()
+        n = self.__max_checkers__
+        cell = position_index(on_roll, n) * self.__size__ + position_index(other, n)
+        return self.CELL.unpack_from(self.__map__, HEADER.size + cell * self.CELL.size)[0] / SCALE
+
+    def covers(self, board: Board, player: Player) -> bool:
+        """True si player esta retirando y sus fichas entran en la base."""
+        return (board.can_bear_off(player)
+                and 15 - board.borne_count(player) <= self.max_checkers)
+
+    def win_probability(self, board: Board, player: Player) -> float:
+        opponent = Player.BLACK if player is Player.WHITE else Player.WHITE
+        return self.probability(home_counts(board, player), home_counts(board, opponent))
+
+    def evaluator(self, fallback):
+        """
+        Evaluador para la busqueda: equity exacta 2p - 1 si los dos jugadores estan en la base,
+        sino fallback(board, player) (por ejemplo OneSidedBearoff.evaluator(race_evaluator)).
+        """
+        def evaluate(board: Board, player: Player) -> float:
+            opponent = Player.BLACK if player is Player.WHITE else Player.WHITE
+            if self.covers(board, player) and self.covers(board, opponent):
+                return 2 * self.win_probability(board, player) - 1
+            return fallback(board, player)
+        return evaluate
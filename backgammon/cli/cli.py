@@ -18,6 +18,7 @@ class CLI:
     move    ---->Mueve una ficha
     pass    ---->Pasa el turno
     board   ---->Muestra el tablero
+    rollout ---->Estima la equity del que va a tirar (rollout [pruebas], requiere numpy)
     status  ---->Estado resumido
     help    ---->Ayuda
     exit    ---->Salir
@@ -162,7 +163,7 @@ class CLI:
             print(f"[ERROR] Ese valor ({die}) no coincide con los dados disponibles {self.remaining_dice}.")
             return
         try:
-            self.game.board.move(self.game.current_player, src, die)
+            self.game.move(src, die)
             print("Movimiento realizado")
             try:
                 self.remaining_dice.remove(die)
@@ -197,6 +198,33 @@ class CLI:
     def cmd_board(self, args: List[str]) -> None:
         self._print_board()
 
+    def cmd_rollout(self, args: List[str]) -> None:
+        if not self.game.started:
+            print("La partida no está iniciada. Usá 'start'.")
+            return
+        if self.game.current_player is None:
+            print("Primero resolvé el sorteo inicial con 'roll'.")
+            return
+        if self.game.dice.values != (0, 0):
+            print("El rollout se hace antes de tirar los dados.")
+            return
+        trials = 1296
+        if args:
+            try:
+                trials = int(args[0])
+            except ValueError:
+                print("Uso: rollout [pruebas]")
+                return
+            if trials < 2:
+                print("Hacen falta al menos 2 pruebas.")
+                return
+        try:
+            from backgammon.ai.rollout import Rollout
+        except ImportError:
+            print("El rollout necesita numpy instalado.")
+            return
+        print(Rollout().run(self.game.board, self.game.current_player, trials=trials))
+
     def cmd_status(self, args: List[str]) -> None:
         self._print_status()
     
@@ -237,6 +265,8 @@ class CLI:
                     self.cmd_board(args)
                 elif cmd == "status":
                     self.cmd_status(args)
+                elif cmd == "rollout":
+                    self.cmd_rollout(args)
                 elif cmd == "help":
                     self.cmd_help(args)
                 elif cmd == "exit":
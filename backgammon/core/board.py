@@ -1,55 +1,326 @@
+from array import array
+from enum import IntEnum
 from backgammon.core.player import Player
 from backgammon.core.checker import Checker
-from backgammon.core.exceptions import ( PointBlocked, NoCheckerAtPoint, MustEnterFromBar, EntryBlocked, BearOffNotAllowed)
+from backgammon.core import zobrist
+from backgammon.core.exceptions import ( PointBlocked, NoCheckerAtPoint, MustEnterFromBar, EntryBlocked, BearOffNotAllowed, IllegalMoves)
+
+#Layout del buffer compacto (array 'b' de 28 enteros con signo):
+#  0..23 -> puntos, el valor absoluto es la cantidad y el signo es el dueño (Player.value: WHITE=-1, BLACK=+1)
+#  24/25 -> barra de WHITE / BLACK
+#  26/27 -> borne de WHITE / BLACK
+BAR_SLOT = {Player.WHITE: 24, Player.BLACK: 25}
+BORNE_SLOT = {Player.WHITE: 26, Player.BLACK: 27}
+STATE_SIZE = 28
+MAX_STACK = 5 #Maximo de fichas propias en un punto
+BAR_PIPS = 25 #Convencion estandar: una ficha en la barra cuenta 25 pips
+
+#Posicion inicial como (punto, cantidad con signo)
+INITIAL_POSITION = (
+    (0, 2 * Player.BLACK.value),
+    (5, 5 * Player.WHITE.value),
+    (7, 3 * Player.WHITE.value),
+    (11, 5 * Player.BLACK.value),
+    (12, 5 * Player.WHITE.value),
+    (16, 3 * Player.BLACK.value),
+    (18, 5 * Player.BLACK.value),
+    (23, 2 * Player.WHITE.value),
+)
+
+
+class MoveStatus(IntEnum):
+    """Resultado de validar un movimiento sin lanzar excepciones (Board.check_move)"""
+    OK = 0
+    MUST_ENTER_FROM_BAR = 1
+    INVALID_INDEX = 2
+    NO_CHECKER = 3
+    OUT_OF_BOARD = 4
+    POINT_BLOCKED = 5
+    ENTRY_BLOCKED = 6
+    STACK_FULL = 7
+    BEAR_OFF_NOT_ALLOWED = 8
+    INVALID_DIE = 9
+
+
+def _status_error(status: MoveStatus) -> Exception:#Excepcion que lanza move para cada MoveStatus
+    if status is MoveStatus.MUST_ENTER_FROM_BAR:
+        return MustEnterFromBar()
+    if status is MoveStatus.INVALID_INDEX:
+        return ValueError("Índice inválido")
+    if status is MoveStatus.NO_CHECKER:
+        return NoCheckerAtPoint()
+    if status is MoveStatus.OUT_OF_BOARD:
+        return ValueError("Destino fuera del tablero")
+    if status is MoveStatus.POINT_BLOCKED:
+        return PointBlocked()
+    if status is MoveStatus.ENTRY_BLOCKED:
+        return EntryBlocked()
+    if status is MoveStatus.STACK_FULL:
+        return IllegalMoves("No podés tener más de 5 fichas en un punto.")
+    if status is MoveStatus.INVALID_DIE:
+        return ValueError("Dado inválido")
+    return BearOffNotAllowed()
+
+
+class _Pile(list):
+    """Lista de Checkers generada a partir del buffer.
+       append/pop escriben de vuelta en el tablero para que el codigo que
+       trabajaba con las listas viejas siga funcionando."""
+
+    def __init__(self, board, slot, items):
+        super().__init__(items)
+        self.__board__ = board
+        self.__slot__ = slot
+
+    def append(self, checker):
+        super().append(checker)
+        self.__board__.__sync_slot__(self.__slot__, self)
+
+    def pop(self, *args):
+        checker = super().pop(*args)
+        self.__board__.__sync_slot__(self.__slot__, self)
+        return checker
+
+    def clear(self):
+        super().clear()
+        self.__board__.__sync_slot__(self.__slot__, self)
+
+
+class _PointsView:
+    """Vista de los 24 puntos como listas de Checkers (compatibilidad con __points__)."""
+
+    def __init__(self, board):
+        self.__board__ = board
+
+    def __len__(self):
+        return 24
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(24)[idx]]
+        if not -24 <= idx < 24:
+            raise IndexError("Índice de punto inválido")
+        return self.__board__.__pile__(idx % 24)
+
+    def __setitem__(self, idx, items):
+        self.__board__.__sync_slot__(idx % 24, items)
+
+    def __iter__(self):
+        return (self[i] for i in range(24))
+
+
+class _SideView:
+    """Vista de barra o borne por Player como listas de Checkers."""
+
+    def __init__(self, board, slot_map):
+        self.__board__ = board
+        self.__slot_map__ = slot_map
+
+    def __getitem__(self, player):
+        return self.__board__.__pile__(self.__slot_map__[player])
+
+    def __setitem__(self, player, items):
+        self.__board__.__sync_slot__(self.__slot_map__[player], items)
+
+    def __iter__(self):
+        return iter(self.__slot_map__)
+
+    def keys(self):
+        return self.__slot_map__.keys()
+
 
 class Board:
 
     '''Tablero:
        24 puntos enumerados del 0 al 23
        Cada punto puede tener 0 o 5 fichas como maximo de un jugador
-       Administacion de barra (sector donde van las piezas comidas) y borne (sector donde van las fichas retiradas del juego)'''
+       Administacion de barra (sector donde van las piezas comidas) y borne (sector donde van las fichas retiradas del juego)
+
+       El estado se guarda en un buffer compacto (array de 28 bytes con signo),
+       copiar o mutar el tablero no crea objetos Checker.
+       Ademas se mantiene un hash de Zobrist de 64 bits y, por Player, el pip count,
+       las fichas fuera del home y las fichas en el tablero; move los actualiza en O(1).'''
     
     def __init__(self):#Inicializa un tabelro vacio con barra y borne por Player        
-        self.__points__=[ [] for _ in range(24) ]
-        self.__bar__ = {Player.WHITE: [], Player.BLACK: []}
-        self.__borne__={Player.WHITE: [], Player.BLACK: []}
+        self.__state__ = array('b', bytes(STATE_SIZE))
+        self.__refresh__()
     
     def __setup__(self):#Posicion de las fichas al comienzo de la partida
-        self.__points__[0] = [Checker(Player.BLACK) for _ in range(2)]
-        self.__points__[5] = [Checker(Player.WHITE) for _ in range(5)]
-        self.__points__[7] = [Checker(Player.WHITE) for _ in range(3)]
-        self.__points__[11] = [Checker(Player.BLACK) for _ in range(5)]
-        self.__points__[12] = [Checker(Player.WHITE) for _ in range(5)]
-        self.__points__[16] = [Checker(Player.BLACK) for _ in range(3)]
-        self.__points__[18] = [Checker(Player.BLACK) for _ in range(5)]
-        self.__points__[23] = [Checker(Player.WHITE) for _ in range(2)]
+        for idx, signed in INITIAL_POSITION:
+            self.__state__[idx] = signed
+        self.__refresh__()
+
+    def __refresh__(self):#Recalcula el hash y los contadores a partir del buffer (O(28))
+        state = self.__state__
+        self.__journal__ = []
+        self.__redo__ = []
+        self.__zobrist__ = zobrist.compute_hash(state)
+        self.__pips__ = {Player.WHITE: 0, Player.BLACK: 0}
+        self.__outside__ = {Player.WHITE: 0, Player.BLACK: 0}
+        self.__on_board__ = {Player.WHITE: 0, Player.BLACK: 0}
+        for i in range(24):
+            value = state[i]
+            if value < 0:
+                self.__pips__[Player.WHITE] += -value * (i + 1)
+                self.__on_board__[Player.WHITE] += -value
+                if i > 5:
+                    self.__outside__[Player.WHITE] += -value
+            elif value > 0:
+                self.__pips__[Player.BLACK] += value * (24 - i)
+                self.__on_board__[Player.BLACK] += value
+                if i < 18:
+                    self.__outside__[Player.BLACK] += value
+        for player, slot in BAR_SLOT.items():
+            self.__pips__[player] += state[slot] * BAR_PIPS
 
     def __reset__(self):#Reinicia el tablero a la posicion inicial
-        self.__points__=[[] for _ in range(24)]
-        self.__bar__={Player.WHITE:[], Player.BLACK:[]}
-        self.__borne__={Player.WHITE:[], Player.BLACK:[]}
-
-        self.__points__[0] = [Checker(Player.BLACK) for _ in range(2)]
-        self.__points__[5] = [Checker(Player.WHITE) for _ in range(5)]
-        self.__points__[7] = [Checker(Player.WHITE) for _ in range(3)]
-        self.__points__[11] = [Checker(Player.BLACK) for _ in range(5)]
-        self.__points__[12] = [Checker(Player.WHITE) for _ in range(5)]
-        self.__points__[16] = [Checker(Player.BLACK) for _ in range(3)]
-        self.__points__[18] = [Checker(Player.BLACK) for _ in range(5)]
-        self.__points__[23] = [Checker(Player.WHITE) for _ in range(2)]
-    
+        self.__state__ = array('b', bytes(STATE_SIZE))
+        self.__setup__()
+
+    @classmethod
+    def from_state(cls, state) -> "Board":
+        """Crea un tablero a partir de un buffer compacto (cualquier secuencia de 28 enteros)."""
+        if len(state) != STATE_SIZE:
+            raise ValueError(f"El estado debe tener {STATE_SIZE} valores")
+        board = cls.__new__(cls)
+        board.__state__ = array('b', state)
+        board.__refresh__()
+        return board
+
+    def copy(self) -> "Board":#Copia barata: un solo buffer de 28 bytes
+        board = Board.__new__(Board)
+        board.__state__ = array('b', self.__state__)
+        board.__zobrist__ = self.__zobrist__
+        board.__pips__ = dict(self.__pips__)
+        board.__outside__ = dict(self.__outside__)
+        board.__on_board__ = dict(self.__on_board__)
+        board.__journal__ = []
+        board.__redo__ = []
+        return board
+
+    @property
+    def state(self) -> array:
+        """Buffer compacto del tablero (sin copiar). Ver el layout arriba.
+        Es de solo lectura: escribirlo directamente desincroniza el hash."""
+        return self.__state__
+
+    def zobrist_hash(self, player: Player | None = None) -> int:
+        """Hash de Zobrist de 64 bits de la posicion; si se pasa player incluye el lado que mueve."""
+        if player is None:
+            return self.__zobrist__
+        return self.__zobrist__ ^ zobrist.SIDE[player.value]
+
+    def position_key(self, player: Player | None = None) -> bytes:
+        """Clave canonica y hasheable de la posicion (28 bytes, +1 con el lado que mueve)."""
+        key = self.__state__.tobytes()
+        if player is None:
+            return key
+        return key + (b"W" if player is Player.WHITE else b"B")
+
+    def __set_slot__(self, slot: int, value: int) -> None:#Escribe un slot actualizando hash y contadores
+        old = self.__state__[slot]
+        table = zobrist.TABLE[slot]
+        self.__zobrist__ ^= table[old + zobrist.OFFSET] ^ table[value + zobrist.OFFSET]
+        self.__state__[slot] = value
+        if slot < 24:
+            white = max(-value, 0) - max(-old, 0)
+            if white:
+                self.__pips__[Player.WHITE] += white * (slot + 1)
+                self.__on_board__[Player.WHITE] += white
+                if slot > 5:
+                    self.__outside__[Player.WHITE] += white
+            black = max(value, 0) - max(old, 0)
+            if black:
+                self.__pips__[Player.BLACK] += black * (24 - slot)
+                self.__on_board__[Player.BLACK] += black
+                if slot < 18:
+                    self.__outside__[Player.BLACK] += black
+        elif slot == BAR_SLOT[Player.WHITE]:
+            self.__pips__[Player.WHITE] += (value - old) * BAR_PIPS
+        elif slot == BAR_SLOT[Player.BLACK]:
+            self.__pips__[Player.BLACK] += (value - old) * BAR_PIPS
+
+    #Compatibilidad: vistas de listas de Checkers construidas a partir del buffer
+
+    @property
+    def __points__(self):
+        return _PointsView(self)
+
+    @__points__.setter
+    def __points__(self, piles):
+        for idx, pile in enumerate(piles):
+            self.__sync_slot__(idx, pile)
+
+    @property
+    def __bar__(self):
+        return _SideView(self, BAR_SLOT)
+
+    @__bar__.setter
+    def __bar__(self, piles):
+        for player, pile in piles.items():
+            self.__sync_slot__(BAR_SLOT[player], pile)
+
+    @property
+    def __borne__(self):
+        return _SideView(self, BORNE_SLOT)
+
+    @__borne__.setter
+    def __borne__(self, piles):
+        for player, pile in piles.items():
+            self.__sync_slot__(BORNE_SLOT[player], pile)
+
+    def __pile__(self, slot: int) -> _Pile:#Arma la lista de Checkers de un slot
+        value = self.__state__[slot]
+        if slot < 24:
+            if value == 0:
+                return _Pile(self, slot, [])
+            owner = Player.WHITE if value < 0 else Player.BLACK
+            return _Pile(self, slot, [Checker(owner) for _ in range(abs(value))])
+        owner = Player.WHITE if slot in (BAR_SLOT[Player.WHITE], BORNE_SLOT[Player.WHITE]) else Player.BLACK
+        return _Pile(self, slot, [Checker(owner) for _ in range(value)])
+
+    def __sync_slot__(self, slot: int, pile) -> None:#Escribe en el buffer el contenido de una lista
+        #Una edicion directa invalida los deltas guardados
+        self.__journal__.clear()
+        self.__redo__.clear()
+        if slot >= 24:
+            self.__set_slot__(slot, len(pile))
+            return
+        owner = getattr(pile[-1], "owner", None) if pile else None
+        self.__set_slot__(slot, owner.value * len(pile) if owner is not None else 0)
+
+    def same_position(self, other: "Board") -> bool:
+        """Misma posicion (mismo buffer). == sigue siendo por identidad, asi Board se puede hashear."""
+        return self.__state__ == other.__state__
+
     def owner_at(self, idx: int):#Nos sirve para ver que fiicha hay en un punto.
-        pile = self.__points__[idx]
-        return pile[-1].owner if pile else None
+        value = self.__state__[idx]
+        if value == 0:
+            return None
+        return Player.WHITE if value < 0 else Player.BLACK
     
     def count_at(self, idx: int) -> int:#Nos dice cuantas fichas hay en un punto.
-        return len(self.__points__[idx])
+        return abs(self.__state__[idx])
+
+    def bar_count(self, player: Player) -> int:#Fichas del player en la barra
+        return self.__state__[BAR_SLOT[player]]
+
+    def borne_count(self, player: Player) -> int:#Fichas del player ya retiradas
+        return self.__state__[BORNE_SLOT[player]]
+
+    def pip_count(self, player: Player) -> int:#Pips que le faltan al player para retirar todo (barra = 25)
+        return self.__pips__[player]
+
+    def checkers_outside_home(self, player: Player) -> int:#Fichas del player en el tablero fuera de su home
+        return self.__outside__[player]
+
+    def checkers_on_board(self, player: Player) -> int:#Fichas del player en los 24 puntos
+        return self.__on_board__[player]
     
     def is_blocked_for(self, player: Player, idx: int) -> bool:#Nos sirve para saber si un punto esta bloqueado por el otro jugador o no.
         if not (0 <= idx < 24):
             return False
-        opp = Player.BLACK if player is Player.WHITE else Player.WHITE
-        return self.owner_at(idx) is opp and self.count_at(idx) >= 2
+        return self.__state__[idx] * player.value <= -2
     
     def entry_index_from_bar(self, player: Player, die:int) -> int:#Nos sive para que un jugador pueda volver al juego si le comieron una ficha.
         return (die -1) if player is Player.WHITE else (24 - die)
@@ -59,15 +330,10 @@ class Board:
         return src + direction * die
 
     def __count_checkers__(self, player: Player) -> int:#Cuenta las fichas de cada jugador en el tablero, barra y brone
-        total=0
-        for point in self.__points__:
-            total += sum(1 for c in point if getattr(c, "owner", None) == player)
-        total += len(self.__bar__[player])
-        total += len(self.__borne__[player])
-        return total
+        return self.__on_board__[player] + self.__state__[BAR_SLOT[player]] + self.__state__[BORNE_SLOT[player]]
 
     def has_in_bar(self, player: Player) -> bool:#Nos dice si el player tiene fichas en la bar
-        return len(self.__bar__[player]) > 0
+        return self.__state__[BAR_SLOT[player]] > 0
 
     def home_range (self, player:Player) -> range:#Nos devuelve el home range de cada player
         return range(0, 6) if player is Player.WHITE else range (18, 24)
@@ -81,78 +347,162 @@ class Board:
         -No hay fichas en la barra
         -Todas las fichas del player estan dentro del home range
         """
-        if self.has_in_bar(player):
-            return False
-        home = self.home_range(player)
-        for i in range(24):
-            if self.owner_at(i) is player and i not in home:
-                return False
-        return True
+        return not self.has_in_bar(player) and self.__outside__[player] == 0
     
+    def win_points(self, winner: Player) -> int:
+        """
+        Puntos que gana winner si ya retiro sus 15 fichas: 1 simple, 2 gammon
+        (el rival no retiro ninguna), 3 backgammon (ademas tiene fichas en la barra o en el home de winner).
+        """
+        loser = Player.BLACK if winner is Player.WHITE else Player.WHITE
+        if self.borne_count(loser) > 0:
+            return 1
+        if self.has_in_bar(loser):
+            return 3
+        sign = loser.value
+        for i in self.home_range(winner):
+            if self.__state__[i] * sign > 0:
+                return 3
+        return 2
+
+    def check_move(self, player: Player, src: int | None, die: int) -> "MoveStatus":
+        """
+        Valida un movimiento sin modificar el tablero y sin lanzar excepciones.
+        Devuelve MoveStatus.OK o el motivo por el que move lo rechazaria.
+        """
+        if die < 1:
+            return MoveStatus.INVALID_DIE
+        state = self.__state__
+        sign = player.value
+        if src is None:
+            if not state[BAR_SLOT[player]]:
+                return MoveStatus.MUST_ENTER_FROM_BAR
+            dest = (die - 1) if sign < 0 else (24 - die)
+        else:
+            if state[BAR_SLOT[player]]:
+                return MoveStatus.MUST_ENTER_FROM_BAR
+            if src < 0 or src > 23:
+                return MoveStatus.INVALID_INDEX
+            if state[src] * sign <= 0:
+                return MoveStatus.NO_CHECKER
+            dest = src + sign * die
+
+        if (dest < 0 and sign < 0) or (dest > 23 and sign > 0):
+            #La ficha que se mueve ya no cuenta para saber si puede retirar
+            outside = self.__outside__[player]
+            if (sign < 0 and src > 5) or (sign > 0 and src < 18):
+                outside -= 1
+            if outside > 0:
+                return MoveStatus.BEAR_OFF_NOT_ALLOWED
+            return MoveStatus.OK
+
+        if dest < 0 or dest > 23:
+            return MoveStatus.OUT_OF_BOARD
+
+        at_dest = state[dest] * sign
+        if at_dest <= -2:
+            return MoveStatus.ENTRY_BLOCKED if src is None else MoveStatus.POINT_BLOCKED
+        if at_dest >= MAX_STACK:
+            return MoveStatus.STACK_FULL
+        return MoveStatus.OK
+
+    def is_legal(self, player: Player, src: int | None, die: int) -> bool:
+        return self.check_move(player, src, die) is MoveStatus.OK
+
+    def try_move(self, player: Player, src: int | None, die: int) -> "MoveStatus":
+        """Como move, pero en vez de lanzar devuelve el MoveStatus (y solo mueve si es OK)."""
+        status = self.check_move(player, src, die)
+        if status is MoveStatus.OK:
+            self.__apply_move__(player, src, die)
+        return status
+
     def move(self, player: Player, src: int | None, die: int) -> None:
-        MAX_STACK = 5
-        if src is not None and self.has_in_bar(player):
-            raise MustEnterFromBar()
+        status = self.check_move(player, src, die)
+        if status is not MoveStatus.OK:
+            raise _status_error(status)
+        self.__apply_move__(player, src, die)
 
+    def __apply_move__(self, player: Player, src: int | None, die: int) -> None:#Aplica un movimiento ya validado
+        sign = player.value
         if src is None:
-            if not self.__bar__[player]:
-                raise MustEnterFromBar()
-            checker = self.__bar__[player].pop()
-            src_index = None
+            from_slot = BAR_SLOT[player]
             dest = self.entry_index_from_bar(player, die)
+        else:
+            from_slot = src
+            dest = src + sign * die
+            #Equivale a (dest = self.dest_index(player, src, die))
 
+        if dest < 0 or dest > 23:
+            delta = (player, from_slot, BORNE_SLOT[player], die, False)
         else:
-            if src < 0 or src > 23:
-                raise ValueError("Índice inválido")
-            pile = self.__points__[src]
-            if not pile or pile[-1].owner != player:
-                raise NoCheckerAtPoint()
-            checker = pile.pop()
-            src_index = src
-            if player is Player.WHITE:
-                dest = src - die
-            else:
-                dest = src + die
-            #Podria haber usado (dest = src + self.direction(player) * die)
+            delta = (player, from_slot, dest, die, self.__state__[dest] * sign == -1)
+        self.__do_delta__(delta)
+        self.__journal__.append(delta)
+        self.__redo__.clear()
 
-        if dest < 0 and player is Player.WHITE:
-            if not self.can_bear_off(player):
-                raise BearOffNotAllowed()
-            self.__borne__[player].append(checker)
-            return
-        if dest > 23 and player is Player.BLACK:
-            if not self.can_bear_off(player):
-                raise BearOffNotAllowed()
-            self.__borne__[player].append(checker)
-            return
+    #Journal de deltas: (player, slot_origen, slot_destino, die, hubo_golpe)
+    #slot_origen es BAR_SLOT si entra desde la barra y slot_destino es BORNE_SLOT si retira
 
-        if dest < 0 or dest > 23:
-            raise ValueError("Destino fuera del tablero")
+    def __do_delta__(self, delta) -> None:
+        player, from_slot, to_slot, _, hit = delta
+        state = self.__state__
+        sign = player.value
+        self.__set_slot__(from_slot, state[from_slot] - (sign if from_slot < 24 else 1))
+        if to_slot >= 24:
+            self.__set_slot__(to_slot, state[to_slot] + 1)
+        elif hit:
+            opp_bar = BAR_SLOT[Player.BLACK if player is Player.WHITE else Player.WHITE]
+            self.__set_slot__(opp_bar, state[opp_bar] + 1)
+            self.__set_slot__(to_slot, sign)
+        else:
+            self.__set_slot__(to_slot, state[to_slot] + sign)
+
+    def __undo_delta__(self, delta) -> None:
+        player, from_slot, to_slot, _, hit = delta
+        state = self.__state__
+        sign = player.value
+        if to_slot >= 24:
+            self.__set_slot__(to_slot, state[to_slot] - 1)
+        elif hit:
+            opp_bar = BAR_SLOT[Player.BLACK if player is Player.WHITE else Player.WHITE]
+            self.__set_slot__(to_slot, -sign)
+            self.__set_slot__(opp_bar, state[opp_bar] - 1)
+        else:
+            self.__set_slot__(to_slot, state[to_slot] - sign)
+        self.__set_slot__(from_slot, state[from_slot] + (sign if from_slot < 24 else 1))
 
-        dest_pile = self.__points__[dest]
+    def undo(self):
+        """
+        Deshace el ultimo movimiento en O(1), sin copiar el tablero.
+        Devuelve el delta deshecho o None si no hay nada para deshacer.
+        """
+        if not self.__journal__:
+            return None
+        delta = self.__journal__.pop()
+        self.__undo_delta__(delta)
+        self.__redo__.append(delta)
+        return delta
 
-        if dest_pile and dest_pile[-1].owner is not player and len(dest_pile) == 1:
-            beaten = dest_pile.pop()
-            opponent = Player.BLACK if player is Player.WHITE else Player.WHITE
-            self.__bar__[opponent].append(beaten)
+    def redo(self):
+        """Vuelve a aplicar el ultimo movimiento deshecho. Devuelve el delta o None."""
+        if not self.__redo__:
+            return None
+        delta = self.__redo__.pop()
+        self.__do_delta__(delta)
+        self.__journal__.append(delta)
+        return delta
 
-        if dest_pile and dest_pile[-1].owner is not player and len(dest_pile) >= 2:
-            if src_index is None:
-                self.__bar__[player].append(checker)
-                raise EntryBlocked()
-            else:
-                self.__points__[src_index].append(checker)
-                raise PointBlocked()
+    @property
+    def journal_length(self) -> int:#Cantidad de movimientos que se pueden deshacer
+        return len(self.__journal__)
 
-        if dest_pile and dest_pile[-1].owner is player and len(dest_pile) >= MAX_STACK:
-            if src_index is None:
-                self.__bar__[player].append(checker)
-            else:
-                self.__points__[src_index].append(checker)
-            from backgammon.core.exceptions import IllegalMoves
-            raise IllegalMoves("No podés tener más de 5 fichas en un punto.")
+    @property
+    def last_move(self):#Ultimo delta del journal (ver arriba) o None
+        return self.__journal__[-1] if self.__journal__ else None
 
-        dest_pile.append(checker)
+    @property
+    def redo_length(self) -> int:
+        return len(self.__redo__)
 
 
     def ascii(self) -> str:
@@ -178,10 +528,10 @@ class Board:
         top_line = " ".join(f"{cell(i):>2}" for i in top_idx)
         bot_line = " ".join(f"{cell(i):>2}" for i in bot_idx)
 
-        bar_w = len(self.__bar__[Player.WHITE])
-        bar_b = len(self.__bar__[Player.BLACK])
-        borne_w = len(self.__borne__[Player.WHITE])
-        borne_b = len(self.__borne__[Player.BLACK])
+        bar_w = self.bar_count(Player.WHITE)
+        bar_b = self.bar_count(Player.BLACK)
+        borne_w = self.borne_count(Player.WHITE)
+        borne_b = self.borne_count(Player.BLACK)
 
         sep = "-" * max(len(top_line), 40)
 
@@ -212,4 +562,4 @@ class Board:
             else:
                 output.append(f"{i:2d}: vacio")
         
-        return "\n".join(output)#une todos los elementos de output en un string separado por saltos de linea
\ No newline at end of file
+        return "\n".join(output)#une todos los elementos de output en un string separado por saltos de linea
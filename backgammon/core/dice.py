@@ -1,20 +1,154 @@
 import random #Lo importamos para poder utilizar funciones con las cuales generemos números aleatorios 
+from backgammon.core.exceptions import DiceScriptExhausted
+
+
+class BatchRolls:
+    """
+    Fuente de tiradas por bloques: genera block_size tiradas de una vez con NumPy
+    (una sola llamada vectorizada) y las va sirviendo desde un buffer.
+    NumPy se importa recien al crear la fuente, el resto del core no lo necesita.
+    """
+
+    def __init__(self, seed=None, block_size: int = 65536, generator=None):
+        import numpy as np
+        if block_size < 1:
+            raise ValueError("block_size debe ser positivo")
+        self.__np__ = np
+        self.__gen__ = generator if generator is not None else np.random.default_rng(seed)
+        self.__block_size__ = block_size
+        self.__block__ = np.empty((0, 2), dtype=np.int8)
+        self.__rows__ = []
+        self.__pos__ = 0
+
+    def reseed(self, seed) -> None:#Descarta lo que quedaba en el buffer
+        self.__gen__ = self.__np__.random.default_rng(seed)
+        self.__block__ = self.__block__[:0]
+        self.__rows__ = []
+        self.__pos__ = 0
+
+    def __refill__(self) -> None:
+        self.__block__ = self.__gen__.integers(1, 7, size=(self.__block_size__, 2), dtype=self.__np__.int8)
+        self.__rows__ = self.__block__.tolist()
+        self.__pos__ = 0
+
+    def next_roll(self) -> tuple:
+        if self.__pos__ >= len(self.__rows__):
+            self.__refill__()
+        a, b = self.__rows__[self.__pos__]
+        self.__pos__ += 1
+        return a, b
+
+    def take(self, n: int):
+        """Devuelve las proximas n tiradas como array (n, 2) de int8, del mismo flujo que next_roll."""
+        np = self.__np__
+        parts = []
+        while n > 0:
+            if self.__pos__ >= len(self.__rows__):
+                self.__refill__()
+            chunk = self.__block__[self.__pos__:self.__pos__ + n]
+            self.__pos__ += len(chunk)
+            n -= len(chunk)
+            parts.append(chunk)
+        return np.concatenate(parts) if len(parts) != 1 else parts[0].copy()
+
+
+class ScriptedRolls:
+    """Fuente de tiradas que repite una secuencia fija (tests, repeticion de partidas)."""
+
+    def __init__(self, rolls, loop: bool = False):
+        self.__rolls__ = [tuple(r) for r in rolls]
+        for a, b in self.__rolls__:
+            if not (1 <= a <= 6 and 1 <= b <= 6):
+                raise ValueError("Las tiradas deben estar entre 1 y 6")
+        self.__loop__ = loop
+        self.__pos__ = 0
+
+    @property
+    def remaining(self) -> int:
+        return len(self.__rolls__) - self.__pos__
+
+    def next_roll(self) -> tuple:
+        if self.__pos__ >= len(self.__rolls__):
+            if not self.__loop__ or not self.__rolls__:
+                raise DiceScriptExhausted()
+            self.__pos__ = 0
+        roll = self.__rolls__[self.__pos__]
+        self.__pos__ += 1
+        return roll
 
 
 class Dice:
-    def __init__(self):
+    def __init__(self, rng=None, seed=None, source=None):
         """
         Inicializa los dados en estado 'sin tirar'.
         Los valores iniciales se representan como [0, 0].
+        rng es el generador a usar (cualquier objeto con randint, p. ej. random.Random);
+        con seed se crea un random.Random(seed) propio; si no se pasa ninguno se usa el modulo random global.
+        source es una fuente de tiradas (BatchRolls, ScriptedRolls) que tiene prioridad sobre rng.
         """
         self.__values__ = [0, 0]
+        if rng is None and seed is not None:
+            rng = random.Random(seed)
+        self.__rng__ = rng if rng is not None else random
+        self.__source__ = source
+
+    @classmethod
+    def batched(cls, seed=None, block_size: int = 65536) -> "Dice":
+        """Dados que pre-generan bloques de tiradas con NumPy (simulaciones masivas)."""
+        return cls(source=BatchRolls(seed, block_size))
+
+    @classmethod
+    def scripted(cls, rolls, loop: bool = False) -> "Dice":
+        """Dados que devuelven una secuencia fija de tiradas, p. ej. [(3, 1), (6, 6)]."""
+        return cls(source=ScriptedRolls(rolls, loop))
     
+    def set_rng(self, rng) -> None:
+        """
+        Cambia el generador de los dados (None vuelve al modulo random global).
+        Descarta la fuente de tiradas si habia una.
+        """
+        self.__rng__ = rng if rng is not None else random
+        self.__source__ = None
+
+    def set_source(self, source) -> None:
+        self.__source__ = source
+
+    def seed(self, value) -> None:
+        """
+        Reinicia el flujo de tiradas con una semilla (la fuente por bloques se re-siembra,
+        sino se usa un random.Random(value) propio). Una fuente sin reseed (por ejemplo
+        ScriptedRolls) no se puede sembrar: ValueError.
+        """
+        if self.__source__ is None:
+            self.__rng__ = random.Random(value)
+        elif hasattr(self.__source__, "reseed"):
+            self.__source__.reseed(value)
+        else:
+            raise ValueError(f"La fuente de tiradas {type(self.__source__).__name__} no admite semilla")
+
+    @property
+    def rng(self):
+        return self.__rng__
+
+    @property
+    def source(self):
+        return self.__source__
+
+    def draw(self) -> tuple:
+        """
+        Saca un par de valores del flujo sin cambiar el estado de los dados
+        (lo usa Game para el sorteo inicial).
+        """
+        if self.__source__ is not None:
+            return self.__source__.next_roll()
+        return self.__rng__.randint (1, 6), self.__rng__.randint (1, 6)
+
     def roll(self):
         """
         Realiza una tirada de dos dados, generando valores aleatorios entre 1 y 6.
         Devuelve la lista con los valores obtenidos.
         """
-        self.__values__ = [random.randint (1, 6), random.randint (1, 6)]
+        self.__values__ = list(self.draw())
         return self.__values__
     
     @property#Nos va permitir acceder a los metodos como si fueran atributos, por mas que devuelvan valores internos 
@@ -0,0 +1,92 @@
+"""
+Historial de la partida como eventos tipados y compactos.
+
+Cada evento es una tupla chica (tipo, jugador, a, b, c) con enteros (jugador = Player.value,
+0 si no corresponde); el texto se arma recien cuando se muestra (format_event). EventLog
+guarda los eventos en un deque con tope opcional: al llenarse descarta los mas viejos.
+"""
+from collections import deque
+from enum import IntEnum
+from backgammon.core.player import Player
+
+
+class EventKind(IntEnum):
+    START = 0
+    RESET = 1
+    PLAYERS = 2     #a, b = nombres de WHITE y BLACK
+    DRAW = 3        #Sorteo inicial: a, b = dados de WHITE y BLACK, jugador = el que empieza
+    ROLL = 4        #a, b = dados
+    MOVE = 5        #a = origen (-1 = barra), b = destino, c = dado
+    HIT = 6         #a = punto donde se golpeo
+    BEAR_OFF = 7    #a = origen, c = dado
+    PASS = 8        #jugador = el que pasa a jugar
+    GAME_OVER = 9   #jugador = ganador, a = puntos
+    LOADED = 10     #Posicion cargada sin reproducir movimientos
+
+
+def _name(value: int) -> str:
+    return Player(value).name
+
+
+def format_event(event: tuple) -> str:
+    """Texto del evento (los mismos textos que usaba el historial de Game)."""
+    kind, player, a, b, c = event
+    if kind == EventKind.START:
+        return "Game: Start (esperando sorteo con 'roll')"
+    if kind == EventKind.RESET:
+        return "Game:Reset"
+    if kind == EventKind.PLAYERS:
+        return f"Jugadores: WHITE={a} / BLACK={b}"
+    if kind == EventKind.DRAW:
+        return f"Draw: WHITE {a} vs BLACK {b} -> {_name(player)} starts"
+    if kind == EventKind.ROLL:
+        return f"{_name(player)} roll: {a}-{b}"
+    if kind == EventKind.MOVE:
+        return f"{_name(player)} move: {'bar' if a < 0 else a} -> {b} ({c})"
+    if kind == EventKind.HIT:
+        return f"{_name(player)} golpea en {a}"
+    if kind == EventKind.BEAR_OFF:
+        return f"{_name(player)} retira desde {a} ({c})"
+    if kind == EventKind.PASS:
+        return f"Turno: Ahora juega {_name(player)}"
+    if kind == EventKind.GAME_OVER:
+        return f"Game: Terminó, (Winner {_name(player)})"
+    return "Game: Posicion cargada"
+
+
+class EventLog:
+    """
+    Registro de eventos con tope (maxlen=None = sin tope). Iterarlo no copia nada;
+    lines() formatea a texto de a un evento.
+    """
+
+    def __init__(self, maxlen: int | None = None):
+        if maxlen is not None and maxlen < 1:
+            raise ValueError("maxlen debe ser positivo")
+        self.__events__ = deque(maxlen=maxlen)
+        self.__total__ = 0
+
+    @property
+    def maxlen(self) -> int | None:
+        return self.__events__.maxlen
+
+    @property
+    def dropped(self) -> int:#Eventos descartados por el tope
+        return self.__total__ - len(self.__events__)
+
+    def append(self, kind: EventKind, player: Player | None = None, a=0, b=0, c=0) -> None:
+        self.__events__.append((int(kind), player.value if player is not None else 0, a, b, c))
+        self.__total__ += 1
+
+    def clear(self) -> None:
+        self.__events__.clear()
+        self.__total__ = 0
+
+    def __len__(self) -> int:
+        return len(self.__events__)
+
+    def __iter__(self):
+        return iter(self.__events__)
+
+    def lines(self):
+        return map(format_event, self.__events__)
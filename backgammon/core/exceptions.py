@@ -24,6 +24,9 @@ class DiceNotRolled(BackgammonError):
 class DiceAlreadyRolled(BackgammonError):
     """Se intento volver a tirar en el mismo turno"""
 
+class DiceScriptExhausted(BackgammonError):
+    """Se terminaron las tiradas de unos dados con secuencia fija"""
+
 #Movimiento en tablero
 
 class IllegalMoves(BackgammonError):
@@ -47,4 +50,9 @@ class BearOffNotAllowed(BackgammonError):
 #CLI
 
 class InvalidCommand(BackgammonError):
-    """Comando invalido"""
\ No newline at end of file
+    """Comando invalido"""
+
+#Archivos
+
+class MatchFileError(BackgammonError):
+    """Archivo de partidas (.mat/.txt) con formato invalido o jugadas ilegales"""
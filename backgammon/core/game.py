@@ -1,10 +1,10 @@
 from backgammon.core.board import Board
 from backgammon.core.dice import Dice
 from backgammon.core.player import Player
+from backgammon.core.events import EventKind, EventLog
 from backgammon.core.exceptions import(
-    GameNotStrated, GameAlredyStarted, GameFinished, DiceAlreadyRolled, DiceNotRolled
+    GameNotStrated, GameAlredyStarted, GameFinished, DiceAlreadyRolled, DiceNotRolled, IllegalMoves
     ) 
-import random
 
 class Game :
     """
@@ -12,17 +12,30 @@ class Game :
     El inicio y reinicio de la partida, Consultas de estado.
     """
 
-    def __init__(self):
-        "Crea un partida nueva sin iniciar"
+    def __init__(self, record_history: bool = True, rng=None, dice: Dice | None = None,
+                 history_limit: int | None = None):
+        """
+        Crea un partida nueva sin iniciar.
+        Con record_history=False no se registran eventos (self-play / simulaciones);
+        history_limit es el tope de eventos guardados (se descartan los mas viejos).
+        rng (p. ej. random.Random(seed)) se usa para el sorteo inicial y los dados;
+        si no se pasa se usa el modulo random global. Tambien se pueden inyectar los dados
+        (Dice.batched, Dice.scripted, ...).
+        """
+        self.__record_history__ = record_history
         self.__board__ = Board()
-        self.__dice__ = Dice()
+        self.__dice__ = dice if dice is not None else Dice(rng)
         self.__current_player__ = None
         self.__started__ = False
         self.__finished__ = False
         self.__winner__ = None
         self.__turn_count__ = 0
-        self.__history__ = []
+        self.__history__ = EventLog(history_limit)
         self.__players_info__ = {}
+        self.__turns__ = []  #Pases de turno deshacibles: (jugador, dados, largo del journal del tablero)
+        self.__redo_stack__ = []  #None = movimiento del tablero, tupla = pase de turno
+        self.__recorder__ = None  #RecordWriter que recibe la partida mientras se juega
+        self.__record_seed__ = None
     
     def start(self):
         """
@@ -41,11 +54,14 @@ class Game :
         self.__finished__ = False
         self.__winner__ = None
         self.__turn_count__ = 1
+        self.__turns__ = []
+        self.__redo_stack__ = []
 
         self.__current_player__ = None        # <<< clave: aún no hay jugador
         self.__needs_opening_roll__ = True    # <<< sorteo pendiente
 
-        self.__history__.append("Game: Start (esperando sorteo con 'roll')")
+        if self.__record_history__:
+            self.__history__.append(EventKind.START)
 
     def reset(self):
         """
@@ -58,9 +74,48 @@ class Game :
         self.__finished__ = False
         self.__winner__ = None
         self.__turn_count__ = 0
-        self.__history__.append("Game:Reset")
+        self.__turns__ = []
+        self.__redo_stack__ = []
+        if self.__record_history__:
+            self.__history__.append(EventKind.RESET)
 
     
+    def load_position(self, state, player: Player | None, dice=(0, 0)) -> None:
+        """
+        Carga una posicion directamente, sin reproducir movimientos (ver backgammon.core.positionid):
+        state es el buffer de 28 valores, player el que esta en turno (None = falta el sorteo)
+        y dice los dados ya tirados ((0, 0) = sin tirar). La partida queda iniciada.
+        """
+        self.__board__ = Board.from_state(state)
+        self.__dice__.__values__ = list(dice)
+        self.__started__ = True
+        self.__current_player__ = player
+        self.__needs_opening_roll__ = player is None
+        self.__turn_count__ = max(self.__turn_count__, 1)
+        self.__turns__ = []
+        self.__redo_stack__ = []
+        if self.__recorder__ is not None:
+            self.__recorder__.end(None, 0)  #La posicion cargada no se puede reproducir
+        self.check_game_over()
+        if self.__record_history__:
+            self.__history__.append(EventKind.LOADED)
+
+    def record_to(self, writer, seed: int | None = None) -> None:
+        """
+        Graba las partidas en writer (backgammon.core.record.RecordWriter) a medida que se juegan:
+        cada una empieza con el sorteo inicial y termina con check_game_over. seed queda en el
+        encabezado como dato. undo/redo tambien se reflejan (deshacer la jugada ganadora reabre
+        la partida grabada). writer=None deja de grabar.
+        """
+        self.__recorder__ = writer
+        self.__record_seed__ = seed
+
+    def set_rng(self, rng) -> None:
+        """
+        Cambia el generador del sorteo inicial y de los dados (None = modulo random global).
+        """
+        self.__dice__.set_rng(rng)
+
     @property
     def board(self) -> Board:
         return self.__board__
@@ -101,23 +156,24 @@ class Game :
             raise GameFinished()
 
         if self.__current_player__ is None:
-            w = random.randint(1, 6)
-            b = random.randint(1, 6)
+            w, b = self.__dice__.draw()
             while w == b:
-                w = random.randint(1, 6)
-                b = random.randint(1, 6)
+                w, b = self.__dice__.draw()
             self.__current_player__ = Player.WHITE if w > b else Player.BLACK
-            self.__history__.append(
-                f"Draw: WHITE {w} vs BLACK {b} -> {self.__current_player__.name} starts"
-            )
+            if self.__record_history__:
+                self.__history__.append(EventKind.DRAW, self.__current_player__, w, b)
+            if self.__recorder__ is not None:
+                self.__recorder__.begin(self.get_player_name(Player.WHITE), self.get_player_name(Player.BLACK),
+                                        self.__record_seed__, (w, b))
             self.__dice__.reset()
             return[w, b]
         if self.__dice__.values != (0, 0):
             raise DiceAlreadyRolled()
         vals = self.__dice__.roll()
-        self.__history__.append(
-            f"{self.__current_player__.name} roll: {vals[0]}-{vals[1]}"
-        )
+        if self.__record_history__:
+            self.__history__.append(EventKind.ROLL, self.__current_player__, vals[0], vals[1])
+        if self.__recorder__ is not None and self.__recorder__.in_game:
+            self.__recorder__.roll(vals)
         return vals
     
     def pass_turn(self):
@@ -131,25 +187,130 @@ class Game :
         if self.__dice__.values == (0, 0):
             raise DiceNotRolled
         
+        self.__turns__.append((self.__current_player__, self.__dice__.values, self.__board__.journal_length))
+        self.__redo_stack__.clear()
         self.__current_player__ =(Player.BLACK if self.__current_player__ is Player.WHITE else Player.WHITE)
         self.__turn_count__ += 1
         self.__dice__.reset()
-        self.__history__.append(f"Turno: Ahora juega {self.__current_player__.name}")
+        if self.__record_history__:
+            self.__history__.append(EventKind.PASS, self.__current_player__)
+        if self.__recorder__ is not None and self.__recorder__.in_game:
+            self.__recorder__.pass_turn()
+
+    def move(self, src: int | None, die: int) -> None:
+        """
+        Mueve una ficha del jugador en turno (src None = desde la barra) con Board.move
+        y registra el movimiento, el golpe o el retiro en el historial.
+        die tiene que ser uno de los dados tirados (DiceNotRolled si falta el sorteo o la tirada).
+        """
+        if not self.__started__:
+            raise GameNotStrated()
+        if self.__finished__:
+            raise GameFinished()
+        if self.__current_player__ is None or self.__dice__.values == (0, 0):
+            raise DiceNotRolled()
+        if die not in self.__dice__.values:
+            raise IllegalMoves(f"El dado {die} no esta en la tirada {self.__dice__.values}")
+        board = self.__board__
+        before = board.journal_length
+        board.move(self.__current_player__, src, die)
+        if self.__recorder__ is not None and self.__recorder__.in_game:
+            self.__recorder__.move(src, die)
+        if self.__record_history__ and board.journal_length > before:
+            player, from_slot, to_slot, _, hit = board.last_move
+            origin = -1 if src is None else src
+            if to_slot >= 24:
+                self.__history__.append(EventKind.BEAR_OFF, player, origin, 0, die)
+            else:
+                self.__history__.append(EventKind.MOVE, player, origin, to_slot, die)
+                if hit:
+                    self.__history__.append(EventKind.HIT, player, to_slot)
 
     def check_game_over(self):
         """
         Verifica si alguien ganó
         """
-        white_out = len(self.__board__.__borne__[Player.WHITE]) == 15
-        black_out = len(self.__board__.__borne__[Player.BLACK]) == 15
+        white_out = self.__board__.borne_count(Player.WHITE) == 15
+        black_out = self.__board__.borne_count(Player.BLACK) == 15
         if white_out or black_out:
             self.__finished__ = True
             self.__winner__ = Player.WHITE if white_out else Player.BLACK
-            self.__history__.append(f"Game: Terminó, (Winner {self.__winner__.name})")
+            if self.__record_history__:
+                self.__history__.append(EventKind.GAME_OVER, self.__winner__, self.win_points())
+            if self.__recorder__ is not None and self.__recorder__.in_game:
+                self.__recorder__.end(self.__winner__, self.win_points())
         else:
             self.__finished__ = False
             self.__winner__ = None
     
+    def win_points(self) -> int:
+        """
+        Puntos de la partida terminada: 1 simple, 2 gammon (el perdedor no retiro ninguna ficha),
+        3 backgammon (ademas le queda alguna en la barra o en el home del ganador).
+        Devuelve 0 si la partida no termino.
+        """
+        if not self.__finished__:
+            return 0
+        return self.__board__.win_points(self.__winner__)
+
+    def undo(self) -> bool:
+        """
+        Deshace el ultimo movimiento del tablero o, si el turno no tiene movimientos,
+        el ultimo pase de turno (vuelven el jugador y los dados). O(1), sin copiar el tablero.
+        Devuelve False si no hay nada para deshacer.
+        """
+        mark = self.__turns__[-1][2] if self.__turns__ else 0
+        if self.__board__.journal_length > mark:
+            self.__board__.undo()
+            self.__redo_stack__.append(None)
+            if self.__finished__ and self.__board__.borne_count(self.__winner__) < 15:
+                self.__finished__ = False
+                self.__winner__ = None
+                if self.__recorder__ is not None:
+                    self.__recorder__.reopen()
+            if self.__recorder__ is not None:
+                self.__recorder__.undo_move()
+            return True
+        if self.__turns__:
+            player, dice, mark = self.__turns__.pop()
+            self.__current_player__ = player
+            self.__turn_count__ -= 1
+            self.__dice__.__values__ = list(dice)
+            self.__redo_stack__.append((player, dice, mark))
+            if self.__recorder__ is not None:
+                self.__recorder__.undo_pass()
+            return True
+        return False
+
+    def redo(self) -> bool:
+        """
+        Rehace lo ultimo que se deshizo con undo. Si despues de deshacer se jugo
+        algo nuevo, lo deshecho se descarta y devuelve False.
+        """
+        if not self.__redo_stack__:
+            return False
+        entry = self.__redo_stack__.pop()
+        if entry is None:
+            if self.__board__.redo() is None:
+                self.__redo_stack__.clear()
+                return False
+            if self.__recorder__ is not None and self.__recorder__.in_game:
+                _, from_slot, _, die, _ = self.__board__.last_move
+                self.__recorder__.move(None if from_slot >= 24 else from_slot, die)
+            self.check_game_over()
+            return True
+        player, dice, mark = entry
+        if mark != self.__board__.journal_length:
+            self.__redo_stack__.clear()
+            return False
+        self.__turns__.append(entry)
+        self.__current_player__ = (Player.BLACK if player is Player.WHITE else Player.WHITE)
+        self.__turn_count__ += 1
+        self.__dice__.reset()
+        if self.__recorder__ is not None and self.__recorder__.in_game:
+            self.__recorder__.pass_turn()
+        return True
+
     def setup_players(self, who_is_white: str, who_is_black:str) -> None:
         """
         Define los nombres de los jugadoer segun el tablero (WHITE/BLACK)
@@ -159,9 +320,9 @@ class Game :
             "WHITE": who_is_white.strip() or "Jugador Blanco",
             "BLACK": who_is_black.strip() or "Jugador Negro"
         }
-        self.__history__.append(
-            f"Jugadores: WHITE={self.__players_info__["WHITE"]} / BLACK={self.__players_info__["BLACK"]}"
-        )
+        if self.__record_history__:
+            self.__history__.append(EventKind.PLAYERS, None, self.__players_info__["WHITE"],
+                                    self.__players_info__["BLACK"])
         
     def get_player_name(self, player: Player) -> str:
         """
@@ -189,7 +350,17 @@ class Game :
 
     def history(self):
         """
-        Nos devuelve una copia de los eventos registrados
+        Nos devuelve una copia de los eventos registrados, como textos
         """
-        return list(self.__history__)
+        return list(self.__history__.lines())
+
+    def events(self):
+        """
+        Iterador sobre los eventos (tuplas, ver backgammon.core.events) sin copiarlos
+        """
+        return iter(self.__history__)
+
+    @property
+    def event_log(self) -> EventLog:
+        return self.__history__
       
\ No newline at end of file
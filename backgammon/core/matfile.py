@@ -0,0 +1,377 @@
+"""
+Importador de partidas en el formato de texto .mat/.txt (el que exportan GNU Backgammon,
+Jellyfish, Snowie, ...):
+
+     7 point match
+
+     Game 1
+     Ana : 0                              Beto : 0
+      1)                                  52: 13/8 13/11
+      2) 31: 8/5 6/5                      64: 24/18 13/9
+      3) 66: 24/18(2) 13/7*(2)            Doubles => 2
+          ...
+                                          Wins 1 point
+
+La columna izquierda es WHITE y la derecha BLACK; cada uno anota los puntos desde su lado
+(24 = el mas lejano, bar = 25, off = 0). Cada jugada se valida con las reglas del core: la
+posicion que resulta de la anotacion tiene que ser una de las de generate_plays. Este motor no
+tiene cubo: las acciones del cubo se ignoran, los puntos del "Wins" se guardan tal cual.
+Ojo: el core no deja apilar mas de MAX_STACK fichas en un punto, asi que las partidas que lo
+hacen se rechazan (quedan contadas en ImportStats.rejected).
+
+MatchImporter reparte los archivos en bloques de partidas entre un pool de procesos (un bloque
+por tarea) y escribe las partidas validas, en orden, en un RecordWriter (ver backgammon.core.record).
+"""
+import os
+import re
+import time
+from array import array
+from multiprocessing import get_context
+from backgammon.core.board import Board, BAR_SLOT, BORNE_SLOT
+from backgammon.core.exceptions import MatchFileError
+from backgammon.core.movegen import generate_plays
+from backgammon.core.player import Player
+from backgammon.core.record import GameRecord
+
+CHUNK_GAMES = 200
+MAX_ERRORS = 100   #Errores que se guardan en ImportStats (el resto solo se cuenta)
+BAR_POINT, OFF_POINT = 25, 0
+
+GAME_RE = re.compile(r"^\s*Game\s+\d+\s*$")
+GAME_LINE_RE = re.compile(rb"^\s*Game\s+\d+\s*$")
+SCORE_RE = re.compile(r"^\s*(\S.*?)\s*:\s*(\d+)\s+(\S.*?)\s*:\s*(\d+)\s*$")
+TURN_RE = re.compile(r"^\s*\d+\)")
+SEGMENT_RE = re.compile(r"\S+(?: \S+)*")   #Entradas separadas por 2 o mas espacios
+NEXT_DICE_RE = re.compile(r" (?=[1-6][1-6]:)")
+DICE_RE = re.compile(r"^([1-6])([1-6]):$")
+WINS_RE = re.compile(r"^Wins\s+(\d+)\s+point")
+REPEAT_RE = re.compile(r"^(.+?)\((\d)\)$")
+
+
+def _point(text: str, line: int) -> int:
+    text = text.rstrip("*").lower()
+    if text in ("bar", "b"):
+        return BAR_POINT
+    if text in ("off", "o"):
+        return OFF_POINT
+    if text.isdigit() and 0 <= int(text) <= 25:
+        return int(text)
+    raise MatchFileError(f"linea {line}: punto invalido {text!r}")
+
+
+def _slot(player: Player, point: int) -> int:#Punto 1..24 visto desde player -> indice del tablero
+    return point - 1 if player is Player.WHITE else 24 - point
+
+
+def target_state(board: Board, player: Player, text: str, line: int = 0) -> array:
+    """
+    Estado del tablero despues de aplicar la anotacion (p. ej. "bar/22* 13/7(2) 8/5/off")
+    sin chequear reglas: solo saca y pone fichas y manda a la barra las fichas sueltas golpeadas.
+    """
+    state = list(board.state)
+    sign = player.value
+    opponent = Player.BLACK if player is Player.WHITE else Player.WHITE
+    for token in text.split():
+        repeat = 1
+        m = REPEAT_RE.match(token)
+        if m:
+            token, repeat = m.group(1), int(m.group(2))
+        points = [_point(p, line) for p in token.split("/")]
+        if len(points) < 2:
+            raise MatchFileError(f"linea {line}: movimiento invalido {token!r}")
+        for _ in range(repeat):
+            for src, dest in zip(points, points[1:]):
+                if src == BAR_POINT:
+                    if state[BAR_SLOT[player]] < 1:
+                        raise MatchFileError(f"linea {line}: no hay fichas en la barra ({token})")
+                    state[BAR_SLOT[player]] -= 1
+                else:
+                    slot = _slot(player, src)
+                    if src == OFF_POINT or state[slot] * sign < 1:
+                        raise MatchFileError(f"linea {line}: no hay ficha en {src} ({token})")
+                    state[slot] -= sign
+                if dest == OFF_POINT:
+                    state[BORNE_SLOT[player]] += 1
+                    continue
+                if dest == BAR_POINT:
+                    raise MatchFileError(f"linea {line}: movimiento invalido {token!r}")
+                slot = _slot(player, dest)
+                if state[slot] * sign == -1:
+                    state[slot] = 0
+                    state[BAR_SLOT[opponent]] += 1
+                state[slot] += sign
+    if any(not -128 <= value <= 127 for value in state):
+        raise MatchFileError(f"linea {line}: movimiento invalido {text!r}")
+    return array('b', state)
+
+
+def _entries(lines, first_line: int):
+    """(nombres, [(linea, jugador, texto)]) de las lineas de una partida."""
+    names = None
+    threshold = 20
+    entries = []
+    for k, line in enumerate(lines):
+        number = first_line + k
+        if names is None:
+            m = SCORE_RE.match(line)
+            if m:
+                names = (m.group(1), m.group(3))
+                threshold = m.start(3) // 2 + 2   #Entre la columna izquierda y la derecha
+            continue
+        m = TURN_RE.match(line)
+        start = m.end() if m else 0
+        for segment in SEGMENT_RE.finditer(line, start):
+            #Una jugada larga puede quedar pegada a la de la otra columna: se corta en cada "dd:"
+            cuts = [segment.start()] + [segment.start() + d.end() for d in NEXT_DICE_RE.finditer(segment.group())]
+            for begin, end in zip(cuts, cuts[1:] + [segment.end()]):
+                player = Player.WHITE if begin < threshold else Player.BLACK
+                entries.append((number, player, line[begin:end].strip()))
+    if names is None:
+        raise MatchFileError(f"linea {first_line}: falta la linea con los jugadores y el puntaje")
+    return names, entries
+
+
+def parse_game(lines, first_line: int = 1) -> GameRecord:
+    """
+    Convierte las lineas de una partida (desde "Game N") en un GameRecord, validando cada
+    jugada con las reglas del core. Lanza MatchFileError con el numero de linea si algo falla.
+    """
+    names, entries = _entries(lines[1:], first_line + 1)
+    record = GameRecord(*names)
+    board = Board()
+    board.__reset__()
+    previous = None
+    for line, player, text in entries:
+        m = WINS_RE.match(text)
+        if m:
+            record.winner, record.points = player, int(m.group(1))
+            break
+        parts = text.split(None, 1)
+        m = DICE_RE.match(parts[0])
+        if not m:
+            continue   #Cubo (Doubles, Takes, Drops, ...) u otras anotaciones
+        if previous is not None and board.borne_count(previous) == 15:
+            raise MatchFileError(f"linea {line}: jugada despues del final de la partida")
+        if player is previous:
+            raise MatchFileError(f"linea {line}: {player.name} juega dos veces seguidas")
+        dice = (int(m.group(1)), int(m.group(2)))
+        notation = parts[1] if len(parts) > 1 else ""
+        if notation.lower().replace(" ", "") in ("cannotmove", "????"):
+            notation = ""
+        target = target_state(board, player, notation, line)
+        for play, state in generate_plays(board, player, dice):
+            if state == target:
+                break
+        else:
+            raise MatchFileError(f"linea {line}: jugada ilegal para {player.name} con {dice}: {notation!r}")
+        for src, die in play:
+            board.move(player, src, die)
+        if previous is None:
+            high, low = max(dice), min(dice)
+            if high == low:
+                high, low = 2, 1
+            record.draw = (high, low) if player is Player.WHITE else (low, high)
+        record.turns.append((player, dice, list(play)))
+        previous = player
+    if record.winner is None and previous is not None and board.borne_count(previous) == 15:
+        record.winner, record.points = previous, board.win_points(previous)
+    return record
+
+
+def split_games(lines, first_line: int = 1):
+    """Genera (linea, lineas de la partida) por cada "Game N" (lo anterior al primero se ignora)."""
+    start = None
+    for k, line in enumerate(lines):
+        if GAME_RE.match(line):
+            if start is not None:
+                yield first_line + start, lines[start:k]
+            start = k
+    if start is not None:
+        yield first_line + start, lines[start:]
+
+
+def read_match(text: str, first_line: int = 1) -> list:
+    """Todas las partidas del texto de un archivo .mat/.txt (lanza MatchFileError en la primera invalida)."""
+    return [parse_game(game, line) for line, game in split_games(text.splitlines(), first_line)]
+
+
+def read_match_file(path) -> list:
+    with open(path, encoding="utf-8", errors="replace") as f:
+        return read_match(f.read())
+
+
+def _notation(player: Player, slot: int) -> str:
+    if slot == BAR_SLOT[player]:
+        return "bar"
+    if slot == BORNE_SLOT[player]:
+        return "off"
+    return str(slot + 1 if player is Player.WHITE else 24 - slot)
+
+
+def format_play(board: Board, player: Player, play) -> str:
+    """Anotacion de una jugada (movimientos (src, die) del core) como en los .mat, p. ej. "13/8 6/5*"."""
+    board = board.copy()
+    moves = []
+    for src, die in play:
+        board.move(player, src, die)
+        _, from_slot, to_slot, _, hit = board.last_move
+        moves.append(f"{_notation(player, from_slot)}/{_notation(player, to_slot)}{'*' if hit else ''}")
+    return " ".join(moves)
+
+
+def format_match(records, match_length: int = 0) -> str:
+    """Texto .mat de las partidas (GameRecord), con el mismo formato de columnas que GNU Backgammon."""
+    out = [f" {match_length} point match" if match_length else " 0 point match", ""]
+    scores = {Player.WHITE: 0, Player.BLACK: 0}
+    for number, record in enumerate(records, 1):
+        out.append(f" Game {number}")
+        out.append(f" {record.white + ' : ' + str(scores[Player.WHITE]):<37}"
+                   f"{record.black} : {scores[Player.BLACK]}")
+        board = Board()
+        board.__reset__()
+        cells = []
+        if record.turns and record.turns[0][0] is Player.BLACK:
+            cells.append("")
+        for player, dice, moves in record.turns:
+            cells.append(f"{dice[0]}{dice[1]}: {format_play(board, player, moves)}".rstrip())
+            for src, die in moves:
+                board.move(player, src, die)
+        for k in range(0, len(cells), 2):
+            left = cells[k]
+            right = cells[k + 1] if k + 1 < len(cells) else ""
+            out.append(f"{k // 2 + 1:3d}) {left:<28} {right}".rstrip())
+        if record.winner is not None:
+            indent = 5 if record.winner is Player.WHITE else 38
+            out.append(" " * indent + f"Wins {record.points} point{'s' if record.points != 1 else ''}")
+            scores[record.winner] += record.points
+        out.append("")
+    return "\n".join(out) + "\n"
+
+
+class ImportStats:
+    """Acumula el resultado de una importacion."""
+
+    def __init__(self):
+        self.files = 0
+        self.games = 0
+        self.imported = 0
+        self.rejected = 0
+        self.turns = 0
+        self.elapsed = 0.0
+        self.errors = []   #Primeros MAX_ERRORS: "archivo: linea N: motivo"
+
+    def merge(self, other: "ImportStats") -> None:
+        self.files += other.files
+        self.games += other.games
+        self.imported += other.imported
+        self.rejected += other.rejected
+        self.turns += other.turns
+        self.elapsed = max(self.elapsed, other.elapsed)
+        self.errors.extend(other.errors[:MAX_ERRORS - len(self.errors)])
+
+    @property
+    def games_per_second(self) -> float:
+        return self.games / self.elapsed if self.elapsed > 0 else 0.0
+
+    def __str__(self):
+        lines = [
+            f"Archivos: {self.files} | Partidas: {self.games} ({self.imported} importadas, "
+            f"{self.rejected} rechazadas) en {self.elapsed:.2f}s -> {self.games_per_second:.1f} partidas/s",
+            f"Turnos importados: {self.turns}",
+        ]
+        lines += self.errors[:10]
+        return "\n".join(lines)
+
+
+def chunk_offsets(path, chunk_games: int = CHUNK_GAMES) -> list:
+    """
+    Bloques (inicio, fin, linea) en bytes de path, de chunk_games partidas cada uno.
+    Solo busca las lineas "Game N", no parsea nada.
+    """
+    starts = []
+    offset = 0
+    with open(path, "rb") as f:
+        for number, line in enumerate(f, 1):
+            if GAME_LINE_RE.match(line):
+                starts.append((offset, number))
+            offset += len(line)
+    cuts = starts[::chunk_games]
+    return [(start, cuts[k + 1][0] if k + 1 < len(cuts) else offset, line)
+            for k, (start, line) in enumerate(cuts)]
+
+
+def _parse_chunk(task):#Corre en el proceso worker: (ruta, primer bloque del archivo, inicio, fin, linea)
+    path, first, start, end, line = task
+    t0 = time.perf_counter()
+    stats = ImportStats()
+    stats.files = int(first)
+    with open(path, "rb") as f:
+        f.seek(start)
+        text = f.read(end - start).decode("utf-8", errors="replace")
+    records = []
+    for number, lines in split_games(text.splitlines(), line):
+        stats.games += 1
+        try:
+            record = parse_game(lines, number)
+        except MatchFileError as exc:
+            stats.rejected += 1
+            if len(stats.errors) < MAX_ERRORS:
+                stats.errors.append(f"{path}: {exc}")
+            continue
+        stats.imported += 1
+        stats.turns += len(record.turns)
+        records.append(record)
+    stats.elapsed = time.perf_counter() - t0
+    return records, stats
+
+
+class MatchImporter:
+    """
+    Importa muchos archivos .mat/.txt en paralelo: cada archivo se parte en bloques de
+    chunk_games partidas y cada bloque es una tarea del pool. Las partidas se escriben en el
+    orden de los archivos, igual con 1 o con N workers.
+    """
+
+    def __init__(self, workers: int | None = None, chunk_games: int = CHUNK_GAMES):
+        if chunk_games < 1:
+            raise ValueError("chunk_games debe ser positivo")
+        self.__workers__ = workers or os.cpu_count() or 1
+        self.__chunk_games__ = chunk_games
+
+    @property
+    def workers(self) -> int:
+        return self.__workers__
+
+    def tasks(self, paths) -> list:#Bloques (ruta, primer bloque del archivo, inicio, fin, linea)
+        tasks = []
+        for path in paths:
+            for k, (start, end, line) in enumerate(chunk_offsets(path, self.__chunk_games__)):
+                tasks.append((os.fspath(path), k == 0, start, end, line))
+        return tasks
+
+    def run(self, paths, writer=None, on_progress=None) -> ImportStats:
+        """
+        Importa paths y escribe las partidas validas en writer (RecordWriter, None = solo validar).
+        on_progress(stats) se llama con el acumulado cada vez que termina un bloque.
+        """
+        paths = list(paths)
+        total = ImportStats()
+        tasks = self.tasks(paths)
+        t0 = time.perf_counter()
+        if self.__workers__ == 1 or len(tasks) <= 1:
+            self.__merge__(total, map(_parse_chunk, tasks), writer, on_progress)
+        else:
+            with get_context().Pool(min(self.__workers__, len(tasks))) as pool:
+                self.__merge__(total, pool.imap(_parse_chunk, tasks), writer, on_progress)
+        total.files = len(paths)
+        total.elapsed = time.perf_counter() - t0
+        return total
+
+    def __merge__(self, total: ImportStats, results, writer, on_progress) -> None:
+        for records, stats in results:
+            if writer is not None:
+                for record in records:
+                    writer.write_game(record)
+            total.merge(stats)
+            if on_progress is not None:
+                on_progress(total)
@@ -0,0 +1,209 @@
+from array import array
+from bisect import insort
+from backgammon.core import zobrist
+from backgammon.core.board import Board, BAR_SLOT, BORNE_SLOT, MAX_STACK
+from backgammon.core.player import Player
+
+
+def _dice_orders(dice) -> tuple:
+    """Ordenes posibles en los que se pueden usar los dados de una tirada."""
+    a, b = dice
+    if not (1 <= a <= 6 and 1 <= b <= 6):
+        raise ValueError("Los dados deben estar entre 1 y 6")
+    if a == b:
+        return ((a, a, a, a),)
+    return ((a, b), (b, a))
+
+
+def _destinations(player: Player) -> tuple:
+    """_DEST[player][die][src]: punto al que llega una ficha de src con ese dado (-1 = retirar)."""
+    if player is Player.WHITE:
+        return tuple(tuple(src - die if src >= die else -1 for src in range(24)) for die in range(7))
+    return tuple(tuple(src + die if src + die <= 23 else -1 for src in range(24)) for die in range(7))
+
+
+_DEST = {player: _destinations(player) for player in Player}
+_HOME = {
+    Player.WHITE: tuple(i <= 5 for i in range(24)),
+    Player.BLACK: tuple(i >= 18 for i in range(24)),
+}
+
+
+def generate_plays(board: Board, player: Player, dice) -> list:
+    """
+    Genera todas las jugadas legales de un turno completo.
+
+    Devuelve una lista de (jugada, estado_final) donde la jugada es una tupla de
+    movimientos (src, die) listos para pasar a Board.move (src None = barra) y el
+    estado final es el buffer compacto resultante (ver Board.state).
+
+    Reglas (las mismas que aplica Board.move):
+    -Con fichas en la barra hay que entrar primero
+    -Los dobles se juegan cuatro veces
+    -Hay que usar la mayor cantidad de dados posible y, si solo se puede usar
+     uno de dos dados distintos, el mayor
+    -Jugadas que terminan en la misma posicion se devuelven una sola vez
+
+    Si no hay ningun movimiento posible devuelve [((), estado_actual)].
+
+    Las posiciones se identifican por el hash de Zobrist, que se actualiza en cada
+    paso del dfs (sin copiar el buffer), y los destinos salen de tablas por dado.
+    """
+    sign = player.value
+    white = player is Player.WHITE
+    opponent = Player.BLACK if white else Player.WHITE
+    bar_slot = BAR_SLOT[player]
+    borne_slot = BORNE_SLOT[player]
+    opp_bar = BAR_SLOT[opponent]
+    dest_table = _DEST[player]
+    home = _HOME[player]
+    table = zobrist.TABLE
+    off = zobrist.OFFSET
+    bar_keys, borne_keys, opp_bar_keys = table[bar_slot], table[borne_slot], table[opp_bar]
+
+    s = array('b', board.state)
+    outside = board.checkers_outside_home(player) #Se actualiza en cada paso del dfs
+    found = {}  #hash del estado final -> (largo, jugada, estado)
+    best = 0
+
+    def record(path, h):
+        nonlocal best
+        n = len(path)
+        if n > best:
+            best = n
+        prev = found.get(h)
+        if prev is None or prev[0] < n:
+            found[h] = (n, path, array('b', s))
+
+    def dfs(order, pos, path, h, seen, sources):
+        nonlocal outside, best
+        key = (h, pos)
+        if key in seen:
+            return
+        seen.add(key)
+
+        die = order[pos]
+        dests = dest_table[die]
+        #En el ultimo dado las hojas se registran aca mismo, sin otra llamada, y el
+        #buffer solo se toca (para copiarlo) si la posicion final es nueva
+        last = pos + 1 == len(order)
+        moved = False
+        if s[bar_slot] > 0:
+            moves = (None,)
+        else:
+            #Puntos propios (ascendentes): llegan del padre y solo se rearman si cambian
+            if sources is None:
+                if white:
+                    sources = [i for i in range(24) if s[i] < 0]
+                else:
+                    sources = [i for i in range(24) if s[i] > 0]
+            moves = sources
+
+        for src in moves:
+            if src is None:
+                dest = die - 1 if white else 24 - die
+                from_slot = bar_slot
+                from_keys = bar_keys
+                from_value = s[bar_slot]
+                from_after = from_value - 1
+            else:
+                dest = dests[src]
+                from_slot = src
+                from_keys = table[src]
+                from_value = s[src]
+                from_after = from_value - sign
+            child = h ^ from_keys[from_value + off] ^ from_keys[from_after + off]
+
+            if dest < 0:
+                if outside:
+                    continue
+                #Retirar ficha
+                moved = True
+                borne = s[borne_slot]
+                child ^= borne_keys[borne + off] ^ borne_keys[borne + 1 + off]
+                if last:
+                    prev = found.get(child)
+                    if prev is not None and prev[0] > pos:
+                        continue
+                s[from_slot] = from_after
+                s[borne_slot] = borne + 1
+                if last:
+                    found[child] = (pos + 1, path + ((src, die),), array('b', s))
+                    best = pos + 1
+                else:
+                    dfs(order, pos + 1, path + ((src, die),), child, seen,
+                        [x for x in sources if x != src] if from_after == 0 else sources)
+                s[borne_slot] = borne
+                s[from_slot] = from_value
+                continue
+
+            dest_value = s[dest]
+            at_dest = dest_value * sign
+            if at_dest <= -2 or at_dest >= MAX_STACK:
+                continue
+            moved = True
+
+            dest_keys = table[dest]
+            hit = at_dest == -1
+            if hit:   #Golpe: la ficha rival va a la barra
+                bar = s[opp_bar]
+                child ^= (dest_keys[dest_value + off] ^ dest_keys[sign + off]
+                          ^ opp_bar_keys[bar + off] ^ opp_bar_keys[bar + 1 + off])
+            else:
+                child ^= dest_keys[dest_value + off] ^ dest_keys[dest_value + sign + off]
+            if last:
+                prev = found.get(child)
+                if prev is not None and prev[0] > pos:
+                    continue
+
+            s[from_slot] = from_after
+            if hit:
+                s[opp_bar] = bar + 1
+                s[dest] = sign
+            else:
+                s[dest] = dest_value + sign
+            if last:
+                found[child] = (pos + 1, path + ((src, die),), array('b', s))
+                best = pos + 1
+            else:
+                delta_out = 0
+                if src is not None and not home[src]:
+                    delta_out -= 1
+                if not home[dest]:
+                    delta_out += 1
+                outside += delta_out
+                if src is None:
+                    next_sources = None
+                else:
+                    next_sources = [x for x in sources if x != src] if from_after == 0 else sources
+                    if at_dest <= 0:   #dest pasa a ser propio
+                        if next_sources is sources:
+                            next_sources = list(sources)
+                        insort(next_sources, dest)
+                dfs(order, pos + 1, path + ((src, die),), child, seen, next_sources)
+                outside -= delta_out
+            if hit:
+                s[opp_bar] = bar
+            s[dest] = dest_value
+            s[from_slot] = from_value
+
+        if not moved:
+            record(path, h)
+
+    h = board.zobrist_hash()
+    for order in _dice_orders(dice):
+        dfs(order, 0, (), h, set(), None)
+
+    plays = [(play, state) for n, play, state in found.values() if n == best]
+    a, b = dice
+    if best == 1 and a != b:
+        high = max(a, b)
+        with_high = [p for p in plays if p[0][0][1] == high]
+        if with_high:
+            plays = with_high
+    return plays
+
+
+def legal_plays(board: Board, player: Player, dice) -> list:
+    """Solo las jugadas (tuplas de (src, die)) de generate_plays."""
+    return [play for play, _ in generate_plays(board, player, dice)]
@@ -0,0 +1,180 @@
+"""
+Position ID y Match ID de GNU Backgammon.
+
+Position ID (14 caracteres base64, 80 bits): para cada jugador, primero el que NO esta en
+turno y despues el que tira, se recorren sus 24 puntos desde su punto 1 y al final su barra;
+por cada punto van tantos bits 1 como fichas y un 0. Los bits se empaquetan en 10 bytes
+empezando por el bit menos significativo. Las fichas retiradas no se guardan (15 - resto).
+
+Match ID (12 caracteres base64, 66 bits en 9 bytes), campos desde el bit menos significativo:
+cubo (log2, 4), dueno del cubo (2), jugador en turno (1), Crawford (1), estado del juego (3),
+turno (1), doble ofrecido (1), abandono (2), dado 1 (3), dado 2 (3), largo del match (15),
+puntaje del jugador 0 (15) y del jugador 1 (15). Jugador 0 = WHITE, jugador 1 = BLACK.
+Este motor no tiene cubo ni matches: se escribe cubo 1 centrado y partida por dinero.
+"""
+import base64
+from backgammon.core.board import Board, BAR_SLOT, BORNE_SLOT, STATE_SIZE
+from backgammon.core.game import Game
+from backgammon.core.player import Player
+
+POSITION_BYTES = 10
+MATCH_BYTES = 9
+MATCH_FIELDS = (  #(nombre, bits) en orden desde el bit 0
+    ("cube", 4), ("cube_owner", 2), ("on_roll", 1), ("crawford", 1), ("state", 3), ("turn", 1),
+    ("double_offered", 1), ("resigned", 2), ("die1", 3), ("die2", 3), ("match_length", 15),
+    ("score0", 15), ("score1", 15),
+)
+CENTERED = 3
+NO_GAME, PLAYING, OVER = 0, 1, 2
+PLAYERS = (Player.WHITE, Player.BLACK)  #Indice = numero de jugador en el Match ID
+
+
+def _opponent(player: Player) -> Player:
+    return Player.BLACK if player is Player.WHITE else Player.WHITE
+
+
+def _slot(player: Player, point: int) -> int:#Punto 0..23 visto desde player (0 = su punto 1) -> indice del tablero
+    return point if player is Player.WHITE else 23 - point
+
+
+def _encode(data: bytes) -> str:
+    return base64.b64encode(data).decode("ascii").rstrip("=")
+
+
+def _decode(text: str, size: int) -> bytes:
+    padded = text + "=" * (-len(text) % 4)
+    try:
+        data = base64.b64decode(padded, validate=True)
+    except ValueError:
+        raise ValueError(f"ID invalido: {text!r}") from None
+    if len(data) != size:
+        raise ValueError(f"ID invalido: {text!r}")
+    return data
+
+
+def position_id(board: Board, player: Player) -> str:
+    """Position ID de board con player en turno."""
+    key = 0
+    bit = 0
+    state = board.state
+    for side in (_opponent(player), player):
+        for point in range(25):
+            count = state[BAR_SLOT[side]] if point == 24 else max(0, state[_slot(side, point)] * side.value)
+            key |= ((1 << count) - 1) << bit
+            bit += count + 1
+    return _encode(key.to_bytes(POSITION_BYTES, "little"))
+
+
+def decode_position(text: str) -> tuple:
+    """(fichas del que no tira, fichas del que tira): 25 cantidades cada una, barra al final."""
+    key = int.from_bytes(_decode(text, POSITION_BYTES), "little")
+    sides = ([], [])
+    bit = 0
+    for counts in sides:
+        while len(counts) < 25:
+            if bit >= 8 * POSITION_BYTES:
+                raise ValueError(f"Position ID invalido: {text!r}")
+            count = 0
+            while key >> bit & 1:
+                count += 1
+                bit += 1
+            bit += 1
+            counts.append(count)
+        if sum(counts) > 15:
+            raise ValueError(f"Position ID invalido: mas de 15 fichas ({text!r})")
+    return sides
+
+
+def board_from_position_id(text: str, player: Player) -> Board:
+    """Arma el tablero directamente desde el Position ID (player es el que esta en turno)."""
+    state = [0] * STATE_SIZE
+    for side, counts in zip((_opponent(player), player), decode_position(text)):
+        for point, count in enumerate(counts[:24]):
+            if count:
+                slot = _slot(side, point)
+                if state[slot]:
+                    raise ValueError(f"Position ID invalido: punto {slot} ocupado por los dos ({text!r})")
+                state[slot] = count * side.value
+        state[BAR_SLOT[side]] = counts[24]
+        state[BORNE_SLOT[side]] = 15 - sum(counts)
+    return Board.from_state(state)
+
+
+class MatchState:
+    """Campos del Match ID (ver MATCH_FIELDS). dice es (0, 0) si todavia no se tiro."""
+
+    def __init__(self, **fields):
+        for name, _ in MATCH_FIELDS:
+            setattr(self, name, fields.get(name, 0))
+
+    @property
+    def dice(self) -> tuple:
+        return (self.die1, self.die2)
+
+    @property
+    def player_on_roll(self) -> Player:
+        return PLAYERS[self.on_roll]
+
+    def __eq__(self, other):
+        return isinstance(other, MatchState) and vars(self) == vars(other)
+
+    def __repr__(self):
+        return f"MatchState({', '.join(f'{k}={v}' for k, v in vars(self).items())})"
+
+
+def encode_match(match: MatchState) -> str:
+    key = 0
+    bit = 0
+    for name, bits in MATCH_FIELDS:
+        value = getattr(match, name)
+        if not 0 <= value < 1 << bits:
+            raise ValueError(f"{name} fuera de rango: {value}")
+        key |= value << bit
+        bit += bits
+    return _encode(key.to_bytes(MATCH_BYTES, "little"))
+
+
+def decode_match(text: str) -> MatchState:
+    key = int.from_bytes(_decode(text, MATCH_BYTES), "little")
+    fields = {}
+    for name, bits in MATCH_FIELDS:
+        fields[name] = key & ((1 << bits) - 1)
+        key >>= bits
+    return MatchState(**fields)
+
+
+def match_state(game: Game) -> MatchState:
+    """Estado de game para el Match ID (cubo centrado, partida por dinero)."""
+    player = game.current_player
+    if not game.started:
+        state = NO_GAME
+    else:
+        state = OVER if game.finished else PLAYING
+    on_roll = PLAYERS.index(player) if player is not None else 0
+    die1, die2 = game.dice.values
+    return MatchState(cube_owner=CENTERED, on_roll=on_roll, turn=on_roll, state=state, die1=die1, die2=die2)
+
+
+def match_id(game: Game) -> str:
+    return encode_match(match_state(game))
+
+
+def game_position_id(game: Game) -> str:
+    """Position ID de la partida con el jugador en turno (WHITE si falta el sorteo)."""
+    return position_id(game.board, game.current_player or Player.WHITE)
+
+
+def game_from_ids(position: str, match: str, game: Game | None = None) -> Game:
+    """
+    Carga en game (o en una Game nueva) la posicion y los dados de los IDs, sin reproducir
+    movimientos. Un Match ID sin partida en juego deja el sorteo pendiente.
+    """
+    state = decode_match(match)
+    player = state.player_on_roll
+    game = game if game is not None else Game()
+    board = board_from_position_id(position, player)
+    if state.state == NO_GAME:
+        game.load_position(board.state, None)
+    else:
+        game.load_position(board.state, player, state.dice)
+    return game
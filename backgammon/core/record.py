@@ -0,0 +1,367 @@
+"""
+Formato binario compacto de partidas (.bgr) con escritura y lectura por streaming.
+
+Un archivo empieza con MAGIC y sigue con partidas una detras de otra. Todos los numeros son
+varints (7 bits por byte, el bit alto indica que sigue otro byte). Cada partida es:
+
+    encabezado: largo + nombre de WHITE (utf-8), largo + nombre de BLACK,
+                semilla + 1 (0 = sin semilla), sorteo inicial (w - 1) * 6 + (b - 1) + 1 (0 = sin dato)
+    tokens:     ROLL + (d1 - 1) * 6 + (d2 - 1)        tirada del jugador en turno
+                MOVE + origen * 2 + k                  origen 0..23 o 24 = barra, k = dado usado (0 = d1, 1 = d2)
+                PASS                                   pasa el turno
+                END, ganador (0 ninguno, 1 WHITE, 2 BLACK), puntos
+
+Los tokens entran en un byte, asi que una jugada de dos movimientos ocupa 3 bytes
+(tirada + 2 movimientos) y el pase 1 mas.
+"""
+import io
+from backgammon.core.player import Player
+from backgammon.core.dice import Dice
+
+MAGIC = b"BGR\x01"
+END, PASS, ROLL, MOVE = 0, 1, 2, 38
+BAR_CODE = 24
+READ_SIZE = 1 << 20
+_WINNERS = (None, Player.WHITE, Player.BLACK)
+
+
+def write_varint(out: bytearray, value: int) -> None:
+    if value < 0:
+        raise ValueError("Los varints no pueden ser negativos")
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _dice_code(dice) -> int:
+    a, b = dice
+    if not (1 <= a <= 6 and 1 <= b <= 6):
+        raise ValueError(f"Dados invalidos: {dice}")
+    return (a - 1) * 6 + (b - 1)
+
+
+class GameRecord:
+    """
+    Una partida leida o por escribir. turns es una lista de (Player, dados, movimientos)
+    con movimientos [(origen, dado), ...] (origen None = barra).
+    """
+
+    def __init__(self, white: str = "WHITE", black: str = "BLACK", seed: int | None = None,
+                 draw: tuple | None = None, turns=None, winner: Player | None = None, points: int = 0):
+        self.white = white
+        self.black = black
+        self.seed = seed
+        self.draw = draw
+        self.turns = turns if turns is not None else []
+        self.winner = winner
+        self.points = points
+
+    @property
+    def starter(self) -> Player | None:
+        if self.draw is None:
+            return None
+        return Player.WHITE if self.draw[0] > self.draw[1] else Player.BLACK
+
+    @property
+    def move_count(self) -> int:
+        return sum(len(moves) for _, _, moves in self.turns)
+
+    def __eq__(self, other):
+        return isinstance(other, GameRecord) and vars(self) == vars(other)
+
+    def __repr__(self):
+        return (f"GameRecord({self.white!r} vs {self.black!r}, {len(self.turns)} turnos, "
+                f"ganador {self.winner.name if self.winner else None})")
+
+    def to_game(self):
+        """
+        Reproduce la partida sobre una Game (cada movimiento se valida con las reglas del core).
+        Hace falta el sorteo inicial.
+        """
+        from backgammon.core.game import Game
+        if self.draw is None:
+            raise ValueError("La partida no tiene el sorteo inicial")
+        game = Game(dice=Dice.scripted([self.draw] + [dice for _, dice, _ in self.turns]))
+        game.setup_players(self.white, self.black)
+        game.start()
+        game.roll()
+        for k, (player, _, moves) in enumerate(self.turns):
+            if player is not game.current_player:
+                raise ValueError(f"Turno {k + 1}: juega {game.current_player.name}, no {player.name}")
+            game.roll()
+            for src, die in moves:
+                game.move(src, die)
+            game.check_game_over()
+            if game.finished:
+                break
+            if k + 1 < len(self.turns):
+                game.pass_turn()
+        return game
+
+    def encode(self) -> bytes:
+        """Bytes de la partida completa (sin MAGIC)."""
+        out = bytearray()
+        _write_header(out, self.white, self.black, self.seed, self.draw)
+        for k, (player, dice, moves) in enumerate(self.turns):
+            if k:
+                out.append(PASS)
+            out.append(ROLL + _dice_code(dice))
+            for src, die in moves:
+                out.append(_move_code(dice, src, die))
+        out.append(END)
+        write_varint(out, _WINNERS.index(self.winner))
+        write_varint(out, self.points)
+        return bytes(out)
+
+
+def _write_header(out: bytearray, white: str, black: str, seed, draw) -> None:
+    for name in (white, black):
+        data = name.encode("utf-8")
+        write_varint(out, len(data))
+        out += data
+    write_varint(out, 0 if seed is None else seed + 1)
+    write_varint(out, 0 if draw is None else _dice_code(draw) + 1)
+
+
+def _move_code(dice, src, die) -> int:
+    if die == dice[0]:
+        which = 0
+    elif die == dice[1]:
+        which = 1
+    else:
+        raise ValueError(f"El dado {die} no esta en la tirada {dice}")
+    if src is not None and not 0 <= src <= 23:
+        raise ValueError(f"Origen invalido: {src}")
+    return MOVE + (BAR_CODE if src is None else src) * 2 + which
+
+
+class RecordWriter:
+    """
+    Escribe partidas en un archivo .bgr (ruta o archivo binario abierto). Se puede usar
+    con write_game o token a token mientras se juega (begin, roll, move, pass_turn, end;
+    Game lo hace sola con Game.record_to). La partida en curso se arma en memoria para que
+    undo_move/undo_pass puedan sacar tokens; la terminada se escribe recien al empezar la
+    siguiente (o con flush/close), asi reopen la puede reabrir si se deshace la jugada ganadora.
+    """
+
+    def __init__(self, target, append: bool = False):
+        if isinstance(target, (str, bytes)) or hasattr(target, "__fspath__"):
+            self.__file__ = open(target, "ab" if append else "wb")
+            self.__owned__ = True
+        else:
+            self.__file__ = target
+            self.__owned__ = False
+        if self.__file__.tell() == 0:
+            self.__file__.write(MAGIC)
+        self.__buffer__ = None   #Partida en curso (o terminada sin escribir)
+        self.__tokens__ = []     #(inicio en el buffer, token) de cada token de la partida
+        self.__end__ = None      #Inicio del cierre (END, ganador, puntos) si la partida termino
+        self.__dice__ = None
+        self.games = 0
+
+    @property
+    def in_game(self) -> bool:
+        return self.__buffer__ is not None and self.__end__ is None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def flush(self) -> None:
+        """Escribe la partida terminada que quedaba pendiente (ya no se puede reabrir)."""
+        if self.__end__ is not None:
+            self.__file__.write(self.__buffer__)
+            self.__buffer__ = None
+            self.__tokens__ = []
+            self.__end__ = None
+        self.__file__.flush()
+
+    def close(self) -> None:
+        if self.in_game:
+            self.end(None, 0)
+        self.flush()
+        if self.__owned__:
+            self.__file__.close()
+
+    def write_game(self, record: GameRecord) -> None:
+        if self.in_game:
+            raise ValueError("Hay una partida en curso")
+        self.flush()
+        self.__file__.write(record.encode())
+        self.games += 1
+
+    def begin(self, white: str, black: str, seed: int | None = None, draw: tuple | None = None) -> None:
+        """Empieza una partida (si habia otra sin terminar se guarda sin ganador)."""
+        if self.in_game:
+            self.end(None, 0)
+        self.flush()
+        self.__buffer__ = bytearray()
+        _write_header(self.__buffer__, white, black, seed, draw)
+        self.__tokens__ = []
+        self.__dice__ = None
+
+    def __token__(self, value: int) -> None:
+        if not self.in_game:
+            raise ValueError("No hay una partida en curso (falta begin)")
+        self.__tokens__.append((len(self.__buffer__), value))
+        self.__buffer__.append(value)
+
+    def __pop__(self) -> None:#Saca el ultimo token
+        offset, _ = self.__tokens__.pop()
+        del self.__buffer__[offset:]
+
+    def roll(self, dice) -> None:
+        self.__token__(ROLL + _dice_code(dice))
+        self.__dice__ = tuple(dice)
+
+    def move(self, src: int | None, die: int) -> None:
+        if self.__dice__ is None:
+            raise ValueError("Movimiento sin tirada")
+        self.__token__(_move_code(self.__dice__, src, die))
+
+    def pass_turn(self) -> None:
+        self.__token__(PASS)
+
+    def undo_move(self) -> bool:
+        """Saca el ultimo movimiento de la partida en curso (False si el ultimo token no es un movimiento)."""
+        if not self.in_game or not self.__tokens__ or self.__tokens__[-1][1] < MOVE:
+            return False
+        self.__pop__()
+        return True
+
+    def undo_pass(self) -> bool:
+        """
+        Deshace el ultimo pase: saca la tirada que el rival pudo haber hecho despues y el PASS,
+        y vuelven los dados del turno anterior. False si no hay un pase al final.
+        """
+        if not self.in_game:
+            return False
+        k = len(self.__tokens__)
+        while k and ROLL <= self.__tokens__[k - 1][1] < MOVE:
+            k -= 1
+        if not k or self.__tokens__[k - 1][1] != PASS:
+            return False
+        del self.__buffer__[self.__tokens__[k - 1][0]:]
+        del self.__tokens__[k - 1:]
+        self.__dice__ = None
+        for _, token in reversed(self.__tokens__):
+            if ROLL <= token < MOVE:
+                a, b = divmod(token - ROLL, 6)
+                self.__dice__ = (a + 1, b + 1)
+                break
+        return True
+
+    def end(self, winner: Player | None, points: int) -> None:
+        if not self.in_game:
+            return
+        self.__end__ = len(self.__buffer__)
+        out = self.__buffer__
+        out.append(END)
+        write_varint(out, _WINNERS.index(winner))
+        write_varint(out, points)
+        self.games += 1
+
+    def reopen(self) -> bool:
+        """Vuelve a abrir la partida recien terminada (todavia sin escribir). False si no hay ninguna."""
+        if self.__end__ is None:
+            return False
+        del self.__buffer__[self.__end__:]
+        self.__end__ = None
+        self.games -= 1
+        return True
+
+
+class _Stream:#Lectura por bloques de un archivo binario
+    def __init__(self, f, read_size: int):
+        self.__file__ = f
+        self.__read_size__ = read_size
+        self.__data__ = b""
+        self.__pos__ = 0
+
+    def at_end(self) -> bool:
+        if self.__pos__ < len(self.__data__):
+            return False
+        self.__data__ = self.__file__.read(self.__read_size__)
+        self.__pos__ = 0
+        return not self.__data__
+
+    def byte(self) -> int:
+        if self.at_end():
+            raise ValueError("Archivo de partidas truncado")
+        value = self.__data__[self.__pos__]
+        self.__pos__ += 1
+        return value
+
+    def varint(self) -> int:
+        value = 0
+        shift = 0
+        while True:
+            b = self.byte()
+            value |= (b & 0x7F) << shift
+            if b < 0x80:
+                return value
+            shift += 7
+
+    def take(self, n: int) -> bytes:
+        parts = []
+        while n:
+            if self.at_end():
+                raise ValueError("Archivo de partidas truncado")
+            chunk = self.__data__[self.__pos__:self.__pos__ + n]
+            self.__pos__ += len(chunk)
+            n -= len(chunk)
+            parts.append(chunk)
+        return b"".join(parts)
+
+
+def read_games(source, read_size: int = READ_SIZE):
+    """
+    Genera las partidas (GameRecord) de un archivo .bgr de a una, leyendo por bloques:
+    la memoria usada no depende del tamano del archivo. source es una ruta o un archivo binario.
+    """
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    if isinstance(source, str) or hasattr(source, "__fspath__"):
+        with open(source, "rb") as f:
+            yield from read_games(f, read_size)
+        return
+    stream = _Stream(source, read_size)
+    if stream.take(len(MAGIC)) != MAGIC:
+        raise ValueError("No es un archivo de partidas .bgr")
+    while not stream.at_end():
+        yield _read_game(stream)
+
+
+def _read_game(stream: _Stream) -> GameRecord:
+    white = stream.take(stream.varint()).decode("utf-8")
+    black = stream.take(stream.varint()).decode("utf-8")
+    seed = stream.varint() - 1
+    draw = stream.varint() - 1
+    record = GameRecord(white, black, None if seed < 0 else seed, None if draw < 0 else divmod(draw, 6))
+    if record.draw is not None:
+        record.draw = (record.draw[0] + 1, record.draw[1] + 1)
+    player = record.starter or Player.WHITE
+    moves = None
+    while True:
+        token = stream.varint()
+        if token == END:
+            record.winner = _WINNERS[stream.varint()]
+            record.points = stream.varint()
+            return record
+        if token == PASS:
+            player = Player.BLACK if player is Player.WHITE else Player.WHITE
+        elif token < MOVE:
+            dice = divmod(token - ROLL, 6)
+            dice = (dice[0] + 1, dice[1] + 1)
+            moves = []
+            record.turns.append((player, dice, moves))
+        else:
+            if moves is None:
+                raise ValueError("Movimiento sin tirada")
+            src, which = divmod(token - MOVE, 2)
+            if src > BAR_CODE:
+                raise ValueError(f"Token invalido: {token}")
+            moves.append((None if src == BAR_CODE else src, record.turns[-1][1][which]))
@@ -0,0 +1,124 @@
+"""
+Reproductor de partidas grabadas (GameRecord, ver backgammon.core.record) con busqueda rapida.
+
+Al cargar se juega la partida una sola vez (validando cada movimiento con Board.move) y se
+guardan el delta de cada movimiento y una foto del tablero (28 bytes) cada keyframe_every
+movimientos. Ir a la posicion n es cargar la foto mas cercana y aplicar o deshacer a lo sumo
+keyframe_every / 2 deltas, o moverse desde la posicion actual si esta mas cerca.
+Las posiciones se numeran por movimientos de ficha: 0 = inicio, len(replay) = final.
+"""
+from array import array
+from backgammon.core.board import Board
+from backgammon.core.record import GameRecord
+
+KEYFRAME_EVERY = 16
+
+
+class Replay:
+    """
+    Cursor sobre una partida grabada. board es el tablero de la posicion actual (se modifica
+    en el lugar al moverse; usar board.copy() para guardarlo).
+    """
+
+    def __init__(self, record: GameRecord, keyframe_every: int = KEYFRAME_EVERY):
+        if keyframe_every < 1:
+            raise ValueError("keyframe_every debe ser positivo")
+        self.__record__ = record
+        self.__every__ = keyframe_every
+        self.__deltas__ = []       #Delta del journal de Board de cada movimiento
+        self.__move_turn__ = []    #Indice del turno de cada movimiento
+        self.__turn_start__ = []   #Primer movimiento de cada turno
+        board = Board()
+        board.__reset__()
+        self.__keyframes__ = [array('b', board.state)]
+        for turn, (player, _, moves) in enumerate(record.turns):
+            self.__turn_start__.append(len(self.__deltas__))
+            for src, die in moves:
+                board.move(player, src, die)
+                self.__deltas__.append(board.last_move)
+                self.__move_turn__.append(turn)
+                if len(self.__deltas__) % keyframe_every == 0:
+                    self.__keyframes__.append(array('b', board.state))
+        self.__board__ = Board.from_state(self.__keyframes__[0])
+        self.__position__ = 0
+
+    @property
+    def record(self) -> GameRecord:
+        return self.__record__
+
+    @property
+    def board(self) -> Board:
+        return self.__board__
+
+    @property
+    def position(self) -> int:
+        return self.__position__
+
+    def __len__(self) -> int:
+        return len(self.__deltas__)
+
+    def move_at(self, n: int) -> tuple:
+        """(jugador, dados, src, die) del movimiento que lleva de la posicion n a la n + 1."""
+        player, dice, _ = self.__record__.turns[self.__move_turn__[n]]
+        delta = self.__deltas__[n]
+        return player, dice, None if delta[1] >= 24 else delta[1], delta[3]
+
+    def turn_at(self, n: int) -> int:
+        """Indice del turno en juego en la posicion n (el del proximo movimiento; el ultimo al final)."""
+        if not self.__move_turn__:
+            return 0
+        return self.__move_turn__[min(n, len(self.__move_turn__) - 1)]
+
+    def turn_start(self, turn: int) -> int:
+        """Posicion antes del primer movimiento del turno (turnos sin movimientos incluidos)."""
+        return self.__turn_start__[turn]
+
+    def seek(self, n: int) -> Board:
+        """Va a la posicion n (0..len) y devuelve el tablero."""
+        if not 0 <= n <= len(self.__deltas__):
+            raise IndexError(f"Posicion fuera de rango: {n} (0..{len(self.__deltas__)})")
+        every = self.__every__
+        below = n // every
+        above = below + 1 if n % every and below + 1 < len(self.__keyframes__) else below
+        #Desde la posicion actual (-1) o desde la foto mas cercana (cargarla cuesta como un delta)
+        start = min((abs(n - self.__position__), -1),
+                    (n - below * every + 1, below),
+                    (above * every - n + 1, above))[1]
+        if start >= 0:
+            self.__board__.state[:] = self.__keyframes__[start]
+            self.__board__.__refresh__()
+            self.__position__ = start * every
+        self.__step__(n)
+        return self.__board__
+
+    def __step__(self, n: int) -> None:#Aplica o deshace deltas hasta llegar a n
+        board = self.__board__
+        deltas = self.__deltas__
+        position = self.__position__
+        while position < n:
+            board.__do_delta__(deltas[position])
+            position += 1
+        while position > n:
+            position -= 1
+            board.__undo_delta__(deltas[position])
+        self.__position__ = position
+
+    def forward(self, steps: int = 1) -> Board:
+        return self.seek(self.__position__ + steps)
+
+    def backward(self, steps: int = 1) -> Board:
+        return self.seek(self.__position__ - steps)
+
+    def seek_turn(self, turn: int) -> Board:
+        return self.seek(self.turn_start(turn))
+
+    def positions(self, start: int = 0, stop: int | None = None):
+        """Genera (n, copia del tablero) para cada posicion de start a stop (incluida; None = final)."""
+        stop = len(self.__deltas__) if stop is None else stop
+        if stop > len(self.__deltas__):
+            raise IndexError(f"Posicion fuera de rango: {stop} (0..{len(self.__deltas__)})")
+        self.seek(start)
+        yield start, self.__board__.copy()
+        for n in range(start + 1, stop + 1):
+            self.__step__(n)
+            yield n, self.__board__.copy()
@@ -0,0 +1,24 @@
+import random
+
+#Tabla de Zobrist: un numero aleatorio de 64 bits por (slot del buffer, valor con signo).
+#Semilla fija para que el hash de una posicion sea el mismo en todos los procesos.
+ZOBRIST_SEED = 0x5EED_BAC6
+MAX_COUNT = 15
+OFFSET = MAX_COUNT #valor -15..15 -> columna 0..30
+
+_rng = random.Random(ZOBRIST_SEED)
+TABLE = tuple(
+    tuple(_rng.getrandbits(64) for _ in range(2 * MAX_COUNT + 1))
+    for _ in range(28)
+)
+#Un valor por lado que mueve (se indexa con Player.value: -1 WHITE, +1 BLACK)
+SIDE = {-1: _rng.getrandbits(64), 1: _rng.getrandbits(64)}
+del _rng
+
+
+def compute_hash(state) -> int:
+    """Hash completo de un buffer de tablero (O(28)); Board lo mantiene incrementalmente."""
+    h = 0
+    for slot, value in enumerate(state):
+        h ^= TABLE[slot][value + OFFSET]
+    return h
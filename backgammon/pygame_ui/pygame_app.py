@@ -294,15 +294,15 @@ class PygameUI:
         pygame.draw.rect(self.__screen__, WOOD, self.__bar_rect__, border_radius=8)
         pygame.draw.rect(self.__screen__, WOOD, self.__borne_rect__, border_radius=8)
 
-        bar_w = len(self.__game__.board.__bar__[Player.WHITE])
-        bar_b = len(self.__game__.board.__bar__[Player.BLACK])
+        bar_w = self.__game__.board.bar_count(Player.WHITE)
+        bar_b = self.__game__.board.bar_count(Player.BLACK)
         self.__screen__.blit(self.__font_small__.render("BAR", True, GOLD),
                              self.__font_small__.render("BAR", True, GOLD).get_rect(centerx=self.__bar_rect__.centerx, top=self.__bar_rect__.y + 5))
         self.__screen__.blit(self.__font_small__.render(f"Blancas: {bar_w}  Negras: {bar_b}", True, IVORY),
                              self.__font_small__.render(f"Blancas: {bar_w}  Negras: {bar_b}", True, IVORY).get_rect(centerx=self.__bar_rect__.centerx, top=self.__bar_rect__.y + 25))
 
-        borne_w = len(self.__game__.board.__borne__[Player.WHITE])
-        borne_b = len(self.__game__.board.__borne__[Player.BLACK])
+        borne_w = self.__game__.board.borne_count(Player.WHITE)
+        borne_b = self.__game__.board.borne_count(Player.BLACK)
         self.__screen__.blit(self.__font_small__.render("BORNE", True, GOLD),
                              self.__font_small__.render("BORNE", True, GOLD).get_rect(centerx=self.__borne_rect__.centerx, top=self.__borne_rect__.y + 5))
         self.__screen__.blit(self.__font_small__.render(f"Blancas: {borne_w}  Negras: {borne_b}", True, IVORY),
@@ -418,7 +418,10 @@ class PygameUI:
 
         try:
             # El core maneja dirección (WHITE decrementa, BLACK incrementa) y borne
-            self.__game__.board.move(self.__game__.current_player, src, dist)
+            if dist in (a, b):
+                self.__game__.move(src, dist)
+            else:
+                self._move_both_dice(src, a, b)
         except (PointBlocked, NoCheckerAtPoint, MustEnterFromBar, EntryBlocked, BearOffNotAllowed,
                 GameNotStrated, GameFinished) as exc:
             # No tocamos dados ni selección: nada “desaparece”
@@ -444,6 +447,26 @@ class PygameUI:
             self._show_win_and_exit()
         return True
 
+    def _move_both_dice(self, src, a: int, b: int) -> None:
+        """Mueve la misma ficha a + b como dos movimientos (prueba a-b y b-a; si falla no cambia nada)."""
+        error = None
+        for first, second in ((a, b), (b, a)):
+            try:
+                self.__game__.move(src, first)
+            except Exception as exc:
+                error = exc
+                continue
+            to_slot = self.__game__.board.last_move[2]
+            try:
+                if to_slot >= 24:
+                    raise BearOffNotAllowed()
+                self.__game__.move(to_slot, second)
+                return
+            except Exception as exc:
+                error = exc
+                self.__game__.undo()
+        raise error
+
     def _friendly_error(self, exc: Exception) -> str:
         mapping = {
             GameNotStrated: "La partida no está iniciada (S para start)",
@@ -509,7 +532,7 @@ class PygameUI:
 
         # BAR
         if self.__bar_rect__.collidepoint(pos):
-            if len(self.__game__.board.__bar__[self.__game__.current_player]) > 0:
+            if self.__game__.board.bar_count(self.__game__.current_player) > 0:
                 self.__selected_src__ = -1
                 self.__toast__.push("Origen: BAR (ahora 1/2/3)", GOLD)
             else:
@@ -528,7 +551,7 @@ class PygameUI:
             return
 
         # Si hay fichas en BAR propias, hay que entrar primero
-        if len(self.__game__.board.__bar__[self.__game__.current_player]) > 0:
+        if self.__game__.board.bar_count(self.__game__.current_player) > 0:
             self.__toast__.push("Debés mover desde la BAR primero", RED)
             self.__selected_src__ = None
             return
@@ -0,0 +1,11 @@
+"""Self-play headless (sin UI) para regresion de bots y datos de entrenamiento."""
+from .selfplay import (
+    SelfPlay, SelfPlayStats, GameResult, RandomPolicy, FirstPlayPolicy, GreedyPolicy, EvaluatorPolicy, POLICIES,
+    game_seed
+)
+from .farm import SelfPlayFarm
+
+__all__ = [
+    "SelfPlay", "SelfPlayStats", "GameResult", "RandomPolicy", "FirstPlayPolicy", "GreedyPolicy", "EvaluatorPolicy",
+    "POLICIES", "game_seed", "SelfPlayFarm"
+]
@@ -0,0 +1,26 @@
+import argparse
+from .selfplay import SelfPlay, POLICIES
+from .farm import SelfPlayFarm
+
+
+def run() -> None:
+    parser = argparse.ArgumentParser(prog="python -m backgammon.selfplay", description="Self-play headless")
+    parser.add_argument("--games", type=int, default=100, help="Cantidad de partidas")
+    parser.add_argument("--white", choices=sorted(POLICIES), default="random", help="Politica de WHITE")
+    parser.add_argument("--black", choices=sorted(POLICIES), default="random", help="Politica de BLACK")
+    parser.add_argument("--max-turns", type=int, default=2000, help="Corta partidas mas largas")
+    parser.add_argument("--seed", type=int, default=None, help="Semilla maestra (resultados reproducibles)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Procesos en paralelo (0 = todos los nucleos); sin esta opcion corre en un solo proceso")
+    args = parser.parse_args()
+
+    if args.workers is None:
+        engine = SelfPlay(POLICIES[args.white](), POLICIES[args.black](), max_turns=args.max_turns)
+        print(engine.run(args.games, seed=args.seed))
+        return
+    farm = SelfPlayFarm(args.white, args.black, workers=args.workers or None, max_turns=args.max_turns)
+    print(farm.run(args.games, seed=args.seed if args.seed is not None else 0))
+
+
+if __name__ == "__main__":
+    run()
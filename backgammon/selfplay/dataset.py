@@ -0,0 +1,282 @@
+"""
+Datos de entrenamiento en disco: shards .npy de tamano fijo mapeados en memoria (requiere numpy).
+
+Un dataset es un directorio con pares de archivos por shard y un manifest.json:
+
+    shard-00000-inputs.npy    (filas, INPUTS)  float32, ver backgammon.ai.encoding
+    shard-00000-targets.npy   (filas, targets) float32
+    manifest.json             version, columnas, filas de cada shard
+
+ShardWriter escribe directo sobre archivos abiertos con numpy.lib.format.open_memmap
+(la memoria usada no depende de cuantas muestras haya); el manifest se reescribe cada vez
+que se completa un shard, asi lo escrito sobrevive si el proceso se corta.
+ShardReader recorre los shards como vistas del mmap, en orden o mezclando con un buffer.
+record_selfplay juega partidas con LockstepSimulator y guarda cada posicion con el resultado.
+"""
+import json
+import os
+import numpy as np
+from numpy.lib.format import open_memmap
+from backgammon.core.player import Player
+from backgammon.ai.batch import as_batch
+from backgammon.ai.encoding import INPUTS, encode_batch
+
+MANIFEST = "manifest.json"
+VERSION = 1
+SHARD_SIZE = 1 << 18  #262144 filas: ~200 MB de inputs por shard
+COPY_ROWS = 1 << 14
+
+
+def shard_paths(index: int) -> tuple:
+    return f"shard-{index:05d}-inputs.npy", f"shard-{index:05d}-targets.npy"
+
+
+class ShardWriter:
+    """
+    Escribe muestras en directory (que no debe tener ya un dataset). Usar como context
+    manager o llamar a close(), que recorta el ultimo shard y deja el manifest final.
+    """
+
+    def __init__(self, directory: str, targets: int = 1, inputs: int = INPUTS, shard_size: int = SHARD_SIZE):
+        if shard_size < 1 or targets < 1 or inputs < 1:
+            raise ValueError("shard_size, targets e inputs deben ser positivos")
+        os.makedirs(directory, exist_ok=True)
+        if os.path.exists(os.path.join(directory, MANIFEST)):
+            raise FileExistsError(f"{directory} ya tiene un dataset")
+        self.__directory__ = directory
+        self.__columns__ = (inputs, targets)
+        self.__shard_size__ = shard_size
+        self.__shards__ = []     #Filas de cada shard completo
+        self.__inputs__ = None   #Shard abierto
+        self.__targets__ = None
+        self.__fill__ = 0
+        self.__closed__ = False
+
+    @property
+    def rows(self) -> int:
+        return sum(self.__shards__) + self.__fill__
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __open_shard__(self) -> None:
+        inputs_name, targets_name = shard_paths(len(self.__shards__))
+        shape = (self.__shard_size__,)
+        self.__inputs__ = open_memmap(os.path.join(self.__directory__, inputs_name), mode="w+",
+                                      dtype=np.float32, shape=shape + (self.__columns__[0],))
+        self.__targets__ = open_memmap(os.path.join(self.__directory__, targets_name), mode="w+",
+                                       dtype=np.float32, shape=shape + (self.__columns__[1],))
+        self.__fill__ = 0
+
+    def __finish_shard__(self) -> None:
+        self.__inputs__.flush()
+        self.__targets__.flush()
+        self.__inputs__ = self.__targets__ = None
+        self.__shards__.append(self.__fill__)
+        self.__fill__ = 0
+        self.__write_manifest__()
+
+    def __write_manifest__(self) -> None:
+        manifest = {
+            "version": VERSION,
+            "inputs": self.__columns__[0],
+            "targets": self.__columns__[1],
+            "shards": [
+                {"inputs": names[0], "targets": names[1], "rows": rows}
+                for names, rows in ((shard_paths(k), rows) for k, rows in enumerate(self.__shards__))
+            ],
+            "rows": sum(self.__shards__),
+        }
+        path = os.path.join(self.__directory__, MANIFEST)
+        with open(path + ".tmp", "w") as f:
+            json.dump(manifest, f, indent=1)
+        os.replace(path + ".tmp", path)
+
+    def __slices__(self, n: int):
+        """Reparte n filas nuevas en tramos (desde, hasta, destino inputs, destino targets)."""
+        if self.__closed__:
+            raise ValueError("El writer ya esta cerrado")
+        done = 0
+        while done < n:
+            if self.__inputs__ is None:
+                self.__open_shard__()
+            take = min(n - done, self.__shard_size__ - self.__fill__)
+            rows = slice(self.__fill__, self.__fill__ + take)
+            yield done, done + take, self.__inputs__[rows], self.__targets__[rows]
+            self.__fill__ += take
+            done += take
+            if self.__fill__ == self.__shard_size__:
+                self.__finish_shard__()
+
+    def __check_targets__(self, targets, n: int) -> np.ndarray:
+        targets = np.asarray(targets, dtype=np.float32)
+        if targets.ndim == 1:
+            targets = targets[:, None]
+        if targets.shape != (n, self.__columns__[1]):
+            raise ValueError(f"targets debe tener forma ({n}, {self.__columns__[1]})")
+        return targets
+
+    def write(self, inputs, targets) -> None:
+        """Agrega filas ya codificadas: inputs (n, inputs) y targets (n, targets) o (n,)."""
+        inputs = np.asarray(inputs, dtype=np.float32)
+        if inputs.ndim != 2 or inputs.shape[1] != self.__columns__[0]:
+            raise ValueError(f"inputs debe tener forma (n, {self.__columns__[0]})")
+        targets = self.__check_targets__(targets, len(inputs))
+        for start, stop, inputs_out, targets_out in self.__slices__(len(inputs)):
+            inputs_out[:] = inputs[start:stop]
+            targets_out[:] = targets[start:stop]
+
+    def write_positions(self, positions, player, targets) -> None:
+        """Codifica posiciones (lote (n, 28), desde player) directo sobre el shard."""
+        if self.__columns__[0] != INPUTS:
+            raise ValueError("write_positions usa encode_batch: el dataset debe tener INPUTS columnas")
+        batch = as_batch(positions)
+        targets = self.__check_targets__(targets, len(batch))
+        if not isinstance(player, Player):
+            player = np.asarray(player)
+        for start, stop, inputs_out, targets_out in self.__slices__(len(batch)):
+            rows = player if isinstance(player, Player) else player[start:stop]
+            encode_batch(batch[start:stop], rows, inputs_out)
+            targets_out[:] = targets[start:stop]
+
+    def close(self) -> None:
+        if self.__closed__:
+            return
+        if self.__inputs__ is not None:
+            rows = self.__fill__
+            for name, data in zip(shard_paths(len(self.__shards__)), (self.__inputs__, self.__targets__)):
+                path = os.path.join(self.__directory__, name)
+                trimmed = open_memmap(path + ".tmp", mode="w+", dtype=np.float32, shape=(rows, data.shape[1]))
+                for start in range(0, rows, COPY_ROWS):  #Recorta el ultimo shard sin cargarlo entero
+                    trimmed[start:start + COPY_ROWS] = data[start:min(rows, start + COPY_ROWS)]
+                trimmed.flush()
+                del trimmed
+                os.replace(path + ".tmp", path)
+            self.__inputs__ = self.__targets__ = None
+            self.__shards__.append(rows)
+        self.__write_manifest__()
+        self.__closed__ = True
+
+
+class ShardReader:
+    """Lee un dataset escrito por ShardWriter. Los shards se abren con mmap de solo lectura."""
+
+    def __init__(self, directory: str):
+        with open(os.path.join(directory, MANIFEST)) as f:
+            manifest = json.load(f)
+        if manifest.get("version") != VERSION:
+            raise ValueError(f"{directory} no es un dataset valido")
+        self.__directory__ = directory
+        self.manifest = manifest
+
+    @property
+    def inputs(self) -> int:
+        return self.manifest["inputs"]
+
+    @property
+    def targets(self) -> int:
+        return self.manifest["targets"]
+
+    def __len__(self) -> int:
+        return self.manifest["rows"]
+
+    def shard(self, index: int) -> tuple:
+        """(inputs, targets) del shard index como vistas del mmap (sin copiar)."""
+        entry = self.manifest["shards"][index]
+        rows = entry["rows"]
+        inputs = np.load(os.path.join(self.__directory__, entry["inputs"]), mmap_mode="r")
+        targets = np.load(os.path.join(self.__directory__, entry["targets"]), mmap_mode="r")
+        return inputs[:rows], targets[:rows]
+
+    def shards(self):
+        for index in range(len(self.manifest["shards"])):
+            yield self.shard(index)
+
+    def batches(self, batch_size: int, shuffle_buffer: int = 0, seed=None):
+        """
+        Genera lotes (inputs, targets). Sin shuffle_buffer son vistas del mmap en orden y no
+        cruzan shards (el ultimo de cada shard puede ser mas chico). Con shuffle_buffer los
+        shards se leen en bloques en orden al azar hacia un buffer de ese tamano (minimo
+        batch_size) que se mezcla antes de armar los lotes; solo esos lotes son copias.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size debe ser positivo")
+        if not shuffle_buffer:
+            for inputs, targets in self.shards():
+                for start in range(0, len(inputs), batch_size):
+                    yield inputs[start:start + batch_size], targets[start:start + batch_size]
+            return
+
+        rng = np.random.default_rng(seed)
+        size = max(shuffle_buffer, batch_size)
+        block = max(1, size // 16)
+        views = list(self.shards())
+        blocks = [(k, start) for k, (inputs, _) in enumerate(views) for start in range(0, len(inputs), block)]
+        rng.shuffle(blocks)
+        buffer_x = np.empty((size, self.inputs), dtype=np.float32)
+        buffer_y = np.empty((size, self.targets), dtype=np.float32)
+        fill = 0
+
+        def emit(final: bool):
+            nonlocal fill
+            order = rng.permutation(fill)
+            full = fill if final else fill // batch_size * batch_size
+            for start in range(0, full, batch_size):
+                rows = order[start:start + batch_size]
+                yield buffer_x[rows], buffer_y[rows]
+            rest = order[full:]
+            buffer_x[:len(rest)] = buffer_x[rest]
+            buffer_y[:len(rest)] = buffer_y[rest]
+            fill = len(rest)
+
+        for k, start in blocks:
+            inputs, targets = views[k]
+            stop = min(start + block, len(inputs))
+            while start < stop:
+                take = min(stop - start, size - fill)
+                buffer_x[fill:fill + take] = inputs[start:start + take]
+                buffer_y[fill:fill + take] = targets[start:start + take]
+                fill += take
+                start += take
+                if fill == size:
+                    yield from emit(final=False)
+        yield from emit(final=True)
+
+
+class _PositionLog:#before_turn de LockstepSimulator: guarda la posicion antes de cada tirada
+    def __init__(self):
+        self.states, self.games, self.signs = [], [], []
+
+    def __call__(self, turn, batch, rows, signs, dice) -> None:
+        self.states.append(batch[rows].copy())
+        self.games.append(rows.copy())
+        self.signs.append(signs.copy())
+
+
+def record_selfplay(writer: ShardWriter, simulator, games: int, seed=None, chunk: int = 1000) -> int:
+    """
+    Juega games partidas con simulator (LockstepSimulator) de a chunk por vez y escribe cada
+    posicion antes de tirar, codificada desde el que tira, con target = puntos ganados (+)
+    o perdidos (-) por ese jugador. Las partidas cortadas por max_turns se descartan.
+    En memoria solo quedan los tableros (28 bytes por posicion) del chunk en curso.
+    Devuelve la cantidad de filas escritas.
+    """
+    rng = np.random.default_rng(seed)
+    written = 0
+    for start in range(0, games, chunk):
+        log = _PositionLog()
+        result = simulator.run(min(chunk, games - start), seed=rng.integers(1 << 63), before_turn=log)
+        if not log.states:
+            continue
+        states = np.concatenate(log.states)
+        game = np.concatenate(log.games)
+        signs = np.concatenate(log.signs)
+        winners = result.winners[game]
+        keep = winners != 0
+        outcome = np.where(winners == signs, 1, -1) * result.points[game].astype(np.float32)
+        writer.write_positions(states[keep], signs[keep], outcome[keep])
+        written += int(keep.sum())
+    return written
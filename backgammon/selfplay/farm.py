@@ -0,0 +1,70 @@
+"""
+Granja de self-play multiproceso: reparte N partidas en bloques entre un pool de procesos
+y va combinando las estadisticas a medida que llegan.
+
+La partida numero i siempre usa game_seed(seed, i), por eso el resultado para una
+semilla maestra es el mismo con 1 o con 64 workers.
+"""
+import os
+import time
+from multiprocessing import get_context
+from backgammon.selfplay.selfplay import SelfPlay, SelfPlayStats, POLICIES
+
+
+def _run_chunk(task) -> SelfPlayStats:#Corre en el proceso worker (tiene que ser picklable)
+    white, black, max_turns, seed, start, count = task
+    engine = SelfPlay(POLICIES[white](), POLICIES[black](), max_turns=max_turns)
+    return engine.run(count, seed=seed, start=start)
+
+
+class SelfPlayFarm:
+    """
+    Pool de procesos para self-play. Las politicas se indican por nombre (ver POLICIES)
+    porque cada worker arma las suyas.
+    """
+
+    def __init__(self, white: str = "random", black: str = "random", workers: int | None = None,
+                 chunk_size: int = 50, max_turns: int = 2000):
+        if white not in POLICIES or black not in POLICIES:
+            raise ValueError(f"Politica desconocida, opciones: {sorted(POLICIES)}")
+        if chunk_size < 1:
+            raise ValueError("chunk_size debe ser positivo")
+        self.__white__ = white
+        self.__black__ = black
+        self.__workers__ = workers or os.cpu_count() or 1
+        self.__chunk_size__ = chunk_size
+        self.__max_turns__ = max_turns
+
+    @property
+    def workers(self) -> int:
+        return self.__workers__
+
+    def tasks(self, games: int, seed: int) -> list:#Bloques (white, black, max_turns, seed, inicio, cantidad)
+        return [
+            (self.__white__, self.__black__, self.__max_turns__, seed, start,
+             min(self.__chunk_size__, games - start))
+            for start in range(0, games, self.__chunk_size__)
+        ]
+
+    def run(self, games: int, seed: int = 0, on_progress=None) -> SelfPlayStats:
+        """
+        Juega games partidas y devuelve las estadisticas combinadas.
+        on_progress(stats) se llama con el acumulado cada vez que termina un bloque.
+        """
+        total = SelfPlayStats()
+        tasks = self.tasks(games, seed)
+        t0 = time.perf_counter()
+        if self.__workers__ == 1:
+            results = map(_run_chunk, tasks)
+            self.__merge__(total, results, on_progress)
+        else:
+            with get_context().Pool(self.__workers__) as pool:
+                self.__merge__(total, pool.imap_unordered(_run_chunk, tasks), on_progress)
+        total.elapsed = time.perf_counter() - t0
+        return total
+
+    def __merge__(self, total: SelfPlayStats, results, on_progress) -> None:
+        for chunk in results:
+            total.merge(chunk)
+            if on_progress is not None:
+                on_progress(total)
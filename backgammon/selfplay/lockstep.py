@@ -0,0 +1,346 @@
+"""
+Simulador de muchas partidas en paralelo sobre arrays de numpy (lockstep).
+
+Todas las partidas avanzan juntas turno por turno: tiran los dados, una politica vectorizada
+elige cada movimiento entre los legales y se aplican todos en bloque. Un lote es un array
+(n, 28) int8 con el layout de Board.state y el jugador de cada fila es un array con Player.value.
+
+Cada movimiento individual sigue exactamente las reglas de Board.check_move / Board.move
+(entrada desde la barra, bloqueos, maximo MAX_STACK fichas, retiro con cualquier dado sobrante)
+y el fin de la partida las de Game.check_game_over. Para el turno completo:
+-con dados distintos se aplica la regla de generate_plays (usar los dos dados si se puede,
+ y si se puede usar uno solo, el mayor)
+-con dobles cada movimiento se elige entre los que dejan jugar la mayor cantidad posible de
+ los dados que quedan (se busca la secuencia entera, hasta cuatro movimientos), asi que el
+ turno termina en una de las posiciones de generate_plays
+
+Una politica es un callable (candidatos (m, k, 28), legales (m, k) bool, jugadores (m,)) -> indices (m,)
+que elige, para cada fila, uno de los candidatos legales.
+"""
+import time
+import numpy as np
+from backgammon.core.board import Board, BAR_SLOT, BORNE_SLOT, STATE_SIZE, MAX_STACK
+from backgammon.core.player import Player
+from backgammon.ai.batch import win_points
+from backgammon.selfplay.selfplay import GameResult, SelfPlayStats
+
+BAR_SOURCE = 24  #Indice de candidato que representa entrar desde la barra (src None)
+SOURCES = 25
+_POINTS = np.arange(24)
+
+
+def initial_batch(games: int) -> np.ndarray:
+    board = Board()
+    board.__setup__()
+    return np.tile(np.frombuffer(bytes(board.state), dtype=np.int8), (games, 1))
+
+
+def legal_sources(batch: np.ndarray, signs: np.ndarray, dice: np.ndarray) -> np.ndarray:
+    """
+    Mascara (n, 25): columna i < 24 = mover desde el punto i con dice, columna 24 = entrar desde la barra.
+    Coincide con Board.check_move(...) is MoveStatus.OK para cada fila.
+    """
+    n = len(batch)
+    rows = np.arange(n)
+    sign = signs.astype(np.int16)
+    die = dice.astype(np.int16)
+    white = sign < 0
+    own = batch[:, :24].astype(np.int16) * sign[:, None]
+    bar = batch[rows, np.where(white, BAR_SLOT[Player.WHITE], BAR_SLOT[Player.BLACK])]
+
+    dest = _POINTS[None, :] + sign[:, None] * die[:, None]
+    off = (dest < 0) | (dest > 23)
+    outside_point = np.where(white[:, None], _POINTS[None, :] > 5, _POINTS[None, :] < 18)
+    outside = np.where(outside_point, np.maximum(own, 0), 0).sum(axis=1)
+    bear_ok = outside[:, None] - outside_point <= 0  #La ficha que se mueve no cuenta
+    at_dest = np.take_along_axis(own, np.clip(dest, 0, 23), axis=1)
+    move_ok = (at_dest > -2) & (at_dest < MAX_STACK)
+    from_points = (own > 0) & np.where(off, bear_ok, move_ok) & (bar == 0)[:, None]
+
+    entry = np.where(white, die - 1, 24 - die)
+    at_entry = own[rows, entry]
+    from_bar = (bar > 0) & (at_entry > -2) & (at_entry < MAX_STACK)
+    return np.concatenate((from_points, from_bar[:, None]), axis=1)
+
+
+def apply_moves(batch: np.ndarray, signs: np.ndarray, sources: np.ndarray, dice: np.ndarray) -> None:
+    """
+    Aplica en el lugar un movimiento por fila (sources: 0..23 o BAR_SOURCE) como Board.move.
+    No valida: las filas con movimientos ilegales quedan con basura.
+    """
+    rows = np.arange(len(batch))
+    sign = signs.astype(np.int8)
+    die = dice.astype(np.int16)
+    white = sign < 0
+    from_bar = sources == BAR_SOURCE
+    from_slot = np.where(from_bar, np.where(white, BAR_SLOT[Player.WHITE], BAR_SLOT[Player.BLACK]), sources)
+    dest = np.where(from_bar, np.where(white, die - 1, 24 - die), sources + sign * die)
+    batch[rows, from_slot] -= np.where(from_bar, 1, sign).astype(np.int8)
+
+    off = (dest < 0) | (dest > 23)
+    borne = np.where(white, BORNE_SLOT[Player.WHITE], BORNE_SLOT[Player.BLACK])
+    batch[rows[off], borne[off]] += 1
+
+    on = rows[~off]
+    d = dest[on]
+    s = sign[on]
+    hit = batch[on, d] * s == -1
+    opp_bar = np.where(white, BAR_SLOT[Player.BLACK], BAR_SLOT[Player.WHITE])[on]
+    batch[on[hit], opp_bar[hit]] += 1
+    batch[on, d] = np.where(hit, s, batch[on, d] + s)
+
+
+def successors(batch: np.ndarray, signs: np.ndarray, dice: np.ndarray) -> np.ndarray:
+    """(n, 25, 28): el resultado de mover desde cada origen (validos solo donde legal_sources)."""
+    n = len(batch)
+    expanded = np.repeat(batch, SOURCES, axis=0)
+    apply_moves(expanded, np.repeat(signs, SOURCES), np.tile(np.arange(SOURCES), n), np.repeat(dice, SOURCES))
+    return expanded.reshape(n, SOURCES, STATE_SIZE)
+
+
+def _can_continue(candidates: np.ndarray, mask: np.ndarray, signs: np.ndarray, dice: np.ndarray) -> np.ndarray:
+    """
+    (m, k): mask & (desde el candidato hay algun movimiento legal con dice).
+    dice es (m, k); solo se miran los candidatos legales.
+    """
+    m, k, _ = candidates.shape
+    flat = np.flatnonzero(mask.ravel())
+    result = np.zeros(m * k, dtype=bool)
+    if len(flat):
+        rows = flat // k
+        result[flat] = legal_sources(candidates.reshape(-1, STATE_SIZE)[flat], signs[rows],
+                                     dice.ravel()[flat]).any(axis=1)
+    return result.reshape(m, k)
+
+
+def _playable(states: np.ndarray, signs: np.ndarray, dice: np.ndarray, limit: int) -> np.ndarray:
+    """
+    (n,): cuantos movimientos seguidos (hasta limit) se pueden jugar con dice desde cada estado.
+    Los estados repetidos (las permutaciones de un doble llegan a los mismos) se calculan una vez.
+    """
+    if limit == 0 or not len(states):
+        return np.zeros(len(states), dtype=np.int64)
+    keys = np.concatenate((states, signs[:, None].astype(np.int8), dice[:, None].astype(np.int8)), axis=1)
+    keys = np.ascontiguousarray(keys).view(f"V{STATE_SIZE + 2}").ravel()
+    _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    states, signs, dice = states[first], signs[first], dice[first]
+    legal = legal_sources(states, signs, dice)
+    depth = legal.any(axis=1).astype(np.int64)
+    rows, sources = np.nonzero(legal)
+    if limit > 1 and len(rows):
+        children = states[rows]
+        apply_moves(children, signs[rows], sources, dice[rows])
+        best = np.zeros(len(states), dtype=np.int64)
+        np.maximum.at(best, rows, _playable(children, signs[rows], dice[rows], limit - 1))
+        depth += best
+    return depth[inverse.ravel()]
+
+
+class RandomBatchPolicy:
+    """Elige un movimiento legal al azar en cada fila."""
+
+    def __init__(self, seed=None):
+        self.__rng__ = np.random.default_rng(seed)
+
+    def __call__(self, candidates, mask, signs):
+        keys = self.__rng__.random(mask.shape)
+        keys[~mask] = -1.0
+        return keys.argmax(axis=1)
+
+
+class EvaluatorBatchPolicy:
+    """
+    Elige el movimiento que deja la mejor equity segun evaluator.evaluate_states
+    (ver backgammon.ai.batch), evaluando todos los candidatos de todas las filas juntos.
+    """
+
+    def __init__(self, evaluator):
+        self.__evaluator__ = evaluator
+
+    def __call__(self, candidates, mask, signs):
+        m, k, _ = candidates.shape
+        flat = candidates.reshape(-1, STATE_SIZE)
+        movers = np.repeat(signs, k)
+        values = -self.__evaluator__.evaluate_states(flat, -movers)
+        borne = np.where(movers < 0, flat[:, BORNE_SLOT[Player.WHITE]], flat[:, BORNE_SLOT[Player.BLACK]])
+        values = np.where(borne == 15, 10.0, values).reshape(m, k)
+        return np.where(mask, values, -np.inf).argmax(axis=1)
+
+
+class BatchResult:
+    """Resultados de LockstepSimulator.run: un elemento por partida."""
+
+    def __init__(self, winners, points, turns, states, elapsed: float, log=None):
+        self.winners = winners  #Player.value del ganador, 0 si se corto por max_turns
+        self.points = points
+        self.turns = turns
+        self.states = states    #Posicion final (n, 28)
+        self.elapsed = elapsed
+        self.__log__ = log
+
+    def __len__(self) -> int:
+        return len(self.winners)
+
+    def result(self, i: int) -> GameResult:
+        winner = Player(int(self.winners[i])) if self.winners[i] else None
+        return GameResult(winner, int(self.points[i]), int(self.turns[i]))
+
+    def stats(self) -> SelfPlayStats:
+        stats = SelfPlayStats()
+        for i in range(len(self)):
+            stats.add(self.result(i))
+        stats.elapsed = self.elapsed
+        return stats
+
+    def moves(self, i: int) -> list:
+        """
+        Movimientos de la partida i como (turno, Player, src, die), src None = barra.
+        Solo si se corrio con record=True.
+        """
+        if self.__log__ is None:
+            raise ValueError("La simulacion no se corrio con record=True")
+        moves = []
+        for turn, rows, signs, sources, dice in self.__log__:
+            k = np.searchsorted(rows, i)
+            if k < len(rows) and rows[k] == i:
+                src = int(sources[k])
+                moves.append((turn, Player(int(signs[k])), None if src == BAR_SOURCE else src, int(dice[k])))
+        return moves
+
+
+class LockstepSimulator:
+    """
+    Juega muchas partidas a la vez. white_policy y black_policy son politicas vectorizadas.
+    Con record=True guarda cada movimiento (ver BatchResult.moves).
+    """
+
+    def __init__(self, white_policy, black_policy, max_turns: int = 2000, record: bool = False):
+        self.__policies__ = {Player.WHITE.value: white_policy, Player.BLACK.value: black_policy}
+        self.__max_turns__ = max_turns
+        self.__record__ = record
+        self.__log__ = None
+
+    def __choose__(self, candidates, mask, signs) -> np.ndarray:
+        choice = np.zeros(len(signs), dtype=np.int64)
+        for value, policy in self.__policies__.items():
+            rows = np.flatnonzero(signs == value)
+            if len(rows):
+                choice[rows] = policy(candidates[rows], mask[rows], signs[rows])
+        return choice
+
+    def __step__(self, batch, rows, signs, candidates, mask, dice, turn) -> tuple:
+        """
+        Aplica en batch[rows] el candidato que elige la politica en las filas con algo legal.
+        dice (m, k) es el dado de cada candidato. Devuelve (filas que movieron, eleccion).
+        """
+        moved = np.flatnonzero(mask.any(axis=1))
+        if not len(moved):
+            return moved, moved
+        choice = self.__choose__(candidates[moved], mask[moved], signs[moved])
+        batch[rows[moved]] = candidates[moved, choice]
+        if self.__log__ is not None:
+            self.__log__.append((turn, rows[moved], signs[moved], choice % SOURCES, dice[moved, choice]))
+        return moved, choice
+
+    def play_turn(self, batch: np.ndarray, rows: np.ndarray, signs: np.ndarray, rolls: np.ndarray,
+                  turn: int = 0) -> None:
+        """Juega en el lugar la tirada rolls (m, 2) de las filas rows de batch (signs = jugador de cada una)."""
+        doubles = rolls[:, 0] == rolls[:, 1]
+
+        pick = np.flatnonzero(~doubles)
+        if len(pick):
+            r, s = rows[pick], signs[pick]
+            a, b = rolls[pick, 0], rolls[pick, 1]
+            states = batch[r]
+            #Primer movimiento: 25 origenes con el dado a y 25 con el dado b
+            candidates = np.concatenate((successors(states, s, a), successors(states, s, b)), axis=1)
+            legal = np.concatenate((legal_sources(states, s, a), legal_sources(states, s, b)), axis=1)
+            first = np.concatenate((np.repeat(a[:, None], SOURCES, 1), np.repeat(b[:, None], SOURCES, 1)), axis=1)
+            second = np.concatenate((np.repeat(b[:, None], SOURCES, 1), np.repeat(a[:, None], SOURCES, 1)), axis=1)
+            both = _can_continue(candidates, legal, s, second)
+            high = legal & (first > second)
+            mask = np.where(both.any(axis=1)[:, None], both,
+                            np.where(high.any(axis=1)[:, None], high, legal))
+            moved, choice = self.__step__(batch, r, s, candidates, mask, first, turn)
+
+            #Segundo movimiento con el dado que quedo (solo si el primero dejaba usar los dos)
+            r, s = r[moved], s[moved]
+            remaining = second[moved, choice]
+            states = batch[r]
+            mask = legal_sources(states, s, remaining)
+            self.__step__(batch, r, s, successors(states, s, remaining), mask,
+                          np.repeat(remaining[:, None], SOURCES, 1), turn)
+
+        pick = np.flatnonzero(doubles)
+        if len(pick):
+            r, s, d = rows[pick], signs[pick], rolls[pick, 0]
+            dice = np.repeat(d[:, None], SOURCES, 1)
+            for step in range(4):
+                states = batch[r]
+                candidates = successors(states, s, d)
+                mask = legal_sources(states, s, d)
+                if step < 3:
+                    #Solo los candidatos desde los que se juegan la mayor cantidad de dados restantes
+                    flat = np.flatnonzero(mask.ravel())
+                    rows = flat // SOURCES
+                    depth = np.full(mask.size, -1, dtype=np.int64)
+                    depth[flat] = _playable(candidates.reshape(-1, STATE_SIZE)[flat], s[rows], d[rows], 3 - step)
+                    depth = depth.reshape(mask.shape)
+                    mask &= depth == depth.max(axis=1, keepdims=True)
+                self.__step__(batch, r, s, candidates, mask, dice, turn)
+
+    def run(self, games: int, seed=None, states: np.ndarray | None = None,
+            players: np.ndarray | None = None, rolls=None, before_turn=None) -> BatchResult:
+        """
+        Juega games partidas hasta que terminen (o max_turns). Sin states arrancan de la
+        posicion inicial con el sorteo de Game.roll; con states (games, 28) y players
+        (Player.value de quien tira en cada fila) arrancan desde esas posiciones.
+
+        rolls(turno, filas) -> (m, 2) reemplaza a los dados al azar (ver backgammon.ai.rollout)
+        y before_turn(turno, batch, filas, jugadores, tiradas) se llama antes de jugar cada turno.
+        """
+        t0 = time.perf_counter()
+        rng = np.random.default_rng(seed)
+        self.__log__ = [] if self.__record__ else None
+        if states is None:
+            batch = initial_batch(games)
+            signs = np.zeros(games, dtype=np.int8)
+            pending = np.arange(games)
+            while len(pending):  #Sorteo inicial: se repite mientras haya empate
+                draw = rng.integers(1, 7, size=(len(pending), 2))
+                decided = draw[:, 0] != draw[:, 1]
+                signs[pending[decided]] = np.where(draw[decided, 0] > draw[decided, 1],
+                                                   Player.WHITE.value, Player.BLACK.value)
+                pending = pending[~decided]
+        else:
+            batch = np.array(states, dtype=np.int8)
+            signs = np.asarray(players, dtype=np.int8).copy()
+            if batch.shape != (games, STATE_SIZE) or signs.shape != (games,):
+                raise ValueError(f"states debe ser ({games}, {STATE_SIZE}) y players ({games},)")
+
+        winners = np.zeros(games, dtype=np.int8)
+        points = np.zeros(games, dtype=np.int8)
+        turns = np.full(games, self.__max_turns__, dtype=np.int32)
+        active = np.arange(games)
+        turn = 1
+        while len(active) and turn <= self.__max_turns__:
+            s = signs[active]
+            dice = rng.integers(1, 7, size=(len(active), 2)) if rolls is None else rolls(turn, active)
+            if before_turn is not None:
+                before_turn(turn, batch, active, s, dice)
+            self.play_turn(batch, active, s, dice, turn)
+
+            borne = np.where(s < 0, batch[active, BORNE_SLOT[Player.WHITE]], batch[active, BORNE_SLOT[Player.BLACK]])
+            done = borne == 15
+            if done.any():
+                finished = active[done]
+                winners[finished] = s[done]
+                points[finished] = win_points(batch[finished], s[done])
+                turns[finished] = turn
+                active = active[~done]
+            signs[active] = -signs[active]
+            turn += 1
+
+        log = self.__log__
+        self.__log__ = None
+        return BatchResult(winners, points, turns, batch, time.perf_counter() - t0, log)
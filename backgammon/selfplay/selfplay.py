@@ -0,0 +1,223 @@
+"""
+Self-play sin interfaz: juega partidas completas entre dos politicas usando Game, Board y Dice.
+No imprime nada ni arma textos de historial; solo devuelve resultados y estadisticas.
+
+Una politica es cualquier callable (board, player, dice, plays) -> (jugada, estado)
+que elige uno de los elementos de plays (la salida de generate_plays).
+"""
+import random
+import time
+from backgammon.core.board import Board, BORNE_SLOT
+from backgammon.core.game import Game
+from backgammon.core.player import Player
+from backgammon.core.movegen import generate_plays
+
+
+MASK64 = (1 << 64) - 1
+
+
+def game_seed(master_seed: int, index: int) -> int:
+    """
+    Semilla de la partida numero index derivada de la semilla maestra (mezcla splitmix64).
+    Cada partida tiene su propio flujo, asi el resultado no depende de como se repartan entre procesos.
+    """
+    z = (master_seed * 0x9E3779B97F4A7C15 + index + 1) & MASK64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASK64
+    return z ^ (z >> 31)
+
+
+class RandomPolicy:
+    """Elige una jugada legal al azar."""
+
+    def __init__(self, seed=None):
+        self.__rng__ = random.Random(seed)
+
+    def reseed(self, seed) -> None:#SelfPlay la llama al comienzo de cada partida con semilla
+        self.__rng__.seed(seed)
+
+    def __call__(self, board, player, dice, plays):
+        return plays[self.__rng__.randrange(len(plays))]
+
+
+class FirstPlayPolicy:
+    """Elige siempre la primera jugada generada (determinista y lo mas barata posible)."""
+
+    def __call__(self, board, player, dice, plays):
+        return plays[0]
+
+
+class GreedyPolicy:
+    """Elige la jugada que deja la mayor diferencia de pips a favor (golpear suma pips al rival)."""
+
+    def __call__(self, board, player, dice, plays):
+        opponent = Player.BLACK if player is Player.WHITE else Player.WHITE
+        best = plays[0]
+        best_score = None
+        for candidate in plays:
+            after = Board.from_state(candidate[1])
+            score = after.pip_count(opponent) - after.pip_count(player)
+            if best_score is None or score > best_score:
+                best, best_score = candidate, score
+        return best
+
+
+class EvaluatorPolicy:
+    """
+    Elige la jugada que deja la mejor equity segun evaluator. Si tiene evaluate_states
+    (ver backgammon.ai.batch y backgammon.ai.network) puntua todas las jugadas en un lote.
+    """
+
+    def __init__(self, evaluator):
+        self.__evaluator__ = evaluator
+        self.__batch__ = getattr(evaluator, "evaluate_states", None)
+
+    def __call__(self, board, player, dice, plays):
+        opponent = Player.BLACK if player is Player.WHITE else Player.WHITE
+        for candidate in plays:
+            if candidate[1][BORNE_SLOT[player]] == 15:
+                return candidate
+        if self.__batch__ is not None:
+            values = self.__batch__([state for _, state in plays], opponent)
+        else:
+            values = [self.__evaluator__(Board.from_state(state), opponent) for _, state in plays]
+        best = min(range(len(plays)), key=values.__getitem__)  #La peor posicion para el rival
+        return plays[best]
+
+
+POLICIES = {
+    "random": RandomPolicy,
+    "first": FirstPlayPolicy,
+    "greedy": GreedyPolicy,
+}
+
+
+class GameResult:
+    """Resultado de una partida de self-play."""
+
+    def __init__(self, winner, points: int, turns: int):
+        self.winner = winner    #Player o None si se corto por max_turns
+        self.points = points    #1 simple, 2 gammon, 3 backgammon, 0 sin terminar
+        self.turns = turns
+
+
+class SelfPlayStats:
+    """Acumula resultados de muchas partidas."""
+
+    def __init__(self):
+        self.games = 0
+        self.unfinished = 0
+        self.total_turns = 0
+        self.elapsed = 0.0
+        self.wins = {Player.WHITE: 0, Player.BLACK: 0}
+        self.gammons = {Player.WHITE: 0, Player.BLACK: 0}
+        self.backgammons = {Player.WHITE: 0, Player.BLACK: 0}
+
+    def add(self, result: GameResult) -> None:
+        self.games += 1
+        self.total_turns += result.turns
+        if result.winner is None:
+            self.unfinished += 1
+            return
+        self.wins[result.winner] += 1
+        if result.points == 2:
+            self.gammons[result.winner] += 1
+        elif result.points == 3:
+            self.backgammons[result.winner] += 1
+
+    def merge(self, other: "SelfPlayStats") -> None:
+        self.games += other.games
+        self.unfinished += other.unfinished
+        self.total_turns += other.total_turns
+        self.elapsed = max(self.elapsed, other.elapsed)
+        for player in (Player.WHITE, Player.BLACK):
+            self.wins[player] += other.wins[player]
+            self.gammons[player] += other.gammons[player]
+            self.backgammons[player] += other.backgammons[player]
+
+    @property
+    def games_per_second(self) -> float:
+        return self.games / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def average_length(self) -> float:#Promedio de turnos por partida
+        return self.total_turns / self.games if self.games else 0.0
+
+    def win_rate(self, player: Player) -> float:
+        return self.wins[player] / self.games if self.games else 0.0
+
+    def gammon_rate(self, player: Player) -> float:#Incluye solo gammons (no backgammons)
+        return self.gammons[player] / self.games if self.games else 0.0
+
+    def backgammon_rate(self, player: Player) -> float:
+        return self.backgammons[player] / self.games if self.games else 0.0
+
+    def __str__(self):
+        lines = [
+            f"Partidas: {self.games} ({self.unfinished} sin terminar) en {self.elapsed:.2f}s"
+            f" -> {self.games_per_second:.1f} partidas/s",
+            f"Largo promedio: {self.average_length:.1f} turnos",
+        ]
+        for player in (Player.WHITE, Player.BLACK):
+            lines.append(
+                f"{player.name}: gana {self.win_rate(player):.1%} | gammon {self.gammon_rate(player):.1%}"
+                f" | backgammon {self.backgammon_rate(player):.1%}"
+            )
+        return "\n".join(lines)
+
+
+class SelfPlay:
+    """
+    Motor de self-play: una Game reutilizada (sin historial) y una politica por color.
+    """
+
+    def __init__(self, white_policy, black_policy, max_turns: int = 2000):
+        self.__policies__ = {Player.WHITE: white_policy, Player.BLACK: black_policy}
+        self.__max_turns__ = max_turns
+        self.__game__ = Game(record_history=False)
+
+    @property
+    def game(self) -> Game:
+        return self.__game__
+
+    def play_game(self, seed: int | None = None) -> GameResult:
+        """
+        Juega una partida completa. Con seed, los dados y las politicas que tengan
+        reseed() usan flujos propios de esa semilla (partida reproducible).
+        """
+        game = self.__game__
+        if seed is not None:
+            game.set_rng(random.Random(seed))
+            for offset, policy in enumerate(self.__policies__.values(), start=1):
+                if hasattr(policy, "reseed"):
+                    policy.reseed(game_seed(seed, offset))
+        game.reset()
+        game.start()
+        game.roll()  #Sorteo inicial
+        board = game.board
+        policies = self.__policies__
+        while game.turn_count <= self.__max_turns__:
+            player = game.current_player
+            dice = game.roll()
+            plays = generate_plays(board, player, dice)
+            play, _ = policies[player](board, player, dice, plays)
+            for src, die in play:
+                board.move(player, src, die)
+            game.check_game_over()
+            if game.finished:
+                return GameResult(game.winner, game.win_points(), game.turn_count)
+            game.pass_turn()
+        return GameResult(None, 0, game.turn_count - 1)
+
+    def run(self, games: int, stats: SelfPlayStats | None = None,
+            seed: int | None = None, start: int = 0) -> SelfPlayStats:
+        """
+        Juega games partidas. Con seed, la partida numero i (contando desde start)
+        usa game_seed(seed, i).
+        """
+        stats = stats if stats is not None else SelfPlayStats()
+        t0 = time.perf_counter()
+        for i in range(start, start + games):
+            stats.add(self.play_game(game_seed(seed, i) if seed is not None else None))
+        stats.elapsed += time.perf_counter() - t0
+        return stats
@@ -0,0 +1,4 @@
+"""Servidor asyncio de mesas (TCP, un JSON por linea)."""
+from .server import GameServer, Lobby, Table, serve, error_message
+
+__all__ = ["GameServer", "Lobby", "Table", "serve", "error_message"]
@@ -0,0 +1,28 @@
+import argparse
+import asyncio
+from .server import serve, HOST, PORT, IDLE_TIMEOUT, MAX_TABLES
+
+
+def _announce(server) -> None:
+    print(f"Servidor de backgammon en {':'.join(map(str, server.address))}")
+
+
+def run() -> None:
+    parser = argparse.ArgumentParser(prog="python -m backgammon.server",
+                                     description="Servidor de mesas de backgammon (TCP, un JSON por linea)")
+    parser.add_argument("--host", default=HOST, help=f"Direccion (por defecto {HOST})")
+    parser.add_argument("--port", type=int, default=PORT, help=f"Puerto (por defecto {PORT})")
+    parser.add_argument("--idle-timeout", type=float, default=IDLE_TIMEOUT,
+                        help="Segundos sin actividad antes de cerrar una mesa")
+    parser.add_argument("--max-tables", type=int, default=MAX_TABLES, help="Mesas abiertas como maximo")
+    parser.add_argument("--seed", type=int, default=None, help="Semilla de los dados (mesas reproducibles)")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, idle_timeout=args.idle_timeout,
+                          max_tables=args.max_tables, seed=args.seed, on_start=_announce))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    run()
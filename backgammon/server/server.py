@@ -0,0 +1,364 @@
+"""
+Servidor de mesas de backgammon: asyncio + TCP con un JSON por linea.
+
+Pedido:     {"id": 7, "table": "t1", "cmd": "move", "args": ["12", "3"]}
+Respuesta:  {"id": 7, "ok": true, "table": "t1", "state": {...}}  o  {"id": 7, "ok": false, "error": "..."}
+Aviso:      {"event": "update", "table": "t1", "cmd": "move", "state": {...}} a las otras conexiones de la mesa
+
+Comandos de mesa (los mismos verbos que el CLI): start [white black], roll, move <src|bar> <die>,
+pass, board, status, leave. Comandos del servidor (sin "table"): new [id], tables, ping.
+Cada comando se resuelve de forma sincronica sobre la Game de la mesa (sin esperas), asi que
+un proceso atiende miles de mesas; las mesas sin actividad por idle_timeout segundos se cierran.
+"""
+import asyncio
+import itertools
+import json
+import random
+import time
+from backgammon.core.game import Game
+from backgammon.core.player import Player
+from backgammon.core.positionid import game_position_id
+from backgammon.core.exceptions import BackgammonError, InvalidCommand
+
+HOST = "127.0.0.1"
+PORT = 8765
+IDLE_TIMEOUT = 600.0
+SWEEP_INTERVAL = 30.0
+MAX_TABLES = 10000
+MAX_LINE = 4096
+MAX_BUFFER = 1 << 16    #Bytes sin enviar a una conexion lenta antes de cortarla
+HISTORY_LIMIT = 64
+TABLE_COMMANDS = ("start", "roll", "move", "pass", "board", "status", "leave")
+MUTATING = ("start", "roll", "move", "pass")
+
+
+def error_message(exc: BackgammonError) -> str:
+    """Texto de error para la respuesta (las excepciones del core sin mensaje usan su docstring)."""
+    if isinstance(exc, InvalidCommand):
+        return str(exc)
+    return f"{exc.__class__.__name__}: {str(exc) or exc.__class__.__doc__}"
+
+
+class Table:
+    """
+    Una mesa: una Game y los dados que le quedan al jugador en turno, como en el CLI.
+    handle(cmd, args) devuelve el dict de respuesta o lanza la excepcion del core (InvalidCommand
+    si el pedido esta mal armado).
+    """
+
+    def __init__(self, table_id: str, rng=None, clock=time.monotonic):
+        self.table_id = table_id
+        self.game = Game(rng=rng, history_limit=HISTORY_LIMIT)
+        self.remaining_dice = []
+        self.watchers = set()   #Conexiones que jugaron o miraron la mesa
+        self.__clock__ = clock
+        self.last_active = clock()
+
+    def state(self) -> dict:
+        game = self.game
+        player = game.current_player
+        return {
+            "started": game.started,
+            "finished": game.finished,
+            "turn": game.turn_count,
+            "player": player.name if player is not None else None,
+            "names": {p.name: game.get_player_name(p) for p in (Player.WHITE, Player.BLACK)},
+            "dice": list(game.dice.values),
+            "remaining": list(self.remaining_dice),
+            "winner": game.winner.name if game.winner is not None else None,
+            "points": game.win_points(),
+            "position_id": game_position_id(game) if game.started else None,
+        }
+
+    def handle(self, cmd: str, args: list) -> dict:
+        self.last_active = self.__clock__()
+        handler = getattr(self, f"cmd_{cmd}", None)
+        if cmd not in TABLE_COMMANDS or handler is None:
+            raise InvalidCommand(f"Comando desconocido: {cmd}")
+        result = handler([str(a) for a in args])
+        response = {"state": self.state()}
+        if result:
+            response.update(result)
+        return response
+
+    def cmd_start(self, args: list):
+        if args:
+            if len(args) != 2:
+                raise InvalidCommand("Uso: start [white black]")
+            self.game.setup_players(*args)
+        self.game.start()
+        self.remaining_dice = []
+
+    def cmd_roll(self, args: list):
+        game = self.game
+        if game.current_player is not None and game.dice.values != (0, 0):
+            raise InvalidCommand("Ya tiraste los dados en este turno. Usá 'move' o 'pass'.")
+        draw = game.current_player is None
+        a, b = game.roll()
+        if draw:
+            return {"draw": [a, b]}
+        self.remaining_dice = [a, b] if a != b else [a] * 4
+        return {"roll": [a, b]}
+
+    def cmd_move(self, args: list):
+        game = self.game
+        if game.started and game.current_player is None:
+            raise InvalidCommand("Primero resolvé el sorteo inicial con 'roll'.")
+        if game.started and game.dice.values == (0, 0):
+            raise InvalidCommand("Primero tirá los dados con 'roll'.")
+        if len(args) != 2:
+            raise InvalidCommand("Uso: move <src|bar> <die>")
+        try:
+            src = None if args[0].lower() == "bar" else int(args[0])
+            die = int(args[1])
+        except ValueError:
+            src = die = -1
+        if not (src is None or 0 <= src <= 23) or not 1 <= die <= 6:
+            raise InvalidCommand("Uso: move <src|bar> <die> (src 0..23 o 'bar', die 1..6)")
+        if game.started and die not in self.remaining_dice:
+            raise InvalidCommand(f"Ese valor ({die}) no coincide con los dados disponibles {self.remaining_dice}.")
+        game.move(src, die)
+        self.remaining_dice.remove(die)
+        game.check_game_over()
+
+    def __can_move__(self) -> bool:#Queda algun movimiento legal con los dados restantes
+        board = self.game.board
+        player = self.game.current_player
+        sources = [None] + list(range(24))
+        return any(board.is_legal(player, src, die) for die in set(self.remaining_dice) for src in sources)
+
+    def cmd_pass(self, args: list):
+        game = self.game
+        if game.started and not game.finished and self.remaining_dice and self.__can_move__():
+            raise InvalidCommand(f"Te faltan usar dados: {self.remaining_dice}.")
+        game.pass_turn()
+        self.remaining_dice = []
+
+    def cmd_board(self, args: list):
+        return {"board": self.game.board.ascii(), "cells": list(self.game.board.state)}
+
+    def cmd_status(self, args: list):
+        return {"status": str(self.game)}
+
+    def cmd_leave(self, args: list):
+        return None   #El servidor saca a la conexion de watchers
+
+
+class Lobby:
+    """Las mesas de un proceso, por id. Sin asyncio: se puede usar y probar sola."""
+
+    def __init__(self, max_tables: int = MAX_TABLES, seed=None, clock=time.monotonic):
+        self.__tables__ = {}
+        self.__max_tables__ = max_tables
+        self.__seed__ = seed
+        self.__clock__ = clock
+        self.__ids__ = itertools.count(1)
+
+    def __len__(self) -> int:
+        return len(self.__tables__)
+
+    def __contains__(self, table_id) -> bool:
+        return table_id in self.__tables__
+
+    def ids(self) -> list:
+        return list(self.__tables__)
+
+    def create(self, table_id: str | None = None) -> Table:
+        if len(self.__tables__) >= self.__max_tables__:
+            raise InvalidCommand(f"No hay lugar para mas mesas (maximo {self.__max_tables__})")
+        if table_id is None:
+            table_id = f"t{next(self.__ids__)}"
+            while table_id in self.__tables__:
+                table_id = f"t{next(self.__ids__)}"
+        elif table_id in self.__tables__:
+            raise InvalidCommand(f"La mesa {table_id} ya existe")
+        #Con semilla los dados de cada mesa son reproducibles (dependen solo de la semilla y el id)
+        rng = random.Random(f"{self.__seed__}:{table_id}") if self.__seed__ is not None else None
+        table = Table(table_id, rng, self.__clock__)
+        self.__tables__[table_id] = table
+        return table
+
+    def get(self, table_id: str) -> Table:
+        table = self.__tables__.get(table_id)
+        if table is None:
+            raise InvalidCommand(f"No existe la mesa {table_id}")
+        return table
+
+    def remove(self, table_id: str) -> Table | None:
+        return self.__tables__.pop(table_id, None)
+
+    def evict_idle(self, idle_timeout: float, now: float | None = None) -> list:
+        """Saca y devuelve las mesas sin actividad hace mas de idle_timeout segundos."""
+        now = self.__clock__() if now is None else now
+        idle = [t for t in self.__tables__.values() if now - t.last_active > idle_timeout]
+        for table in idle:
+            del self.__tables__[table.table_id]
+        return idle
+
+
+class GameServer:
+    """
+    Servidor asyncio sobre un Lobby. start() abre el puerto (port=0 elige uno libre, ver address),
+    serve_forever() atiende hasta que se cancela y close() corta todo.
+    """
+
+    def __init__(self, host: str = HOST, port: int = PORT, idle_timeout: float = IDLE_TIMEOUT,
+                 sweep_interval: float = SWEEP_INTERVAL, max_tables: int = MAX_TABLES, seed=None):
+        self.lobby = Lobby(max_tables, seed)
+        self.__host__ = host
+        self.__port__ = port
+        self.__idle_timeout__ = idle_timeout
+        self.__sweep_interval__ = sweep_interval
+        self.__server__ = None
+        self.__sweeper__ = None
+        self.__connections__ = {}   #writer -> mesas en las que participa
+
+    @property
+    def address(self) -> tuple:
+        return self.__server__.sockets[0].getsockname()[:2]
+
+    @property
+    def connections(self) -> int:
+        return len(self.__connections__)
+
+    async def start(self) -> None:
+        self.__server__ = await asyncio.start_server(self.__client__, self.__host__, self.__port__,
+                                                     limit=MAX_LINE)
+        self.__sweeper__ = asyncio.create_task(self.__sweep__())
+
+    async def serve_forever(self) -> None:
+        if self.__server__ is None:
+            await self.start()
+        try:
+            await self.__server__.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+        if self.__sweeper__ is not None:
+            self.__sweeper__.cancel()
+            self.__sweeper__ = None
+        for writer in list(self.__connections__):
+            writer.close()
+        self.__connections__.clear()
+        if self.__server__ is not None:
+            self.__server__.close()
+            await self.__server__.wait_closed()
+
+    async def __sweep__(self) -> None:#Cierra las mesas inactivas cada sweep_interval segundos
+        while True:
+            await asyncio.sleep(self.__sweep_interval__)
+            self.evict_idle()
+
+    def evict_idle(self, now: float | None = None) -> list:
+        tables = self.lobby.evict_idle(self.__idle_timeout__, now)
+        for table in tables:
+            self.__notify__(table, {"event": "evicted", "table": table.table_id})
+            for writer in table.watchers:
+                self.__connections__.get(writer, set()).discard(table)
+            table.watchers.clear()
+        return tables
+
+    def __send__(self, writer, message: dict) -> None:
+        if writer.is_closing():
+            return
+        if writer.transport.get_write_buffer_size() > MAX_BUFFER:
+            writer.close()   #Cliente que no lee: se corta en vez de acumular memoria
+            return
+        writer.write(json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n")
+
+    def __notify__(self, table: Table, message: dict, skip=None) -> None:
+        for writer in list(table.watchers):
+            if writer is not skip:
+                self.__send__(writer, message)
+
+    def __watch__(self, table: Table, writer) -> None:
+        if writer is not None and writer in self.__connections__:
+            table.watchers.add(writer)
+            self.__connections__[writer].add(table)
+
+    def __unwatch__(self, table: Table, writer) -> None:
+        table.watchers.discard(writer)
+        self.__connections__.get(writer, set()).discard(table)
+
+    def dispatch(self, request: dict, writer=None) -> dict:
+        """Resuelve un pedido ya decodificado y devuelve la respuesta (sin el id)."""
+        cmd = str(request.get("cmd", "")).lower()
+        args = request.get("args", [])
+        if not isinstance(args, list):
+            raise InvalidCommand("args tiene que ser una lista")
+        table_id = request.get("table")
+        if table_id is None:
+            if cmd == "ping":
+                return {"pong": True}
+            if cmd == "new":
+                table = self.lobby.create(str(args[0]) if args else None)
+                self.__watch__(table, writer)
+                return {"table": table.table_id, "state": table.state()}
+            if cmd == "tables":
+                return {"tables": self.lobby.ids()}
+            raise InvalidCommand(f"Comando desconocido: {cmd} (los comandos de mesa necesitan 'table')")
+        table = self.lobby.get(str(table_id))
+        response = table.handle(cmd, args)
+        response["table"] = table.table_id
+        if cmd == "leave":
+            self.__unwatch__(table, writer)
+        else:
+            self.__watch__(table, writer)
+        if cmd in MUTATING:
+            self.__notify__(table, {"event": "update", "table": table.table_id, "cmd": cmd,
+                                    "state": response["state"]}, skip=writer)
+        return response
+
+    async def __client__(self, reader, writer) -> None:#Una conexion: lee pedidos hasta que se cierra
+        self.__connections__[writer] = set()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (asyncio.LimitOverrunError, ValueError):
+                    self.__send__(writer, {"ok": False, "error": f"Linea demasiado larga (maximo {MAX_LINE})"})
+                    break
+                except ConnectionError:
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                self.__send__(writer, self.__answer__(line, writer))
+                try:
+                    await writer.drain()
+                except ConnectionError:
+                    break
+        finally:
+            for table in self.__connections__.pop(writer, ()):
+                table.watchers.discard(writer)
+            writer.close()
+
+    def __answer__(self, line: bytes, writer) -> dict:
+        request_id = None
+        try:
+            request = json.loads(line.decode("utf-8"))
+            if not isinstance(request, dict):
+                raise InvalidCommand("El pedido tiene que ser un objeto JSON")
+            request_id = request.get("id")
+            response = self.dispatch(request, writer)
+            response["ok"] = True
+        except UnicodeDecodeError:
+            response = {"ok": False, "error": "El pedido no es UTF-8 valido"}
+        except json.JSONDecodeError as exc:
+            response = {"ok": False, "error": f"JSON invalido: {exc.msg}"}
+        except BackgammonError as exc:
+            response = {"ok": False, "error": error_message(exc)}
+        if request_id is not None:
+            response["id"] = request_id
+        return response
+
+
+async def serve(host: str = HOST, port: int = PORT, on_start=None, **options) -> None:
+    """Atiende hasta que se cancela. on_start(server) se llama con el servidor ya escuchando."""
+    server = GameServer(host, port, **options)
+    await server.start()
+    if on_start is not None:
+        on_start(server)
+    await server.serve_forever()
@@ -0,0 +1,120 @@
+import importlib.util
+import random
+import unittest
+
+from backgammon.core.board import Board
+from backgammon.core.player import Player
+from backgammon.core.movegen import generate_plays, legal_plays
+from backgammon.ai.search import ExpectiminimaxSearch, race_evaluator
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+if HAS_NUMPY:
+    import numpy as np
+    from backgammon.ai import batch
+
+
+def random_positions(count, seed=0):
+    """Posiciones alcanzables jugando al azar desde el inicio."""
+    rng = random.Random(seed)
+    board = Board()
+    board.__reset__()
+    player = Player.WHITE
+    boards = []
+    while len(boards) < count:
+        dice = (rng.randint(1, 6), rng.randint(1, 6))
+        _, state = rng.choice(generate_plays(board, player, dice))
+        board = Board.from_state(state)
+        boards.append(board)
+        if board.borne_count(player) == 15:
+            board = Board()
+            board.__reset__()
+        player = Player.BLACK if player is Player.WHITE else Player.WHITE
+    return boards
+
+
+def slow_contact(board):
+    whites = [i for i in range(24) if board.owner_at(i) is Player.WHITE]
+    blacks = [i for i in range(24) if board.owner_at(i) is Player.BLACK]
+    white_back = 24 if board.bar_count(Player.WHITE) else max(whites, default=-1)
+    black_back = -1 if board.bar_count(Player.BLACK) else min(blacks, default=24)
+    return white_back > black_back
+
+
+@unittest.skipUnless(HAS_NUMPY, "requiere numpy")
+class TestBatch(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.boards = random_positions(300)
+        cls.batch = batch.as_batch(cls.boards)
+
+    def test_as_batch_shapes(self):
+        self.assertEqual(self.batch.shape, (300, 28))
+        self.assertEqual(batch.as_batch(self.boards[0]).shape, (1, 28))
+        self.assertEqual(batch.as_batch(self.boards[0].state).shape, (1, 28))
+        with self.assertRaises(ValueError):
+            batch.as_batch(np.zeros((2, 27), dtype=np.int8))
+
+    def test_counts_match_board(self):
+        pips = batch.pip_counts(self.batch)
+        blots = batch.blot_counts(self.batch)
+        points = batch.point_counts(self.batch)
+        for k, b in enumerate(self.boards):
+            for col, player in enumerate((Player.WHITE, Player.BLACK)):
+                mine = [b.count_at(i) for i in range(24) if b.owner_at(i) is player]
+                self.assertEqual(pips[k, col], b.pip_count(player))
+                self.assertEqual(blots[k, col], mine.count(1))
+                self.assertEqual(points[k, col], sum(1 for c in mine if c >= 2))
+
+    def test_contact_classification(self):
+        expected = [slow_contact(b) for b in self.boards]
+        self.assertEqual(batch.contact(self.batch).tolist(), expected)
+        self.assertIn(False, expected)  #Hay carreras en la muestra
+
+    def test_win_points_match_board(self):
+        for winner in (Player.WHITE, Player.BLACK):
+            got = batch.win_points(self.batch, winner)
+            self.assertEqual(got.tolist(), [b.win_points(winner) for b in self.boards])
+
+    def test_race_weights_reproduce_race_evaluator(self):
+        lin = batch.LinearEvaluator.race()
+        values = lin.evaluate_states(self.batch, Player.BLACK)
+        for k in range(0, 300, 17):
+            self.assertAlmostEqual(values[k], race_evaluator(self.boards[k], Player.BLACK), places=5)
+            self.assertAlmostEqual(lin(self.boards[k], Player.WHITE),
+                                   race_evaluator(self.boards[k], Player.WHITE), places=5)
+
+    def test_player_per_row(self):
+        signs = np.array([Player.WHITE.value, Player.BLACK.value] * 150)
+        mixed = batch.features(self.batch, signs)
+        white = batch.features(self.batch, Player.WHITE)
+        black = batch.features(self.batch, Player.BLACK)
+        np.testing.assert_array_equal(mixed[0::2], white[0::2])
+        np.testing.assert_array_equal(mixed[1::2], black[1::2])
+        self.assertEqual(mixed.shape, (300, len(batch.FEATURE_NAMES)))
+
+    def test_mlp_evaluator(self):
+        mlp = batch.MLPEvaluator(hidden=8, seed=3)
+        values = mlp.evaluate_states(self.batch, Player.WHITE)
+        self.assertEqual(values.shape, (300,))
+        self.assertTrue(np.all(np.abs(values) < 1))
+        self.assertAlmostEqual(mlp(self.boards[5], Player.WHITE), values[5], places=6)
+        with self.assertRaises(ValueError):
+            batch.MLPEvaluator(w1=np.zeros((3, 4)))
+
+    def test_evaluate_plays(self):
+        board = Board()
+        board.__reset__()
+        plays, values = batch.evaluate_plays(board, Player.WHITE, (3, 1), batch.LinearEvaluator.race())
+        self.assertEqual(plays, legal_plays(board, Player.WHITE, (3, 1)))
+        self.assertEqual(values.shape, (len(plays),))
+
+    def test_search_uses_batch_scores(self):
+        board = self.boards[40]
+        plain = ExpectiminimaxSearch(race_evaluator).best_play(board, Player.WHITE, (6, 2), depth=2)
+        batched = ExpectiminimaxSearch(batch.LinearEvaluator.race()).best_play(board, Player.WHITE, (6, 2), depth=2)
+        self.assertEqual(plain[0], batched[0])
+        self.assertAlmostEqual(plain[1], batched[1], places=4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+import importlib.util
+import os
+import pickle
+import tempfile
+import unittest
+
+from backgammon.core.board import Board
+from backgammon.core.player import Player
+from backgammon.core.checker import Checker
+from backgammon.core.movegen import generate_plays
+from backgammon.ai import bearoff
+from backgammon.ai.bearoff import OneSidedBearoff
+from backgammon.ai import twosided
+from backgammon.ai.twosided import TwoSidedBearoff
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+
+def race_board(white_home, black_home):
+    """Tablero sin contacto: cada jugador solo tiene fichas en su home (el resto retiradas)."""
+    b = Board()
+    for i in range(24):
+        b.__points__[i] = []
+    for i, c in enumerate(white_home):
+        b.__points__[i] = [Checker(Player.WHITE)] * c
+    for i, c in enumerate(black_home):
+        b.__points__[23 - i] = [Checker(Player.BLACK)] * c
+    b.__borne__[Player.WHITE] = [Checker(Player.WHITE)] * (15 - sum(white_home))
+    b.__borne__[Player.BLACK] = [Checker(Player.BLACK)] * (15 - sum(black_home))
+    return b
+
+
+class TestBearoffDatabase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.tmp.name, "bearoff.db")
+        bearoff.write(cls.path, max_checkers=4)
+        cls.db = OneSidedBearoff(cls.path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.db.close()
+        cls.tmp.cleanup()
+
+    def test_index_is_a_bijection(self):
+        indexes = [bearoff.position_index(p, 4) for p in bearoff.positions(4)]
+        self.assertEqual(indexes, list(range(bearoff.position_count(4))))
+        with self.assertRaises(ValueError):
+            bearoff.position_index((5, 0, 0, 0, 0, 0), 4)
+
+    def test_plays_match_move_generator(self):
+        b = race_board((0, 2, 0, 1, 0, 1), (1, 0, 0, 0, 0, 0))
+        for dice in ((6, 5), (2, 1), (1, 1), (4, 4)):
+            expected = {bearoff.home_counts(Board.from_state(s), Player.WHITE)
+                        for _, s in generate_plays(b, Player.WHITE, dice)}
+            self.assertEqual(bearoff.plays((0, 2, 0, 1, 0, 1), dice), expected)
+
+    def test_known_values(self):
+        self.assertEqual(self.db.expected_rolls((0,) * 6), 0.0)
+        self.assertAlmostEqual(self.db.expected_rolls((1, 0, 0, 0, 0, 0)), 1.0)
+        #Una ficha a 6 pips: no sale en la primera tirada con 1-1, 1-2, 1-3, 1-4 o 2-3
+        self.assertAlmostEqual(self.db.expected_rolls((0, 0, 0, 0, 0, 1)), 1.25, places=6)
+        dist = self.db.distribution((0, 0, 0, 0, 0, 1))
+        self.assertAlmostEqual(dist[1], 27 / 36, places=4)
+        self.assertAlmostEqual(dist[2], 9 / 36, places=4)
+
+    def test_distributions_sum_to_one(self):
+        for pos in bearoff.positions(4):
+            self.assertAlmostEqual(sum(self.db.distribution(pos)), 1.0, places=3)
+            self.assertGreaterEqual(self.db.expected_rolls(pos), self.db.expected_rolls((0,) * 6))
+
+    def test_win_probability(self):
+        b = race_board((1, 0, 0, 0, 0, 0), (1, 0, 0, 0, 0, 0))
+        self.assertAlmostEqual(self.db.win_probability(b, Player.WHITE), 1.0, places=4)
+        b = race_board((0, 0, 0, 0, 0, 1), (1, 0, 0, 0, 0, 0))
+        self.assertAlmostEqual(self.db.win_probability(b, Player.WHITE), 27 / 36, places=4)
+        self.assertAlmostEqual(self.db.win_probability(b, Player.BLACK), 1.0, places=4)
+
+    def test_evaluator_falls_back_outside_the_database(self):
+        evaluate = self.db.evaluator(lambda board, player: 0.123)
+        self.assertEqual(evaluate(Board(), Player.WHITE), 0.123)
+        b = race_board((1, 0, 0, 0, 0, 0), (1, 0, 0, 0, 0, 0))
+        self.assertAlmostEqual(evaluate(b, Player.WHITE), 1.0, places=3)
+        self.assertFalse(self.db.covers(race_board((2, 2, 1, 0, 0, 0), (1,) + (0,) * 5), Player.WHITE))
+
+    def test_pickle_remaps_the_file(self):
+        clone = pickle.loads(pickle.dumps(self.db))
+        try:
+            self.assertEqual(len(clone), len(self.db))
+            self.assertEqual(clone.expected_rolls((0, 1, 2, 0, 0, 0)),
+                             self.db.expected_rolls((0, 1, 2, 0, 0, 0)))
+        finally:
+            clone.close()
+
+    def test_rejects_invalid_file(self):
+        bad = os.path.join(self.tmp.name, "bad.db")
+        with open(bad, "wb") as f:
+            f.write(b"not a database at all")
+        with self.assertRaises(ValueError):
+            OneSidedBearoff(bad)
+
+
+@unittest.skipUnless(HAS_NUMPY, "requiere numpy")
+class TestTwoSidedBearoff(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.tmp.name, "twosided.db")
+        twosided.build(cls.path, max_checkers=3)
+        cls.db = TwoSidedBearoff(cls.path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.db.close()
+        cls.tmp.cleanup()
+
+    def test_known_values(self):
+        one = (1, 0, 0, 0, 0, 0)
+        six = (0, 0, 0, 0, 0, 1)
+        self.assertAlmostEqual(self.db.probability(one, six), 1.0, places=4)
+        self.assertAlmostEqual(self.db.probability(six, one), 27 / 36, places=4)
+        #Si no sale en la primera (9/36), el rival tampoco sale con 9/36
+        self.assertAlmostEqual(self.db.probability(six, six), 27 / 36 + (9 / 36) ** 2, places=4)
+
+    def test_loads_lazily(self):
+        db = TwoSidedBearoff(self.path)
+        self.assertFalse(db.loaded)
+        db.probability((0, 1, 0, 0, 0, 0), (1, 0, 0, 0, 0, 0))
+        self.assertTrue(db.loaded)
+        self.assertFalse(pickle.loads(pickle.dumps(db)).loaded)
+        db.close()
+
+    def test_parallel_build_is_identical(self):
+        path = os.path.join(self.tmp.name, "parallel.db")
+        twosided.build(path, max_checkers=3, workers=2, chunk_size=16)
+        with open(path, "rb") as a, open(self.path, "rb") as b:
+            self.assertEqual(a.read(), b.read())
+        self.assertFalse(os.path.exists(path + ".work"))
+
+    def test_evaluator(self):
+        evaluate = self.db.evaluator(lambda board, player: 0.5)
+        self.assertEqual(evaluate(Board(), Player.WHITE), 0.5)
+        b = race_board((0, 0, 0, 0, 0, 1), (1, 0, 0, 0, 0, 0))
+        self.assertAlmostEqual(evaluate(b, Player.WHITE), 2 * 27 / 36 - 1, places=3)
+        self.assertEqual(evaluate(race_board((4, 0, 0, 0, 0, 0), (1,) + (0,) * 5), Player.WHITE), 0.5)
+
+    def test_rejects_one_sided_file(self):
+        path = os.path.join(self.tmp.name, "one.db")
+        bearoff.write(path, max_checkers=2)
+        with self.assertRaises(ValueError):
+            TwoSidedBearoff(path).probability((0,) * 6, (0,) * 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,9 +2,10 @@
 
 import unittest
 
-from backgammon.core.board import Board
+from backgammon.core.board import Board, MoveStatus
 from backgammon.core.player import Player
 from backgammon.core.checker import Checker
+from backgammon.core import zobrist
 from backgammon.core.exceptions import (
     PointBlocked, NoCheckerAtPoint, MustEnterFromBar, EntryBlocked, BearOffNotAllowed
 )
@@ -237,5 +238,158 @@ class TestBoard(unittest.TestCase):
         self.assertIn("BAR:", txt)
         self.assertIn("BORNE:", txt)
 
+    def test_compact_state_signed_counts(self):
+        b = Board()
+        b.__reset__()
+        self.assertEqual(len(b.state), 28)
+        self.assertEqual(b.state[5], 5 * Player.WHITE.value)
+        self.assertEqual(b.state[0], 2 * Player.BLACK.value)
+        self.assertEqual(b.bar_count(Player.WHITE), 0)
+        self.assertEqual(b.borne_count(Player.BLACK), 0)
+
+    def test_copy_is_independent(self):
+        clone = self.b.copy()
+        self.assertTrue(clone.same_position(self.b))
+        self.assertNotEqual(clone, self.b)   #== es por identidad
+        clone.move(Player.WHITE, 5, 1)
+        self.assertEqual(self.b.count_at(5), 5)
+        self.assertEqual(clone.count_at(5), 4)
+        self.assertFalse(clone.same_position(self.b))
+        self.assertEqual(len({clone, self.b}), 2)
+
+    def test_from_state_roundtrip_and_size_check(self):
+        clone = Board.from_state(list(self.b.state))
+        self.assertTrue(clone.same_position(self.b))
+        with self.assertRaises(ValueError):
+            Board.from_state([0] * 10)
+
+    def test_list_views_write_back_to_state(self):
+        self.b.__bar__[Player.BLACK].append(Checker(Player.BLACK))
+        self.assertEqual(self.b.bar_count(Player.BLACK), 1)
+        popped = self.b.__points__[5].pop()
+        self.assertIs(popped.owner, Player.WHITE)
+        self.assertEqual(self.b.count_at(5), 4)
+
+    def test_failed_move_leaves_state_untouched(self):
+        self.b.__points__[4] = [Checker(Player.BLACK), Checker(Player.BLACK)]
+        before = list(self.b.state)
+        with self.assertRaises(PointBlocked):
+            self.b.move(Player.WHITE, 5, 1)
+        self.assertEqual(list(self.b.state), before)
+
+    def test_zobrist_hash_updated_incrementally(self):
+        self.b.move(Player.WHITE, 5, 1)
+        self.b.__points__[3] = [Checker(Player.BLACK)]
+        self.b.move(Player.WHITE, 7, 4)
+        self.assertEqual(self.b.bar_count(Player.BLACK), 1)
+        self.assertEqual(self.b.zobrist_hash(), zobrist.compute_hash(self.b.state))
+
+    def test_zobrist_same_position_same_hash(self):
+        other = self.b.copy()
+        self.b.move(Player.WHITE, 12, 3)
+        self.b.move(Player.WHITE, 9, 2)
+        other.move(Player.WHITE, 12, 2)
+        other.move(Player.WHITE, 10, 3)
+        self.assertEqual(self.b.zobrist_hash(), other.zobrist_hash())
+        self.assertEqual(self.b.position_key(), other.position_key())
+
+    def test_zobrist_side_to_move(self):
+        self.assertNotEqual(self.b.zobrist_hash(Player.WHITE), self.b.zobrist_hash(Player.BLACK))
+        self.assertNotEqual(self.b.position_key(Player.WHITE), self.b.position_key(Player.BLACK))
+        self.assertEqual(len({self.b.position_key(Player.WHITE): 1}), 1)
+
+    def test_check_move_status_codes_without_mutation(self):
+        before = list(self.b.state)
+        self.assertIs(self.b.check_move(Player.WHITE, 5, 1), MoveStatus.OK)
+        self.assertIs(self.b.check_move(Player.WHITE, 6, 1), MoveStatus.NO_CHECKER)
+        self.assertIs(self.b.check_move(Player.WHITE, 24, 1), MoveStatus.INVALID_INDEX)
+        self.assertIs(self.b.check_move(Player.WHITE, None, 1), MoveStatus.MUST_ENTER_FROM_BAR)
+        self.assertIs(self.b.check_move(Player.WHITE, 12, 1), MoveStatus.POINT_BLOCKED)
+        self.assertIs(self.b.check_move(Player.WHITE, 5, 6), MoveStatus.BEAR_OFF_NOT_ALLOWED)
+        self.assertIs(self.b.check_move(Player.WHITE, 7, 2), MoveStatus.STACK_FULL)
+        self.assertEqual(list(self.b.state), before)
+
+    def test_check_move_entry_blocked(self):
+        self.b.__bar__[Player.WHITE] = [Checker(Player.WHITE)]
+        self.assertIs(self.b.check_move(Player.WHITE, 5, 1), MoveStatus.MUST_ENTER_FROM_BAR)
+        self.b.__points__[0] = [Checker(Player.BLACK), Checker(Player.BLACK)]
+        self.assertIs(self.b.check_move(Player.WHITE, None, 1), MoveStatus.ENTRY_BLOCKED)
+        self.assertFalse(self.b.is_legal(Player.WHITE, None, 1))
+        self.assertTrue(self.b.is_legal(Player.WHITE, None, 2))
+
+    def test_check_move_invalid_die(self):
+        for die in (0, -1):
+            self.assertIs(self.b.check_move(Player.WHITE, 5, die), MoveStatus.INVALID_DIE)
+            self.assertIs(self.b.check_move(Player.BLACK, None, die), MoveStatus.INVALID_DIE)
+        with self.assertRaises(ValueError):
+            self.b.move(Player.WHITE, 5, 0)
+
+    def test_try_move_applies_only_when_ok(self):
+        before = list(self.b.state)
+        self.assertIs(self.b.try_move(Player.WHITE, 12, 1), MoveStatus.POINT_BLOCKED)
+        self.assertEqual(list(self.b.state), before)
+        self.assertIs(self.b.try_move(Player.WHITE, 5, 1), MoveStatus.OK)
+        self.assertEqual(self.b.count_at(4), 1)
+
+    def test_initial_pip_counts_and_counters(self):
+        self.assertEqual(self.b.pip_count(Player.WHITE), 167)
+        self.assertEqual(self.b.pip_count(Player.BLACK), 167)
+        self.assertEqual(self.b.checkers_on_board(Player.WHITE), 15)
+        self.assertEqual(self.b.checkers_outside_home(Player.WHITE), 10)
+        self.assertEqual(self.b.checkers_outside_home(Player.BLACK), 10)
+
+    def test_counters_follow_moves_hits_and_bear_off(self):
+        self.b.__points__[3] = [Checker(Player.BLACK)]
+        self.b.move(Player.WHITE, 5, 2)
+        self.assertEqual(self.b.pip_count(Player.WHITE), 165)
+        self.assertEqual(self.b.bar_count(Player.BLACK), 1)
+        fresh = Board.from_state(self.b.state)
+        for player in (Player.WHITE, Player.BLACK):
+            self.assertEqual(self.b.pip_count(player), fresh.pip_count(player))
+            self.assertEqual(self.b.checkers_outside_home(player), fresh.checkers_outside_home(player))
+            self.assertEqual(self.b.checkers_on_board(player), fresh.checkers_on_board(player))
+
+    def test_can_bear_off_uses_outside_counter(self):
+        b = Board()
+        b.__points__[2] = [Checker(Player.WHITE)]
+        b.__points__[7] = [Checker(Player.WHITE)]
+        self.assertFalse(b.can_bear_off(Player.WHITE))
+        b.move(Player.WHITE, 7, 3)
+        self.assertEqual(b.checkers_outside_home(Player.WHITE), 0)
+        self.assertTrue(b.can_bear_off(Player.WHITE))
+        b.move(Player.WHITE, 4, 5)
+        self.assertEqual(b.checkers_on_board(Player.WHITE), 1)
+        self.assertEqual(b.pip_count(Player.WHITE), 3)
+
+    def test_undo_redo_restores_state_hash_and_counters(self):
+        self.b.__points__[3] = [Checker(Player.BLACK)]
+        start = self.b.copy()
+        self.b.move(Player.WHITE, 5, 2)   #golpe en 3
+        self.b.move(Player.BLACK, None, 4) #entra en 20
+        after = self.b.copy()
+        self.assertEqual(self.b.undo()[1], 25)
+        self.assertIsNotNone(self.b.undo())
+        self.assertIsNone(self.b.undo())
+        self.assertEqual(self.b.state, start.state)
+        self.assertEqual(self.b.zobrist_hash(), start.zobrist_hash())
+        self.assertEqual(self.b.pip_count(Player.BLACK), start.pip_count(Player.BLACK))
+        self.b.redo()
+        self.b.redo()
+        self.assertIsNone(self.b.redo())
+        self.assertEqual(self.b.state, after.state)
+        self.assertEqual(self.b.zobrist_hash(), after.zobrist_hash())
+
+    def test_undo_bear_off_and_new_move_clears_redo(self):
+        b = Board()
+        b.__points__[0] = [Checker(Player.WHITE)]
+        b.move(Player.WHITE, 0, 3)
+        self.assertEqual(b.borne_count(Player.WHITE), 1)
+        b.undo()
+        self.assertEqual(b.borne_count(Player.WHITE), 0)
+        self.assertEqual(b.count_at(0), 1)
+        b.move(Player.WHITE, 0, 1)
+        self.assertEqual(b.redo_length, 0)
+        self.assertEqual(b.journal_length, 1)
+
 if __name__ == "__main__":
     unittest.main()
@@ -2,6 +2,8 @@
 import builtins
 import re
 import random 
+import sys
+import types
 import pytest
 from unittest.mock import MagicMock, ANY
 
@@ -431,6 +433,70 @@ def test_pass_con_error_de_juego(monkeypatch, capsys):
     assert "[ERROR] La partida ya terminó." in out
 
 
+# --------------------------
+# rollout
+# --------------------------
+
+def _start_and_draw(cli: CLI, monkeypatch):
+    """Inicia y resuelve el sorteo (gana WHITE) sin tirar los dados del turno."""
+    cli._players_configured = True
+    cli.game.start()
+    dice_sequence = iter([6, 1])
+    monkeypatch.setattr(random, "randint", lambda a, b: next(dice_sequence))
+    cli.cmd_roll([])
+
+
+def test_rollout_requisitos(monkeypatch, capsys):
+    cli = CLI()
+    cli.cmd_rollout([])
+    assert "La partida no está iniciada" in capsys.readouterr().out
+
+    cli._players_configured = True
+    cli.game.start()
+    cli.cmd_rollout([])
+    assert "Primero resolvé el sorteo inicial" in capsys.readouterr().out
+
+    cli_rolled = CLI()
+    _setup_and_roll(cli_rolled, monkeypatch, capsys, (3, 1))
+    cli_rolled.cmd_rollout([])
+    assert "El rollout se hace antes de tirar los dados." in capsys.readouterr().out
+
+
+def test_rollout_argumentos_invalidos(monkeypatch, capsys):
+    cli = CLI()
+    _start_and_draw(cli, monkeypatch)
+    capsys.readouterr()
+
+    cli.cmd_rollout(["muchas"])
+    assert "Uso: rollout [pruebas]" in capsys.readouterr().out
+    for trials in ("1", "0", "-5"):
+        cli.cmd_rollout([trials])
+        assert "Hacen falta al menos 2 pruebas." in capsys.readouterr().out
+
+
+def test_rollout_sin_numpy(monkeypatch, capsys):
+    cli = CLI()
+    _start_and_draw(cli, monkeypatch)
+    capsys.readouterr()
+
+    monkeypatch.setitem(sys.modules, "backgammon.ai.rollout", None)  #El import falla
+    cli.cmd_rollout([])
+    assert "El rollout necesita numpy instalado." in capsys.readouterr().out
+
+
+def test_rollout_ok(monkeypatch, capsys):
+    cli = CLI()
+    _start_and_draw(cli, monkeypatch)
+    capsys.readouterr()
+
+    rollout = MagicMock()
+    rollout.return_value.run.return_value = "Equity +0.123"
+    monkeypatch.setitem(sys.modules, "backgammon.ai.rollout", types.SimpleNamespace(Rollout=rollout))
+    cli.cmd_rollout(["64"])
+    assert "Equity +0.123" in capsys.readouterr().out
+    rollout.return_value.run.assert_called_once_with(cli.game.board, Player.WHITE, trials=64)
+
+
 # --------------------------
 # board / status / help / exit
 # --------------------------
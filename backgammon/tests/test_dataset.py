@@ -0,0 +1,110 @@
+import importlib.util
+import json
+import os
+import tempfile
+import unittest
+
+from backgammon.core.player import Player
+from backgammon.tests.test_batch import random_positions
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+if HAS_NUMPY:
+    import numpy as np
+    from backgammon.ai.batch import LinearEvaluator, as_batch
+    from backgammon.ai.encoding import INPUTS, encode_batch
+    from backgammon.selfplay.dataset import MANIFEST, ShardReader, ShardWriter, record_selfplay
+    from backgammon.selfplay.lockstep import LockstepSimulator, EvaluatorBatchPolicy, RandomBatchPolicy
+
+
+@unittest.skipUnless(HAS_NUMPY, "requiere numpy")
+class TestShards(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "data")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_numbers(self, rows, shard_size, parts=3):
+        inputs = np.arange(rows * 4, dtype=np.float32).reshape(rows, 4)
+        targets = np.arange(rows * 2, dtype=np.float32).reshape(rows, 2) * -1
+        with ShardWriter(self.path, targets=2, inputs=4, shard_size=shard_size) as writer:
+            for chunk in np.array_split(np.arange(rows), parts):
+                writer.write(inputs[chunk], targets[chunk])
+            self.assertEqual(writer.rows, rows)
+        return inputs, targets
+
+    def test_roundtrip_across_shards(self):
+        inputs, targets = self.write_numbers(250, shard_size=100)
+        reader = ShardReader(self.path)
+        self.assertEqual(len(reader), 250)
+        self.assertEqual([s["rows"] for s in reader.manifest["shards"]], [100, 100, 50])
+        last = np.load(os.path.join(self.path, reader.manifest["shards"][-1]["inputs"]))
+        self.assertEqual(last.shape, (50, 4))  #El ultimo shard queda recortado
+        read_x = np.concatenate([x for x, _ in reader.shards()])
+        read_y = np.concatenate([y for _, y in reader.shards()])
+        np.testing.assert_array_equal(read_x, inputs)
+        np.testing.assert_array_equal(read_y, targets)
+
+    def test_ordered_batches_are_views(self):
+        inputs, _ = self.write_numbers(250, shard_size=100)
+        batches = list(ShardReader(self.path).batches(30))
+        self.assertEqual([len(x) for x, _ in batches], [30, 30, 30, 10] * 2 + [30, 20])
+        self.assertIsInstance(batches[0][0].base, np.memmap)
+        np.testing.assert_array_equal(np.concatenate([x for x, _ in batches]), inputs)
+
+    def test_shuffled_batches_cover_everything_once(self):
+        inputs, targets = self.write_numbers(250, shard_size=100)
+        batches = list(ShardReader(self.path).batches(32, shuffle_buffer=64, seed=1))
+        self.assertTrue(all(len(x) == 32 for x, _ in batches[:-1]))
+        read_x = np.concatenate([x for x, _ in batches])
+        read_y = np.concatenate([y for _, y in batches])
+        self.assertEqual(len(read_x), 250)
+        np.testing.assert_array_equal(read_y[:, 0], -read_x[:, 0] / 2)  #Filas enteras juntas
+        self.assertFalse((read_x == inputs).all())
+        np.testing.assert_array_equal(np.sort(read_x[:, 0]), inputs[:, 0])
+
+    def test_manifest_survives_without_close(self):
+        writer = ShardWriter(self.path, inputs=4, shard_size=10)
+        writer.write(np.ones((25, 4)), np.zeros(25))
+        with open(os.path.join(self.path, MANIFEST)) as f:
+            self.assertEqual(json.load(f)["rows"], 20)
+        writer.close()
+        with self.assertRaises(ValueError):
+            writer.write(np.ones((1, 4)), np.zeros(1))
+        with self.assertRaises(FileExistsError):
+            ShardWriter(self.path)
+
+    def test_shape_errors(self):
+        with ShardWriter(self.path, inputs=4) as writer:
+            with self.assertRaises(ValueError):
+                writer.write(np.ones((3, 5)), np.zeros(3))
+            with self.assertRaises(ValueError):
+                writer.write(np.ones((3, 4)), np.zeros(2))
+
+    def test_write_positions_encodes_in_place(self):
+        boards = random_positions(40, seed=3)
+        signs = np.array([(Player.WHITE if k % 2 else Player.BLACK).value for k in range(40)])
+        with ShardWriter(self.path, shard_size=16) as writer:
+            writer.write_positions(boards, signs, np.arange(40))
+        x, y = zip(*ShardReader(self.path).shards())
+        np.testing.assert_array_equal(np.concatenate(x), encode_batch(as_batch(boards), signs))
+        np.testing.assert_array_equal(np.concatenate(y)[:, 0], np.arange(40))
+
+
+@unittest.skipUnless(HAS_NUMPY, "requiere numpy")
+class TestRecordSelfPlay(unittest.TestCase):
+    def test_records_positions_with_outcomes(self):
+        simulator = LockstepSimulator(EvaluatorBatchPolicy(LinearEvaluator.race()), RandomBatchPolicy(0))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "selfplay")
+            with ShardWriter(path, shard_size=500) as writer:
+                rows = record_selfplay(writer, simulator, games=30, seed=4, chunk=12)
+            reader = ShardReader(path)
+            self.assertEqual(len(reader), rows)
+            self.assertGreater(rows, 30 * 20)
+            targets = np.concatenate([y for _, y in reader.shards()])[:, 0]
+            self.assertTrue(set(np.unique(np.abs(targets))) <= {1.0, 2.0, 3.0})
+            inputs = next(reader.shards())[0]
+            self.assertEqual(inputs.shape[1], INPUTS)
+            self.assertAlmostEqual(float(inputs[0, 196]), 1.67, places=5)  #Posicion inicial: 167 pips
@@ -1,7 +1,11 @@
 import unittest
 from unittest.mock import patch
 import random
-from backgammon.core.dice import Dice
+import importlib.util
+from backgammon.core.dice import Dice, ScriptedRolls
+from backgammon.core.exceptions import DiceScriptExhausted
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
 
 
 class TestDice (unittest.TestCase):
@@ -73,6 +77,66 @@ class TestDice (unittest.TestCase):
         self.assertEqual(str(d), "Falta tirar")
         self.assertFalse(d. is_double())
 
+    def test_injected_rng_is_used(self):
+        """Los dados usan el generador inyectado en lugar del modulo random global"""
+        a = Dice(random.Random(42))
+        b = Dice(random.Random(42))
+        self.assertEqual([a.roll() for _ in range(5)], [b.roll() for _ in range(5)])
+        a.set_rng(None)
+        self.assertIs(a.rng, random)
+
+    def test_seed_makes_rolls_reproducible(self):
+        """Dos dados con la misma semilla tiran lo mismo"""
+        a, b = Dice(seed=3), Dice(seed=3)
+        self.assertEqual([a.roll() for _ in range(10)], [b.roll() for _ in range(10)])
+        a.seed(3)
+        b.seed(3)
+        self.assertEqual(a.roll(), b.roll())
+
+    def test_seed_rejects_scripted_source(self):
+        """Los dados con secuencia fija no se pueden sembrar"""
+        d = Dice.scripted([(3, 1), (6, 6)])
+        with self.assertRaises(ValueError):
+            d.seed(3)
+        self.assertEqual(d.roll(), [3, 1])
+
+    def test_scripted_dice_replay_sequence(self):
+        """Los dados con secuencia fija devuelven esas tiradas y luego fallan"""
+        d = Dice.scripted([(3, 1), (6, 6)])
+        self.assertEqual(d.roll(), [3, 1])
+        self.assertEqual(d.roll(), [6, 6])
+        self.assertTrue(d.is_double())
+        with self.assertRaises(DiceScriptExhausted):
+            d.roll()
+
+    def test_scripted_loop_and_validation(self):
+        d = Dice(source=ScriptedRolls([(2, 5)], loop=True))
+        self.assertEqual(d.draw(), (2, 5))
+        self.assertEqual(d.draw(), (2, 5))
+        self.assertEqual(d.values, (0, 0))
+        with self.assertRaises(ValueError):
+            ScriptedRolls([(0, 7)])
+
+    @unittest.skipUnless(HAS_NUMPY, "requiere numpy")
+    def test_batched_dice_reproducible_across_blocks(self):
+        """Los dados por bloques con semilla son reproducibles al pasar de un bloque al siguiente"""
+        a = Dice.batched(seed=5, block_size=7)
+        b = Dice.batched(seed=5, block_size=7)
+        rolls = [a.roll() for _ in range(20)]
+        self.assertEqual(rolls, [b.roll() for _ in range(20)])
+        self.assertTrue(all(1 <= v <= 6 for r in rolls for v in r))
+        self.assertTrue(all(isinstance(v, int) for v in rolls[0]))
+
+    @unittest.skipUnless(HAS_NUMPY, "requiere numpy")
+    def test_batched_take_continues_stream(self):
+        d = Dice.batched(seed=1, block_size=4)
+        ref = Dice.batched(seed=1, block_size=4)
+        d.roll()
+        block = d.source.take(6)
+        self.assertEqual(block.shape, (6, 2))
+        expected = [ref.roll() for _ in range(7)][1:]
+        self.assertEqual(block.tolist(), expected)
+
 if __name__ == "__main__":
     unittest.main()
                          
\ No newline at end of file
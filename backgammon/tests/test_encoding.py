@@ -0,0 +1,78 @@
+import importlib.util
+import unittest
+
+from backgammon.core.board import Board
+from backgammon.core.player import Player
+from backgammon.tests.test_batch import random_positions
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+if HAS_NUMPY:
+    import numpy as np
+    from backgammon.ai.batch import as_batch
+    from backgammon.ai.encoding import INPUTS, BatchEncoder, encode, encode_batch
+
+
+def reference(board: Board, player: Player) -> list:
+    """Codificacion recorriendo el tablero punto por punto."""
+    opponent = Player.BLACK if player is Player.WHITE else Player.WHITE
+    values = []
+    for side in (player, opponent):
+        for k in range(24):
+            idx = k if player is Player.WHITE else 23 - k
+            n = board.count_at(idx) if board.owner_at(idx) is side else 0
+            values += [n >= 1, n >= 2, n >= 3, max(n - 3, 0) / 2]
+    values += [board.bar_count(player) / 2, board.bar_count(opponent) / 2]
+    values += [board.borne_count(player) / 15, board.borne_count(opponent) / 15]
+    values += [board.pip_count(player) / 100, board.pip_count(opponent) / 100]
+    return values
+
+
+@unittest.skipUnless(HAS_NUMPY, "requiere numpy")
+class TestEncoding(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.boards = random_positions(150, seed=11)
+
+    def test_matches_reference(self):
+        for player in (Player.WHITE, Player.BLACK):
+            encoded = encode_batch(self.boards, player)
+            self.assertEqual(encoded.shape, (len(self.boards), INPUTS))
+            self.assertEqual(encoded.dtype, np.float32)
+            for k, board in enumerate(self.boards):
+                np.testing.assert_allclose(encoded[k], reference(board, player), rtol=1e-6)
+
+    def test_per_row_players(self):
+        signs = np.array([(Player.WHITE if k % 3 else Player.BLACK).value for k in range(len(self.boards))])
+        mixed = encode_batch(self.boards, signs)
+        for k, board in enumerate(self.boards):
+            player = Player.WHITE if signs[k] < 0 else Player.BLACK
+            np.testing.assert_array_equal(mixed[k], encode(board, player))
+
+    def test_mirror_has_same_encoding(self):
+        board = self.boards[3]
+        mirror = Board()
+        for i in range(24):
+            mirror.state[23 - i] = -board.state[i]
+        mirror.state[24], mirror.state[25] = board.state[25], board.state[24]
+        mirror.state[26], mirror.state[27] = board.state[27], board.state[26]
+        np.testing.assert_array_equal(encode(board, Player.WHITE), encode(mirror, Player.BLACK))
+
+    def test_writes_into_preallocated_buffer(self):
+        out = np.full((len(self.boards), INPUTS), np.nan, dtype=np.float32)
+        result = encode_batch(as_batch(self.boards), Player.WHITE, out)
+        self.assertIs(result, out)
+        self.assertFalse(np.isnan(out).any())
+        single = np.empty(INPUTS, dtype=np.float32)
+        self.assertIs(encode(self.boards[0], Player.WHITE, single), single)
+        np.testing.assert_array_equal(single, out[0])
+        with self.assertRaises(ValueError):
+            encode_batch(self.boards, Player.WHITE, np.empty((2, INPUTS), dtype=np.float32))
+
+    def test_batch_encoder_reuses_buffer(self):
+        encoder = BatchEncoder(capacity=100)
+        first = encoder.encode(self.boards[:50], Player.BLACK)
+        second = encoder.encode(self.boards[50:100], Player.BLACK)
+        self.assertTrue(np.shares_memory(first, second))
+        np.testing.assert_array_equal(second, encode_batch(self.boards[50:100], Player.BLACK))
+        encoder.encode(self.boards, Player.BLACK)
+        self.assertEqual(encoder.capacity, len(self.boards))
@@ -0,0 +1,44 @@
+import unittest
+
+from backgammon.core.events import EventKind, EventLog, format_event
+from backgammon.core.player import Player
+
+
+class TestEventLog(unittest.TestCase):
+    def test_events_are_small_tuples(self):
+        log = EventLog()
+        log.append(EventKind.ROLL, Player.BLACK, 6, 4)
+        log.append(EventKind.START)
+        self.assertEqual(list(log), [(EventKind.ROLL, 1, 6, 4, 0), (EventKind.START, 0, 0, 0, 0)])
+        self.assertEqual(list(log.lines()), ["BLACK roll: 6-4", "Game: Start (esperando sorteo con 'roll')"])
+
+    def test_formatting(self):
+        cases = [
+            ((EventKind.RESET, 0, 0, 0, 0), "Game:Reset"),
+            ((EventKind.PLAYERS, 0, "Ana", "Beto", 0), "Jugadores: WHITE=Ana / BLACK=Beto"),
+            ((EventKind.DRAW, -1, 5, 2, 0), "Draw: WHITE 5 vs BLACK 2 -> WHITE starts"),
+            ((EventKind.MOVE, 1, -1, 3, 4), "BLACK move: bar -> 3 (4)"),
+            ((EventKind.MOVE, -1, 12, 7, 5), "WHITE move: 12 -> 7 (5)"),
+            ((EventKind.BEAR_OFF, -1, 2, 0, 6), "WHITE retira desde 2 (6)"),
+            ((EventKind.PASS, 1, 0, 0, 0), "Turno: Ahora juega BLACK"),
+            ((EventKind.LOADED, 0, 0, 0, 0), "Game: Posicion cargada"),
+        ]
+        for event, text in cases:
+            self.assertEqual(format_event(event), text)
+
+    def test_ring_buffer(self):
+        log = EventLog(maxlen=2)
+        for die in range(1, 6):
+            log.append(EventKind.ROLL, Player.WHITE, die, die)
+        self.assertEqual(len(log), 2)
+        self.assertEqual(log.maxlen, 2)
+        self.assertEqual(log.dropped, 3)
+        self.assertEqual([event[2] for event in log], [4, 5])
+        log.clear()
+        self.assertEqual((len(log), log.dropped), (0, 0))
+        with self.assertRaises(ValueError):
+            EventLog(maxlen=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
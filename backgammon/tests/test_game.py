@@ -71,7 +71,7 @@ class TesteGame(unittest.TestCase):
     
     def test_start_sets_current_player_and_prevents_restart(self):
         g = Game()
-        with patch("backgammon.core.game.random.randint", side_effect=[6, 1]):
+        with patch("random.randint", side_effect=[6, 1]):
             g.start()
             g.roll() 
         assert g.started is True
@@ -84,14 +84,14 @@ class TesteGame(unittest.TestCase):
         g = Game()
         with self.assertRaises(GameNotStrated):
             g.roll()
-        with patch("backgammon.core.game.random.randint", side_effect=[6, 1]):
+        with patch("random.randint", side_effect=[6, 1]):
             g.start()
         with self.assertRaises(DiceNotRolled):
             g.pass_turn()
 
     def test_roll_raises_if_game_finished(self):
         g = Game()
-        with patch("backgammon.core.game.random.randint", side_effect=[6, 1]):
+        with patch("random.randint", side_effect=[6, 1]):
             g.start()
         g.board.__borne__[Player.WHITE] = [object()] * 15
         g.check_game_over()
@@ -103,14 +103,14 @@ class TesteGame(unittest.TestCase):
         g = Game()
         with self.assertRaises(GameNotStrated):
             g.pass_turn()
-        with patch("backgammon.core.game.random.randint", side_effect=[6, 1]):
+        with patch("random.randint", side_effect=[6, 1]):
             g.start()
         with self.assertRaises(DiceNotRolled):
             g.pass_turn()
 
     def test_pass_turn_switches_player_and_resets_dice(self):
         g = Game()
-        with patch("backgammon.core.game.random.randint", side_effect=[6, 1]):
+        with patch("random.randint", side_effect=[6, 1]):
             g.start()
         first = g.current_player
         g.dice.__values__ = [4, 3]
@@ -127,7 +127,7 @@ class TesteGame(unittest.TestCase):
 
     def test_str_shows_winner_when_game_over(self):
         g = Game()
-        with patch("backgammon.core.game.random.randint", side_effect=[6, 1]):
+        with patch("random.randint", side_effect=[6, 1]):
             g.start()
         g.board.__borne__[Player.WHITE] = [object()] * 15
         g.check_game_over()
@@ -137,7 +137,7 @@ class TesteGame(unittest.TestCase):
 
     def test_start_tie_then_black_starts(self):
         g = Game()
-        with patch("backgammon.core.game.random.randint", side_effect=[3, 3, 1, 6]):
+        with patch("random.randint", side_effect=[3, 3, 1, 6]):
             g.start()
             g.roll()
         self.assertTrue(g.started)
@@ -146,14 +146,14 @@ class TesteGame(unittest.TestCase):
 
     def test_strat_again_raises(self):
         g = Game()
-        with patch("backgammon.core.game.random.randint", side_effect=[6, 1]):
+        with patch("random.randint", side_effect=[6, 1]):
             g.start()
         with self.assertRaises(GameAlredyStarted):
             g.start()
         
     def test_str_shows_winner_black(self):
         g = Game()
-        with patch("backgammon.core.game.random.randint", side_effect=[6, 1]):
+        with patch("random.randint", side_effect=[6, 1]):
             g.start()  
         g.board.__borne__[Player.BLACK] = [Checker(Player.BLACK) for _ in range(15)]
         g.check_game_over()
@@ -163,7 +163,7 @@ class TesteGame(unittest.TestCase):
     
     def test_history_has_start_and_roll(self):
         g = Game()
-        with patch("backgammon.core.game.random.randint", side_effect=[6, 1, 4, 2]):
+        with patch("random.randint", side_effect=[6, 1, 4, 2]):
             g.start()
             g.roll() 
         self.assertTrue(any("Game: Start" in h for h in g.history()))
@@ -173,7 +173,7 @@ class TesteGame(unittest.TestCase):
         
     def test_roll_twice_raises_dice_already_rolled(self):
         g = Game()
-        with patch("backgammon.core.game.random.randint", side_effect=[6, 1]):
+        with patch("random.randint", side_effect=[6, 1]):
             g.start()
         g.__finished__ = True
         g.__dice__.reset()
@@ -189,7 +189,7 @@ class TesteGame(unittest.TestCase):
 
     def test_start_sets_white_when_white_is_higher(self):
         g = Game()
-        with patch("backgammon.core.game.random.randint", side_effect=[6, 1]):
+        with patch("random.randint", side_effect=[6, 1]):
             g.start()
             g.roll()
         assert g.current_player == Player.WHITE
@@ -197,7 +197,7 @@ class TesteGame(unittest.TestCase):
 
     def test_str_shows_winner_white(self):
         g = Game()
-        with patch("backgammon.core.game.random.randint", side_effect=[6, 1]):
+        with patch("random.randint", side_effect=[6, 1]):
             g.start()
         g.board.__borne__[Player.WHITE] = [object()] * 15
         g.check_game_over()
@@ -209,7 +209,7 @@ class TesteGame(unittest.TestCase):
         from unittest.mock import patch
 
         g = Game()
-        with patch("backgammon.core.game.random.randint", side_effect=[3, 3, 5, 2]):
+        with patch("random.randint", side_effect=[3, 3, 5, 2]):
             g.start()
             vals = g.roll()
             self.assertEqual(vals, [5, 2])
@@ -219,10 +219,10 @@ class TesteGame(unittest.TestCase):
         """Al pasar turno, el jugador debe alternar y los dados reiniciarse."""
         from unittest.mock import patch
         g = Game()
-        with patch("backgammon.core.game.random.randint", side_effect=[6, 1]):
+        with patch("random.randint", side_effect=[6, 1]):
             g.start()
             g.roll()
-        with patch("backgammon.core.game.random.randint", side_effect=[4, 2]):
+        with patch("random.randint", side_effect=[4, 2]):
             g.roll()
         first = g.current_player
         g.pass_turn()
@@ -231,12 +231,12 @@ class TesteGame(unittest.TestCase):
 
     def test_roll_twice_in_same_turn_raises(self):
         # Arranco y hago sorteo; luego tiro dados del turno y reintento tirar
-        with patch("backgammon.core.game.random.randint", side_effect=[6, 1]):
+        with patch("random.randint", side_effect=[6, 1]):
             g = Game()
             g.start()
             g.roll()  # sorteo inicial resuelto
 
-        with patch("backgammon.core.game.random.randint", side_effect=[4, 2]):
+        with patch("random.randint", side_effect=[4, 2]):
             vals = g.roll()
             self.assertEqual(len(vals), 2)
 
@@ -246,7 +246,7 @@ class TesteGame(unittest.TestCase):
 
     def test_pass_turn_when_finished_is_noop(self):
         # Termino el juego y luego pass_turn no debe cambiar nada
-        with patch("backgammon.core.game.random.randint", side_effect=[6, 1]):
+        with patch("random.randint", side_effect=[6, 1]):
             g = Game()
             g.start()
             # simulamos fin de juego
@@ -283,6 +283,153 @@ class TesteGame(unittest.TestCase):
         self.assertIn("falta sorteo", s)  # "Juega: — (falta sorteo)"
 
 
+    def test_undo_redo_moves_and_pass(self):
+        g = Game()
+        with patch("random.randint", side_effect=[6, 1]):
+            g.start()
+            g.roll()
+        with patch("backgammon.core.dice.random.randint", side_effect=[3, 1]):
+            g.roll()
+        initial = g.board.copy()
+        g.board.move(Player.WHITE, 7, 3)
+        g.board.move(Player.WHITE, 5, 1)
+        after_moves = g.board.copy()
+        g.pass_turn()
+        self.assertEqual(g.current_player, Player.BLACK)
+
+        self.assertTrue(g.undo())  #deshace el pase
+        self.assertEqual(g.current_player, Player.WHITE)
+        self.assertEqual(g.dice.values, (3, 1))
+        self.assertEqual(g.turn_count, 1)
+        self.assertTrue(g.undo())
+        self.assertTrue(g.undo())
+        self.assertFalse(g.undo())
+        self.assertEqual(g.board.state, initial.state)
+
+        self.assertTrue(g.redo())
+        self.assertTrue(g.redo())
+        self.assertEqual(g.board.state, after_moves.state)
+        self.assertTrue(g.redo())
+        self.assertEqual(g.current_player, Player.BLACK)
+        self.assertFalse(g.redo())
+
+    def test_undo_winning_move_reopens_game(self):
+        g = Game()
+        g.start()
+        g.board.__points__ = [[] for _ in range(24)]
+        g.board.__borne__[Player.WHITE] = [Checker(Player.WHITE) for _ in range(14)]
+        g.board.__points__[0] = [Checker(Player.WHITE)]
+        g.board.move(Player.WHITE, 0, 1)
+        g.check_game_over()
+        self.assertTrue(g.finished)
+        g.undo()
+        self.assertFalse(g.finished)
+        self.assertIsNone(g.winner)
+        g.redo()
+        self.assertTrue(g.finished)
+
+    def test_win_points_single_gammon_backgammon(self):
+        g = Game()
+        g.start()
+        self.assertEqual(g.win_points(), 0)
+        g.board.__points__ = [[] for _ in range(24)]
+        g.board.__borne__[Player.WHITE] = [Checker(Player.WHITE) for _ in range(15)]
+        g.board.__points__[20] = [Checker(Player.BLACK)] * 5
+        g.board.__borne__[Player.BLACK] = [Checker(Player.BLACK)]
+        g.check_game_over()
+        self.assertEqual(g.win_points(), 1)
+        g.board.__borne__[Player.BLACK] = []
+        self.assertEqual(g.win_points(), 2)
+        g.board.__points__[2] = [Checker(Player.BLACK)]
+        self.assertEqual(g.win_points(), 3)
+
+    def test_no_history_when_disabled(self):
+        g = Game(record_history=False)
+        g.start()
+        g.roll()
+        self.assertEqual(g.history(), [])
+
+    def test_opening_draw_uses_injected_rng(self):
+        import random
+        g1 = Game(rng=random.Random(9))
+        g2 = Game(rng=random.Random(9))
+        for g in (g1, g2):
+            g.start()
+        self.assertEqual(g1.roll(), g2.roll())
+        self.assertEqual(g1.roll(), g2.roll())
+
+    def test_injected_scripted_dice_drive_opening_and_turns(self):
+        from backgammon.core.dice import Dice
+        g = Game(dice=Dice.scripted([(2, 2), (1, 5), (4, 3)]))
+        g.start()
+        self.assertEqual(g.roll(), [1, 5])
+        self.assertEqual(g.current_player, Player.BLACK)
+        self.assertEqual(g.roll(), [4, 3])
+
+    def test_move_records_move_hit_and_bear_off(self):
+        from backgammon.core.dice import Dice
+        from backgammon.core.events import EventKind
+        g = Game(dice=Dice.scripted([(5, 2), (3, 1)]))
+        g.start()
+        g.roll()
+        g.roll()
+        g.board.__set_slot__(4, Player.BLACK.value)
+        g.move(7, 3)
+        kinds = [event[0] for event in g.events()]
+        self.assertEqual(kinds[-2:], [EventKind.MOVE, EventKind.HIT])
+        self.assertEqual(list(g.events())[-2], (EventKind.MOVE, Player.WHITE.value, 7, 4, 3))
+        self.assertEqual(g.history()[-1], "WHITE golpea en 4")
+
+        state = [0] * 28
+        state[0], state[26], state[23] = -1, 14, 15
+        g.load_position(state, Player.WHITE, (1, 2))
+        g.move(0, 1)
+        g.check_game_over()
+        self.assertEqual([e[0] for e in g.events()][-2:], [EventKind.BEAR_OFF, EventKind.GAME_OVER])
+        self.assertEqual(g.history()[-1], "Game: Terminó, (Winner WHITE)")
+        with self.assertRaises(GameFinished):
+            g.move(0, 1)
+
+    def test_move_requires_started_game(self):
+        with self.assertRaises(GameNotStrated):
+            Game().move(5, 1)
+
+    def test_move_requires_player_on_roll_and_rolled_dice(self):
+        from backgammon.core.dice import Dice
+        from backgammon.core.exceptions import DiceNotRolled
+        g = Game(dice=Dice.scripted([(5, 2), (3, 1)]))
+        g.start()
+        with self.assertRaises(DiceNotRolled):   #Falta el sorteo: no hay jugador en turno
+            g.move(7, 3)
+        g.roll()
+        with self.assertRaises(DiceNotRolled):   #Ya hay jugador pero no tiro
+            g.move(7, 3)
+        self.assertEqual(g.board.journal_length, 0)
+
+    def test_move_die_must_be_rolled(self):
+        from backgammon.core.dice import Dice
+        from backgammon.core.exceptions import IllegalMoves
+        g = Game(dice=Dice.scripted([(5, 2), (3, 1)]))
+        g.start()
+        g.roll()
+        g.roll()
+        with self.assertRaises(IllegalMoves):
+            g.move(7, 6)
+        self.assertEqual(g.board.journal_length, 0)
+        g.move(7, 3)
+
+    def test_history_limit_keeps_latest_events(self):
+        from backgammon.core.dice import Dice
+        g = Game(dice=Dice.scripted([(1, 2)], loop=True), history_limit=3)
+        g.start()
+        g.roll()
+        for _ in range(5):
+            g.roll()
+            g.pass_turn()
+        self.assertEqual(len(g.history()), 3)
+        self.assertEqual(g.event_log.dropped, 9)
+        self.assertTrue(g.history()[-1].startswith("Turno: Ahora juega"))
+
 if __name__ == "__main__":
     unittest.main()
         
\ No newline at end of file
@@ -0,0 +1,125 @@
+import importlib.util
+import itertools
+import unittest
+
+from backgammon.core.board import Board, MoveStatus
+from backgammon.core.game import Game
+from backgammon.core.player import Player
+from backgammon.core.movegen import generate_plays
+from backgammon.tests.test_batch import random_positions
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+if HAS_NUMPY:
+    import numpy as np
+    from backgammon.ai.batch import LinearEvaluator, as_batch
+    from backgammon.selfplay.lockstep import (
+        LockstepSimulator, RandomBatchPolicy, EvaluatorBatchPolicy, legal_sources, apply_moves, BAR_SOURCE,
+    )
+
+
+@unittest.skipUnless(HAS_NUMPY, "requiere numpy")
+class TestLockstepRules(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.boards = random_positions(200, seed=7)
+        cls.batch = as_batch(cls.boards)
+
+    def test_legal_sources_match_check_move(self):
+        n = len(self.boards)
+        for player in (Player.WHITE, Player.BLACK):
+            for die in range(1, 7):
+                legal = legal_sources(self.batch, np.full(n, player.value), np.full(n, die))
+                for k, board in enumerate(self.boards):
+                    for src in range(25):
+                        status = board.check_move(player, None if src == BAR_SOURCE else src, die)
+                        self.assertEqual(legal[k, src], status is MoveStatus.OK)
+
+    def test_apply_moves_matches_board_move(self):
+        n = len(self.boards)
+        signs = np.array([(Player.WHITE if k % 2 else Player.BLACK).value for k in range(n)])
+        dice = np.array([k % 6 + 1 for k in range(n)])
+        legal = legal_sources(self.batch, signs, dice)
+        rows = np.flatnonzero(legal.any(axis=1))
+        sources = legal[rows].argmax(axis=1)
+        moved = self.batch[rows].copy()
+        apply_moves(moved, signs[rows], sources, dice[rows])
+        for k, row in enumerate(rows):
+            board = Board.from_state(self.boards[row].state)
+            src = None if sources[k] == BAR_SOURCE else int(sources[k])
+            board.move(Player(int(signs[row])), src, int(dice[row]))
+            self.assertEqual(bytes(board.state), moved[k].tobytes())
+
+    def test_doubles_end_in_generated_positions(self):
+        simulator = LockstepSimulator(RandomBatchPolicy(3), RandomBatchPolicy(4))
+        boards = self.boards[:60]
+        repeats = 4
+        for player in (Player.WHITE, Player.BLACK):
+            for die in range(1, 7):
+                batch = np.repeat(as_batch(boards), repeats, axis=0)
+                n = len(batch)
+                simulator.play_turn(batch, np.arange(n), np.full(n, player.value), np.full((n, 2), die))
+                for k in range(0, n, repeats):
+                    finals = {bytes(s) for _, s in generate_plays(boards[k // repeats], player, (die, die))}
+                    for row in batch[k:k + repeats]:
+                        self.assertIn(row.tobytes(), finals)
+
+
+@unittest.skipUnless(HAS_NUMPY, "requiere numpy")
+class TestLockstepSimulator(unittest.TestCase):
+    def test_games_replay_on_game(self):
+        result = LockstepSimulator(RandomBatchPolicy(1), RandomBatchPolicy(2), record=True).run(60, seed=3)
+        for i in range(len(result)):
+            game = Game(record_history=False)
+            game.start()
+            board = game.board
+            for _, moves in itertools.groupby(result.moves(i), key=lambda m: m[0]):
+                moves = list(moves)
+                before = Board.from_state(board.state)
+                for _, player, src, die in moves:
+                    board.move(player, src, die)
+                if len(moves) == 2 and moves[0][3] != moves[1][3]:
+                    finals = {bytes(s) for _, s in generate_plays(before, moves[0][1], (moves[0][3], moves[1][3]))}
+                    self.assertIn(bytes(board.state), finals)
+                elif len(moves) > 2:   #Doble
+                    finals = {bytes(s) for _, s in generate_plays(before, moves[0][1], (moves[0][3],) * 2)}
+                    self.assertIn(bytes(board.state), finals)
+            self.assertEqual(bytes(board.state), result.states[i].tobytes())
+            game.check_game_over()
+            self.assertTrue(game.finished)
+            self.assertEqual(game.winner.value, result.winners[i])
+            self.assertEqual(game.win_points(), result.points[i])
+
+    def test_same_seed_same_games(self):
+        a = LockstepSimulator(RandomBatchPolicy(4), RandomBatchPolicy(5)).run(50, seed=9)
+        b = LockstepSimulator(RandomBatchPolicy(4), RandomBatchPolicy(5)).run(50, seed=9)
+        np.testing.assert_array_equal(a.states, b.states)
+        np.testing.assert_array_equal(a.turns, b.turns)
+
+    def test_evaluator_policy_beats_random(self):
+        greedy = EvaluatorBatchPolicy(LinearEvaluator.race())
+        stats = LockstepSimulator(greedy, RandomBatchPolicy(0)).run(200, seed=1).stats()
+        self.assertEqual(stats.games, 200)
+        self.assertGreater(stats.win_rate(Player.WHITE), 0.5)
+
+    def test_start_from_given_states(self):
+        start = random_positions(1, seed=1)[0]
+        states = np.tile(np.frombuffer(bytes(start.state), dtype=np.int8), (10, 1))
+        players = np.full(10, Player.WHITE.value)
+        result = LockstepSimulator(RandomBatchPolicy(1), RandomBatchPolicy(2)).run(10, seed=0, states=states,
+                                                                                   players=players)
+        self.assertTrue(np.all(result.winners != 0))
+        with self.assertRaises(ValueError):
+            LockstepSimulator(RandomBatchPolicy(), RandomBatchPolicy()).run(3, states=states, players=players)
+
+    def test_max_turns_and_stats(self):
+        result = LockstepSimulator(RandomBatchPolicy(1), RandomBatchPolicy(2), max_turns=5).run(20, seed=2)
+        stats = result.stats()
+        self.assertEqual(stats.unfinished, 20)
+        self.assertEqual(stats.average_length, 5)
+        self.assertIsNone(result.result(0).winner)
+        with self.assertRaises(ValueError):
+            result.moves(0)
+
+
+if __name__ == "__main__":
+    unittest.main()
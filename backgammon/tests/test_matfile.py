@@ -0,0 +1,147 @@
+import io
+import os
+import random
+import tempfile
+import unittest
+
+from backgammon.core.board import Board
+from backgammon.core.game import Game
+from backgammon.core.player import Player
+from backgammon.core.exceptions import MatchFileError
+from backgammon.core.record import RecordWriter, read_games
+from backgammon.core.matfile import (
+    MatchImporter, read_match, format_match, format_play, chunk_offsets, target_state,
+)
+from backgammon.tests.test_record import play_game
+
+SAMPLE = """\
+ ; [Site "Club"]
+ 3 point match
+
+ Game 1
+ Ana : 0                              Beto : 0
+  1)                                  52: 13/8 13/11
+  2) 31: 8/5 6/5                      64: 24/18 13/9
+  3)  Doubles => 2                    Drops
+      Wins 1 point
+
+ Game 2
+ Ana : 1                              Beto : 0
+  1) 42: 8/4 6/4                      31: 13/9
+  2) 66: 24/18(2) 13/7(2)             54: 24/20 13/8
+"""
+
+
+def selfplay_records(games: int, seed: int) -> list:
+    f = io.BytesIO()
+    writer = RecordWriter(f)
+    rng = random.Random(seed)
+    for k in range(games):
+        game = Game(rng=random.Random(seed + k))
+        game.setup_players("Ana", "Beto")
+        game.record_to(writer)
+        play_game(game, rng)
+    writer.close()
+    return list(read_games(io.BytesIO(f.getvalue())))
+
+
+class TestParse(unittest.TestCase):
+    def test_sample(self):
+        first, second = read_match(SAMPLE)
+        self.assertEqual((first.white, first.black), ("Ana", "Beto"))
+        self.assertIs(first.starter, Player.BLACK)
+        self.assertEqual(first.draw, (2, 5))
+        self.assertEqual([turn[:2] for turn in first.turns],
+                         [(Player.BLACK, (5, 2)), (Player.WHITE, (3, 1)), (Player.BLACK, (6, 4))])
+        self.assertEqual((first.winner, first.points), (Player.WHITE, 1))
+        game = first.to_game()
+        self.assertIs(game.current_player, Player.BLACK)
+
+        #"13/9" con 31 son dos movimientos
+        self.assertIsNone(second.winner)
+        self.assertEqual(len(second.turns[1][2]), 2)
+        self.assertEqual(len(second.turns[2][2]), 4)
+        self.assertEqual(sorted(second.turns[3][2]), [(0, 4), (11, 5)])
+
+    def test_illegal_move_reports_line(self):
+        text = SAMPLE.replace("8/5 6/5", "8/5 6/4")
+        with self.assertRaises(MatchFileError) as ctx:
+            read_match(text)
+        self.assertIn("linea 7", str(ctx.exception))
+        for bad in ("8/x", "7/4 6/5", "8"):
+            with self.assertRaises(MatchFileError):
+                read_match(SAMPLE.replace("8/5 6/5", bad))
+
+    def test_target_state(self):
+        board = Board()
+        board.__reset__()
+        state = target_state(board, Player.WHITE, "24/18(2)")
+        self.assertEqual((state[23], state[17]), (0, -2))
+        self.assertEqual(target_state(board, Player.BLACK, "24/23/22").tolist(),
+                         target_state(board, Player.BLACK, "24/22").tolist())
+
+    def test_roundtrip_with_selfplay(self):
+        records = selfplay_records(6, seed=5)
+        text = format_match(records)
+        parsed = read_match(text)
+        self.assertEqual(len(parsed), len(records))
+        for record, back in zip(records, parsed):
+            self.assertEqual([(p, d) for p, d, _ in back.turns], [(p, d) for p, d, _ in record.turns])
+            self.assertEqual((back.winner, back.points), (record.winner, record.points))
+            self.assertEqual(back.to_game().board.state, record.to_game().board.state)
+
+    def test_format_play(self):
+        board = Board()
+        board.__reset__()
+        self.assertEqual(format_play(board, Player.WHITE, [(7, 3), (5, 1)]), "8/5 6/5")
+        self.assertEqual(format_play(board, Player.BLACK, [(11, 5), (11, 2)]), "13/8 13/11")
+
+
+class TestImporter(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.records = selfplay_records(9, seed=11)
+        self.paths = []
+        for k in range(3):
+            path = os.path.join(self.tmp.name, f"match{k}.mat")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(format_match(self.records[3 * k:3 * k + 3]))
+            self.paths.append(path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_chunk_offsets(self):
+        chunks = chunk_offsets(self.paths[0], chunk_games=2)
+        self.assertEqual(len(chunks), 2)
+        self.assertEqual(chunks[0][1], chunks[1][0])
+        self.assertEqual(chunks[1][1], os.path.getsize(self.paths[0]))
+
+    def import_all(self, workers: int) -> tuple:
+        f = io.BytesIO()
+        progress = []
+        with RecordWriter(f) as writer:
+            stats = MatchImporter(workers=workers, chunk_games=2).run(self.paths, writer, progress.append)
+            data = f.getvalue()
+        return stats, list(read_games(io.BytesIO(data))), progress
+
+    def test_serial_and_parallel_agree(self):
+        stats, records, progress = self.import_all(1)
+        self.assertEqual((stats.files, stats.games, stats.imported, stats.rejected), (3, 9, 9, 0))
+        self.assertEqual(len(progress), 6)
+        self.assertEqual([r.to_game().board.state for r in records], [r.to_game().board.state for r in self.records])
+        parallel, parallel_records, _ = self.import_all(2)
+        self.assertEqual(parallel_records, records)
+        self.assertEqual(parallel.imported, 9)
+
+    def test_invalid_games_are_rejected(self):
+        with open(self.paths[1], "a", encoding="utf-8") as f:
+            f.write(SAMPLE.replace("8/5 6/5", "8/5 6/4"))
+        stats = MatchImporter(workers=1).run(self.paths)
+        self.assertEqual((stats.games, stats.imported, stats.rejected), (11, 10, 1))
+        self.assertIn("match1.mat", stats.errors[0])
+        self.assertIn("Partidas: 11", str(stats))
+
+
+if __name__ == "__main__":
+    unittest.main()
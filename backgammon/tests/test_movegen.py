@@ -0,0 +1,82 @@
+import unittest
+
+from backgammon.core.board import Board
+from backgammon.core.player import Player
+from backgammon.core.checker import Checker
+from backgammon.core.movegen import generate_plays, legal_plays
+
+
+def empty_board():
+    return Board()
+
+
+class TestMoveGen(unittest.TestCase):
+    def setUp(self):
+        self.b = Board()
+        self.b.__reset__()
+
+    def test_plays_apply_with_board_move(self):
+        for play, state in generate_plays(self.b, Player.WHITE, (3, 1)):
+            clone = self.b.copy()
+            for src, die in play:
+                clone.move(Player.WHITE, src, die)
+            self.assertEqual(clone.state, state)
+
+    def test_non_double_uses_both_dice(self):
+        plays = legal_plays(self.b, Player.WHITE, (6, 5))
+        self.assertTrue(plays)
+        for play in plays:
+            self.assertEqual(sorted(d for _, d in play), [5, 6])
+
+    def test_double_plays_four_moves(self):
+        plays = legal_plays(self.b, Player.BLACK, (2, 2))
+        self.assertTrue(plays)
+        for play in plays:
+            self.assertEqual(len(play), 4)
+
+    def test_duplicate_positions_are_collapsed(self):
+        states = [state.tobytes() for _, state in generate_plays(self.b, Player.WHITE, (2, 1))]
+        self.assertEqual(len(states), len(set(states)))
+        b = empty_board()
+        b.__points__[10] = [Checker(Player.WHITE)]
+        b.__points__[20] = [Checker(Player.BLACK)]
+        #10->8->7 y 10->9->7 terminan igual: una sola jugada
+        plays = legal_plays(b, Player.WHITE, (2, 1))
+        self.assertEqual(len(plays), 1)
+        self.assertIn(plays[0], [((10, 2), (8, 1)), ((10, 1), (9, 2))])
+
+    def test_must_enter_from_bar_first(self):
+        self.b.__bar__[Player.WHITE] = [Checker(Player.WHITE)]
+        for play in legal_plays(self.b, Player.WHITE, (4, 3)):
+            self.assertIsNone(play[0][0])
+
+    def test_blocked_entry_gives_empty_play(self):
+        b = empty_board()
+        b.__bar__[Player.WHITE] = [Checker(Player.WHITE)]
+        b.__points__[0] = [Checker(Player.BLACK)] * 2
+        b.__points__[1] = [Checker(Player.BLACK)] * 2
+        self.assertEqual(legal_plays(b, Player.WHITE, (1, 2)), [()])
+
+    def test_only_one_die_playable_must_use_higher(self):
+        b = empty_board()
+        b.__points__[10] = [Checker(Player.WHITE)]
+        #Solo un dado se puede usar: 10-6=4 o 10-2=8, pero despues todo bloqueado
+        b.__points__[2] = [Checker(Player.BLACK)] * 2
+        plays = legal_plays(b, Player.WHITE, (6, 2))
+        self.assertEqual(plays, [((10, 6),)])
+
+    def test_bear_off_generated(self):
+        b = empty_board()
+        b.__points__[0] = [Checker(Player.WHITE)]
+        b.__points__[1] = [Checker(Player.WHITE)]
+        b.__borne__[Player.WHITE] = [Checker(Player.WHITE)] * 13
+        plays = generate_plays(b, Player.WHITE, (6, 5))
+        self.assertTrue(any(state[26] == 15 for _, state in plays))
+
+    def test_invalid_dice_raises(self):
+        with self.assertRaises(ValueError):
+            legal_plays(self.b, Player.WHITE, (0, 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
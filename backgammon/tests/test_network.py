@@ -0,0 +1,113 @@
+import importlib.util
+import os
+import tempfile
+import unittest
+
+from backgammon.core.board import Board
+from backgammon.core.player import Player
+from backgammon.core.movegen import generate_plays
+from backgammon.ai.search import ExpectiminimaxSearch
+from backgammon.selfplay.selfplay import SelfPlay, EvaluatorPolicy, RandomPolicy, GreedyPolicy
+from backgammon.tests.test_batch import random_positions
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+if HAS_NUMPY:
+    import numpy as np
+    from backgammon.ai.encoding import encode_batch
+    from backgammon.ai.network import NeuralEvaluator, TDTrainer, parameter_count
+
+
+def opening() -> Board:
+    board = Board()
+    board.__reset__()
+    return board
+
+
+@unittest.skipUnless(HAS_NUMPY, "requiere numpy")
+class TestNeuralEvaluator(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.boards = random_positions(30, seed=5)
+
+    def test_batch_matches_single(self):
+        net = NeuralEvaluator(hidden=12, seed=1)
+        self.assertEqual(len(net.params), parameter_count(12))
+        values = net.evaluate_states(self.boards, Player.BLACK)
+        self.assertEqual(values.shape, (30,))
+        self.assertTrue((np.abs(values) < 1).all())
+        for board, value in zip(self.boards[:5], values):
+            self.assertAlmostEqual(net(board, Player.BLACK), float(value), places=5)
+
+    def test_gradients_match_finite_differences(self):
+        net = NeuralEvaluator(hidden=6, seed=2)
+        inputs = encode_batch(self.boards[:4], Player.WHITE)
+        _, grads = net.gradients(inputs)
+        for index in (0, 150, len(net.params) - 10, len(net.params) - 1):
+            old = float(net.params[index])
+            net.params[index] = old + 1e-2
+            up = net.forward(inputs)[0]
+            net.params[index] = old - 1e-2
+            down = net.forward(inputs)[0]
+            net.params[index] = old
+            np.testing.assert_allclose((up - down) / 2e-2, grads[:, index], atol=1e-3)
+
+    def test_save_and_load_memory_mapped(self):
+        net = NeuralEvaluator(hidden=8, seed=3)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "net.npy")
+            net.save(path)
+            loaded = NeuralEvaluator.load(path)
+            self.assertIsInstance(loaded.params, np.memmap)
+            self.assertEqual(loaded.hidden, 8)
+            np.testing.assert_array_equal(loaded.evaluate_states(self.boards, Player.WHITE),
+                                          net.evaluate_states(self.boards, Player.WHITE))
+            with self.assertRaises(ValueError):
+                TDTrainer(loaded)
+            TDTrainer(NeuralEvaluator.load(path, mode="c"))
+            del loaded
+        with self.assertRaises(ValueError):
+            NeuralEvaluator(params=np.zeros(10, dtype=np.float32))
+
+    def test_td_training_updates_weights(self):
+        net = NeuralEvaluator(hidden=8, seed=4)
+        before = net.params.copy()
+        calls = []
+        stats = TDTrainer(net).train(24, seed=0, parallel=10, progress=lambda done, total: calls.append(done))
+        self.assertEqual(stats.games, 24)
+        self.assertEqual(calls, [10, 20, 24])
+        self.assertFalse(np.array_equal(before, net.params))
+        self.assertTrue(np.isfinite(net.params).all())
+
+    def test_plugs_into_search_and_selfplay(self):
+        net = NeuralEvaluator(hidden=8, seed=5)
+        board = opening()
+        play, _, _ = ExpectiminimaxSearch(net).best_play(board, Player.WHITE, (3, 1), depth=1)
+        self.assertIn(play, [p for p, _ in generate_plays(board, Player.WHITE, (3, 1))])
+        stats = SelfPlay(EvaluatorPolicy(net), RandomPolicy()).run(3, seed=1)
+        self.assertEqual(stats.games, 3)
+
+
+class TestEvaluatorPolicy(unittest.TestCase):
+    def test_without_batch_uses_single_evaluations(self):
+        #Con la diferencia de pips elige lo mismo que GreedyPolicy
+        def pips(board, player):
+            opponent = Player.BLACK if player is Player.WHITE else Player.WHITE
+            return board.pip_count(opponent) - board.pip_count(player)
+
+        board = opening()
+        for dice in ((6, 5), (4, 2), (3, 3)):
+            plays = generate_plays(board, Player.BLACK, dice)
+            chosen = EvaluatorPolicy(pips)(board, Player.BLACK, dice, plays)
+            greedy = GreedyPolicy()(board, Player.BLACK, dice, plays)
+            self.assertEqual(pips(Board.from_state(chosen[1]), Player.BLACK),
+                             pips(Board.from_state(greedy[1]), Player.BLACK))
+
+    def test_takes_winning_play(self):
+        board = Board()
+        board.state[0] = -1
+        board.state[26] = 14
+        board.state[23] = 15
+        board.__refresh__()
+        plays = generate_plays(board, Player.WHITE, (1, 2))
+        chosen = EvaluatorPolicy(lambda b, p: 0.0)(board, Player.WHITE, (1, 2), plays)
+        self.assertEqual(chosen[1][26], 15)
@@ -0,0 +1,102 @@
+import unittest
+
+from backgammon.core.board import Board
+from backgammon.core.game import Game
+from backgammon.core.player import Player
+from backgammon.core.dice import Dice
+from backgammon.core.positionid import (
+    MatchState, position_id, decode_position, board_from_position_id, encode_match, decode_match,
+    match_id, game_position_id, game_from_ids, CENTERED, PLAYING, NO_GAME, OVER,
+)
+from backgammon.tests.test_batch import random_positions
+
+
+class TestPositionId(unittest.TestCase):
+    def test_opening_position(self):
+        board = Board()
+        board.__reset__()
+        self.assertEqual(position_id(board, Player.WHITE), "4HPwATDgc/ABMA")
+        self.assertEqual(position_id(board, Player.BLACK), "4HPwATDgc/ABMA")
+        self.assertEqual(board_from_position_id("4HPwATDgc/ABMA", Player.BLACK).state, board.state)
+
+    def test_roundtrip(self):
+        for board in random_positions(300, seed=21):
+            for player in (Player.WHITE, Player.BLACK):
+                text = position_id(board, player)
+                self.assertEqual(len(text), 14)
+                decoded = board_from_position_id(text, player)
+                self.assertEqual(decoded.state, board.state)
+                self.assertEqual(decoded.zobrist_hash(), board.zobrist_hash())
+
+    def test_player_on_roll_comes_last(self):
+        board = Board()
+        board.state[0] = -1   #WHITE: una ficha en su punto 1
+        board.state[26] = 14
+        board.state[27] = 15
+        board.__refresh__()
+        opponent, on_roll = decode_position(position_id(board, Player.WHITE))
+        self.assertEqual(sum(opponent), 0)
+        self.assertEqual(on_roll[0], 1)
+        opponent, on_roll = decode_position(position_id(board, Player.BLACK))
+        self.assertEqual(opponent[0], 1)
+
+    def test_invalid_ids(self):
+        for text in ("", "4HPwATDgc/AB", "4HPwATDgc/AB!A", "//////////////"):
+            with self.assertRaises(ValueError):
+                board_from_position_id(text, Player.WHITE)
+
+
+class TestMatchId(unittest.TestCase):
+    def test_gnubg_example(self):
+        match = decode_match("QYkqASAAIAAA")
+        self.assertEqual((match.cube, match.cube_owner, match.on_roll, match.state), (1, 0, 1, PLAYING))
+        self.assertEqual(match.dice, (5, 2))
+        self.assertEqual((match.match_length, match.score0, match.score1), (9, 2, 4))
+        self.assertEqual(encode_match(match), "QYkqASAAIAAA")
+
+    def test_field_range(self):
+        with self.assertRaises(ValueError):
+            encode_match(MatchState(die1=9))
+        with self.assertRaises(ValueError):
+            decode_match("QYkqASAA")
+
+    def test_game_states(self):
+        game = Game(dice=Dice.scripted([(2, 5), (6, 4)]))
+        self.assertEqual(decode_match(match_id(game)).state, NO_GAME)
+        game.start()
+        game.roll()
+        game.roll()
+        match = decode_match(match_id(game))
+        self.assertEqual(match.player_on_roll, Player.BLACK)
+        self.assertEqual((match.cube, match.cube_owner, match.state, match.dice), (0, CENTERED, PLAYING, (6, 4)))
+
+    def test_game_from_ids(self):
+        game = Game(dice=Dice.scripted([(5, 2), (3, 1)]))
+        game.start()
+        game.roll()
+        game.roll()
+        game.board.move(Player.WHITE, 7, 3)
+        game.board.move(Player.WHITE, 5, 1)
+        game.pass_turn()
+        position, match = game_position_id(game), match_id(game)
+        loaded = game_from_ids(position, match)
+        self.assertEqual(loaded.board.state, game.board.state)
+        self.assertIs(loaded.current_player, Player.BLACK)
+        self.assertEqual(loaded.dice.values, (0, 0))
+        self.assertTrue(loaded.started)
+        self.assertEqual((game_position_id(loaded), match_id(loaded)), (position, match))
+        loaded.roll()
+        self.assertEqual(len(loaded.dice.values), 2)
+
+    def test_finished_game(self):
+        board = Board()
+        board.state[0] = -1
+        board.state[26] = 14
+        board.state[23] = 15
+        board.__refresh__()
+        game = Game()
+        game.load_position(board.state, Player.WHITE, (1, 2))
+        game.board.move(Player.WHITE, 0, 1)
+        game.check_game_over()
+        self.assertEqual(decode_match(match_id(game)).state, OVER)
+        self.assertTrue(game_from_ids(game_position_id(game), match_id(game)).finished)
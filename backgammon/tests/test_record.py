@@ -0,0 +1,169 @@
+import io
+import os
+import random
+import tempfile
+import unittest
+
+from backgammon.core.dice import Dice
+from backgammon.core.game import Game
+from backgammon.core.player import Player
+from backgammon.core.movegen import legal_plays
+from backgammon.core.record import (
+    MAGIC, GameRecord, RecordWriter, read_games, write_varint,
+)
+
+
+def play_game(game: Game, rng: random.Random, max_turns: int = 2000) -> None:
+    """Juega una partida completa con jugadas legales al azar."""
+    game.start()
+    game.roll()
+    for _ in range(max_turns):
+        dice = game.roll()
+        plays = legal_plays(game.board, game.current_player, tuple(dice))
+        if plays:
+            for src, die in rng.choice(plays):
+                game.move(src, die)
+        game.check_game_over()
+        if game.finished:
+            return
+        game.pass_turn()
+
+
+class TestVarint(unittest.TestCase):
+    def test_sizes_and_roundtrip(self):
+        for value, size in ((0, 1), (127, 1), (128, 2), (16383, 2), (16384, 3), (2 ** 40, 6)):
+            out = bytearray()
+            write_varint(out, value)
+            self.assertEqual(len(out), size)
+        with self.assertRaises(ValueError):
+            write_varint(bytearray(), -1)
+
+
+class TestGameRecord(unittest.TestCase):
+    def test_encode_is_compact(self):
+        record = GameRecord("Ana", "Beto", seed=7, draw=(5, 2),
+                            turns=[(Player.WHITE, (3, 1), [(7, 3), (5, 1)]), (Player.BLACK, (6, 6), [])])
+        data = record.encode()
+        #nombres (1 + 3, 1 + 4) + semilla + sorteo + 3 + pase + tirada + fin (3)
+        self.assertEqual(len(data), 4 + 5 + 2 + 3 + 2 + 3)
+        self.assertEqual(list(read_games(MAGIC + data)), [record])
+
+    def test_invalid_move_die(self):
+        record = GameRecord(draw=(5, 2), turns=[(Player.WHITE, (3, 1), [(7, 4)])])
+        with self.assertRaises(ValueError):
+            record.encode()
+
+    def test_bad_files(self):
+        with self.assertRaises(ValueError):
+            list(read_games(b"XXXX"))
+        data = MAGIC + GameRecord(draw=(5, 2), turns=[(Player.WHITE, (3, 1), [])]).encode()
+        with self.assertRaises(ValueError):
+            list(read_games(data[:-2]))
+
+
+class TestRecordWriter(unittest.TestCase):
+    def test_game_records_itself(self):
+        f = io.BytesIO()
+        writer = RecordWriter(f)
+        rng = random.Random(3)
+        games = []
+        for k in range(5):
+            game = Game(rng=random.Random(k))
+            game.setup_players("Ana", "Beto")
+            game.record_to(writer, seed=k)
+            play_game(game, rng)
+            self.assertTrue(game.finished)
+            games.append(game)
+        writer.close()
+        self.assertEqual(writer.games, 5)
+
+        records = list(read_games(io.BytesIO(f.getvalue()), read_size=7))
+        self.assertEqual(len(records), 5)
+        for k, (game, record) in enumerate(zip(games, records)):
+            self.assertEqual((record.white, record.black, record.seed), ("Ana", "Beto", k))
+            self.assertEqual((record.winner, record.points), (game.winner, game.win_points()))
+            self.assertIs(record.starter, record.turns[0][0])
+            replayed = record.to_game()
+            self.assertEqual(replayed.board.state, game.board.state)
+            self.assertIs(replayed.winner, game.winner)
+            #Un byte por tirada, movimiento y pase, mas encabezado y cierre
+            self.assertLess(len(record.encode()), 2 * len(record.turns) + record.move_count + 20)
+
+    def test_undo_and_redo_are_recorded(self):
+        f = io.BytesIO()
+        writer = RecordWriter(f)
+        game = Game(rng=random.Random(1))
+        game.record_to(writer)
+        game.start()
+        game.roll()
+        dice = tuple(game.roll())
+        play = legal_plays(game.board, game.current_player, dice)[0]
+        for src, die in play:
+            game.move(src, die)
+        game.pass_turn()
+        game.undo()       #pase
+        game.undo()       #ultimo movimiento
+        game.redo()
+        game.redo()
+        game.roll()
+        writer.close()   #La partida sin terminar se guarda sin ganador
+        record, = read_games(io.BytesIO(f.getvalue()))
+        self.assertIsNone(record.winner)
+        self.assertEqual(len(record.turns), 2)
+        self.assertEqual(record.turns[0][2], list(play))
+        self.assertEqual(record.to_game().board.state, game.board.state)
+
+    def test_undo_pass_after_opponent_rolled(self):
+        f = io.BytesIO()
+        writer = RecordWriter(f)
+        game = Game(dice=Dice.scripted([(5, 2), (3, 1), (6, 4), (2, 2)]))
+        game.record_to(writer)
+        game.start()
+        game.roll()
+        game.roll()
+        game.move(7, 3)
+        game.move(5, 1)
+        game.pass_turn()
+        game.roll()       #BLACK ya tiro cuando se deshace el pase
+        game.undo()
+        self.assertEqual(game.current_player, Player.WHITE)
+        game.pass_turn()
+        game.roll()
+        writer.close()
+        record, = read_games(io.BytesIO(f.getvalue()))
+        self.assertEqual([(player, dice) for player, dice, _ in record.turns],
+                         [(Player.WHITE, (3, 1)), (Player.BLACK, (2, 2))])
+        self.assertEqual(record.to_game().board.state, game.board.state)
+
+    def test_undo_after_game_over_keeps_recording(self):
+        f = io.BytesIO()
+        writer = RecordWriter(f)
+        game = Game(rng=random.Random(5))
+        game.record_to(writer)
+        play_game(game, random.Random(5))
+        self.assertFalse(writer.in_game)
+        game.undo()       #La jugada ganadora: la partida se reabre
+        self.assertFalse(game.finished)
+        self.assertTrue(writer.in_game)
+        self.assertEqual(writer.games, 0)
+        game.redo()
+        game.check_game_over()
+        self.assertTrue(game.finished)
+        writer.close()
+        self.assertEqual(writer.games, 1)
+        record, = read_games(io.BytesIO(f.getvalue()))
+        self.assertEqual(record.winner, game.winner)
+        self.assertEqual(record.to_game().board.state, game.board.state)
+
+    def test_append_to_file(self):
+        record = GameRecord(draw=(2, 5), turns=[(Player.BLACK, (6, 4), [(0, 6), (6, 4)])])
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "partidas.bgr")
+            for _ in range(2):
+                with RecordWriter(path, append=True) as writer:
+                    writer.write_game(record)
+            self.assertEqual(list(read_games(path)), [record, record])
+
+
+if __name__ == "__main__":
+    unittest.main()
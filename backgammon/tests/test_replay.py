@@ -0,0 +1,77 @@
+import random
+import unittest
+
+from backgammon.core.board import Board
+from backgammon.core.exceptions import BackgammonError
+from backgammon.core.player import Player
+from backgammon.core.record import GameRecord
+from backgammon.core.replay import Replay
+from backgammon.tests.test_matfile import selfplay_records
+
+
+def naive_position(record: GameRecord, n: int) -> Board:
+    """Tablero despues de n movimientos, jugando todo desde el inicio."""
+    board = Board()
+    board.__reset__()
+    moves = [(player, src, die) for player, _, play in record.turns for src, die in play]
+    for player, src, die in moves[:n]:
+        board.move(player, src, die)
+    return board
+
+
+class TestReplay(unittest.TestCase):
+    def setUp(self):
+        self.record = selfplay_records(1, seed=4)[0]
+
+    def test_seek_matches_full_replay(self):
+        replay = Replay(self.record, keyframe_every=8)
+        self.assertEqual(len(replay), self.record.move_count)
+        rng = random.Random(0)
+        targets = [0, len(replay), 7, 8, 9] + [rng.randrange(len(replay) + 1) for _ in range(60)]
+        for n in targets:
+            board = replay.seek(n)
+            self.assertEqual(replay.position, n)
+            expected = naive_position(self.record, n)
+            self.assertEqual(board.state, expected.state)
+            self.assertEqual(board.zobrist_hash(), expected.zobrist_hash())
+            self.assertEqual(board.pip_count(Player.WHITE), expected.pip_count(Player.WHITE))
+        self.assertEqual(replay.seek(len(replay)).borne_count(self.record.winner), 15)
+
+    def test_stepping(self):
+        replay = Replay(self.record, keyframe_every=5)
+        replay.seek(10)
+        after = replay.forward().copy()
+        self.assertEqual(after.state, naive_position(self.record, 11).state)
+        self.assertEqual(replay.backward(3).state, naive_position(self.record, 8).state)
+        with self.assertRaises(IndexError):
+            replay.backward(9)
+        with self.assertRaises(IndexError):
+            replay.seek(len(replay) + 1)
+
+    def test_positions_iterator(self):
+        replay = Replay(self.record)
+        boards = list(replay.positions(3, 20))
+        self.assertEqual([n for n, _ in boards], list(range(3, 21)))
+        for n, board in boards:
+            self.assertEqual(board.state, naive_position(self.record, n).state)
+        self.assertEqual(len(list(replay.positions())), len(replay) + 1)
+
+    def test_turns(self):
+        replay = Replay(self.record)
+        turn = next(k for k, (_, _, moves) in enumerate(self.record.turns) if k > 1 and moves)
+        player, dice, moves = self.record.turns[turn]
+        start = replay.turn_start(turn)
+        self.assertEqual(replay.turn_at(start), turn)
+        self.assertEqual(replay.move_at(start), (player, dice) + tuple(moves[0]))
+        self.assertEqual(replay.seek_turn(turn).state, naive_position(self.record, start).state)
+
+    def test_invalid_record(self):
+        record = GameRecord(draw=(5, 2), turns=[(Player.WHITE, (3, 1), [(0, 3)])])
+        with self.assertRaises(BackgammonError):
+            Replay(record)
+        with self.assertRaises(ValueError):
+            Replay(self.record, keyframe_every=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
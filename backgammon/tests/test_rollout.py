@@ -0,0 +1,135 @@
+import builtins
+import importlib.util
+import random
+import unittest
+from unittest.mock import patch
+
+from backgammon.cli.cli import CLI
+from backgammon.core.board import Board
+from backgammon.core.player import Player
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+if HAS_NUMPY:
+    import numpy as np
+    from backgammon.ai.batch import LinearEvaluator
+    from backgammon.ai.rollout import Rollout, RolloutDice, Estimate, control_variate
+
+
+def opening() -> Board:
+    board = Board()
+    board.__reset__()
+    return board
+
+
+@unittest.skipUnless(HAS_NUMPY, "requiere numpy")
+class TestRolloutDice(unittest.TestCase):
+    def test_first_turn_covers_all_outcomes(self):
+        dice = RolloutDice(seed=1, rotate_turns=1, antithetic=False)
+        rolls = dice(1, np.arange(36))
+        self.assertEqual(len({(int(a), int(b)) for a, b in rolls}), 36)
+
+    def test_antithetic_pairs(self):
+        dice = RolloutDice(seed=2, rotate_turns=2, antithetic=True)
+        rows = np.arange(72)
+        for turn in (1, 2, 3, 10):
+            rolls = dice(turn, rows)
+            self.assertTrue(((rolls[0::2] + rolls[1::2]) == 7).all())
+        first = dice(1, rows)[0::2]
+        self.assertEqual(len({(int(a), int(b)) for a, b in first}), 36)
+
+    def test_antithetic_second_turn_is_stratified(self):
+        dice = RolloutDice(seed=4, rotate_turns=2, antithetic=True)
+        rows = np.arange(1296)   #648 pares
+        codes = [(dice(turn, rows)[0::2] - 1) @ np.array([6, 1]) for turn in (1, 2)]
+        for block in range(0, 648 - 35, 36):
+            for turn_codes in codes:
+                self.assertEqual(len(set(turn_codes[block:block + 36].tolist())), 36)
+        whole = RolloutDice(seed=4, rotate_turns=2, antithetic=False)
+        rows = np.arange(36 * 36)
+        pairs = {(tuple(a), tuple(b)) for a, b in zip(whole(1, rows).tolist(), whole(2, rows).tolist())}
+        self.assertEqual(len(pairs), 36 * 36)
+
+    def test_start_continues_the_rotation(self):
+        whole = RolloutDice(seed=3, rotate_turns=1, antithetic=False)(1, np.arange(36))
+        tail = RolloutDice(seed=3, rotate_turns=1, antithetic=False, start=30)(1, np.arange(6))
+        self.assertTrue((whole[30:] == tail).all())
+
+
+@unittest.skipUnless(HAS_NUMPY, "requiere numpy")
+class TestEstimates(unittest.TestCase):
+    def test_estimate_interval(self):
+        estimate = Estimate(np.array([0.0, 1.0, 0.0, 1.0]), z=2.0)
+        self.assertAlmostEqual(estimate.mean, 0.5)
+        low, high = estimate.interval
+        self.assertAlmostEqual(high - low, 4 * estimate.std_error)
+
+    def test_control_variate(self):
+        rng = np.random.default_rng(0)
+        control = rng.normal(size=2000)
+        samples = 0.3 + control + rng.normal(scale=0.1, size=2000)
+        adjusted = control_variate(samples, control)
+        self.assertLess(adjusted.var(), samples.var() / 10)
+        self.assertAlmostEqual(adjusted.mean(), 0.3, delta=0.05)
+        self.assertIs(control_variate(samples, np.zeros(2000)), samples)
+
+
+@unittest.skipUnless(HAS_NUMPY, "requiere numpy")
+class TestRollout(unittest.TestCase):
+    def test_decided_position(self):
+        board = Board()
+        board.state[0] = -1
+        board.state[23] = 15
+        board.state[26] = 14
+        result = Rollout().run(board, Player.WHITE, trials=8, seed=0)
+        self.assertEqual(result.trials, 8)
+        self.assertEqual(result.equity.mean, 2.0)
+        self.assertEqual(result.equity.half_width, 0.0)
+        self.assertEqual(result.win_gammon.mean, 1.0)
+        self.assertEqual(result.lose_gammon.mean, 0.0)
+
+    def test_opening_with_luck_adjustment(self):
+        rollout = Rollout(baseline=LinearEvaluator.race(), luck_turns=2)
+        result = rollout.run(opening(), Player.WHITE, trials=40, seed=1)
+        self.assertEqual(result.trials, 40)
+        self.assertTrue(-3 <= result.equity.mean <= 3)
+        low, high = result.equity.interval
+        self.assertLessEqual(low, result.equity.mean)
+        self.assertLessEqual(result.equity.mean, high)
+        self.assertIn("equity", str(result))
+
+    def test_same_seed_same_result(self):
+        first = Rollout().run(opening(), Player.BLACK, trials=20, seed=5)
+        second = Rollout().run(opening(), Player.BLACK, trials=20, seed=5)
+        self.assertEqual(first.equity.mean, second.equity.mean)
+
+    def test_early_stop(self):
+        result = Rollout().run(opening(), Player.WHITE, trials=1000, seed=2,
+                               max_error=10.0, batch_size=50, min_trials=40)
+        self.assertEqual(result.trials, 50)
+
+    def test_invalid_trials(self):
+        with self.assertRaises(ValueError):
+            Rollout().run(opening(), Player.WHITE, trials=1)
+
+
+class TestRolloutCommand(unittest.TestCase):
+    def test_requires_started_game(self):
+        cli = CLI()
+        with patch("builtins.print") as printed:
+            cli.cmd_rollout([])
+        printed.assert_called_once_with("La partida no está iniciada. Usá 'start'.")
+
+    @unittest.skipUnless(HAS_NUMPY, "requiere numpy")
+    def test_rollout_after_draw(self):
+        cli = CLI()
+        inputs = iter(["Alice", "Bob", "1"])
+        with patch.object(builtins, "input", lambda prompt="": next(inputs)), patch("builtins.print"):
+            cli.cmd_start([])
+        draw = iter([6, 1])
+        with patch.object(random, "randint", lambda a, b: next(draw)), patch("builtins.print"):
+            cli.cmd_roll([])
+        with patch("builtins.print") as printed:
+            cli.cmd_rollout(["abc"])
+            cli.cmd_rollout(["10"])
+        self.assertEqual(printed.call_args_list[0].args[0], "Uso: rollout [pruebas]")
+        self.assertIn("Rollout: 10 pruebas", str(printed.call_args_list[1].args[0]))
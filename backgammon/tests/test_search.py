@@ -0,0 +1,93 @@
+import unittest
+
+from backgammon.core.board import Board
+from backgammon.core.player import Player
+from backgammon.core.checker import Checker
+from backgammon.core.movegen import legal_plays
+from backgammon.ai.search import ExpectiminimaxSearch, ROLLS, terminal_value, race_evaluator
+
+
+def endgame_board():
+    b = Board()
+    b.__points__[2] = [Checker(Player.WHITE)] * 3
+    b.__points__[9] = [Checker(Player.WHITE)]
+    b.__points__[20] = [Checker(Player.BLACK)] * 3
+    b.__points__[14] = [Checker(Player.BLACK)] * 2
+    b.__borne__[Player.WHITE] = [Checker(Player.WHITE)] * 11
+    b.__borne__[Player.BLACK] = [Checker(Player.BLACK)] * 10
+    return b
+
+
+def plain_expectimax(search, board, player, depth):
+    """Expectimax sin podas para comparar."""
+    value = terminal_value(board, player)
+    if value is not None:
+        return value
+    if depth == 0:
+        return search.static_value(board, player)
+    opponent = Player.BLACK if player is Player.WHITE else Player.WHITE
+    total = 0.0
+    for dice, prob in ROLLS:
+        best = max(
+            static if depth == 1 else -plain_expectimax(search, after, opponent, depth - 1)
+            for static, _, after in search.ordered_children(board, player, dice)
+        )
+        total += prob * best
+    return total
+
+
+class TestSearch(unittest.TestCase):
+    def test_rolls_cover_all_outcomes(self):
+        self.assertEqual(len(ROLLS), 21)
+        self.assertAlmostEqual(sum(prob for _, prob in ROLLS), 1.0)
+
+    def test_pruned_search_matches_plain_expectimax(self):
+        b = endgame_board()
+        expected = plain_expectimax(ExpectiminimaxSearch(), b, Player.WHITE, 2)
+        for star2 in (True, False):
+            search = ExpectiminimaxSearch(star2=star2)
+            self.assertAlmostEqual(search.chance_value(b, Player.WHITE, 2), expected)
+
+    def test_star2_visits_fewer_nodes(self):
+        b = endgame_board()
+        with_star2 = ExpectiminimaxSearch(star2=True)
+        without = ExpectiminimaxSearch(star2=False)
+        with_star2.chance_value(b, Player.WHITE, 2)
+        without.chance_value(b, Player.WHITE, 2)
+        self.assertLess(with_star2.nodes, without.nodes)
+
+    def test_best_play_is_legal(self):
+        b = Board()
+        b.__reset__()
+        play, value, depth = ExpectiminimaxSearch().best_play(b, Player.WHITE, (3, 1), depth=2)
+        self.assertIn(play, legal_plays(b, Player.WHITE, (3, 1)))
+        self.assertEqual(depth, 2)
+        self.assertTrue(-3 <= value <= 3)
+
+    def test_time_limit_keeps_last_complete_depth(self):
+        b = Board()
+        b.__reset__()
+        play, _, depth = ExpectiminimaxSearch().best_play(b, Player.WHITE, (6, 5), depth=3, time_limit=0.0)
+        self.assertEqual(depth, 1)
+        self.assertIn(play, legal_plays(b, Player.WHITE, (6, 5)))
+
+    def test_terminal_value_and_evaluator_bounds(self):
+        b = Board()
+        b.__borne__[Player.WHITE] = [Checker(Player.WHITE)] * 15
+        b.__points__[20] = [Checker(Player.BLACK)] * 5
+        self.assertEqual(terminal_value(b, Player.WHITE), 2.0)
+        self.assertEqual(terminal_value(b, Player.BLACK), -2.0)
+        start = Board()
+        start.__reset__()
+        self.assertIsNone(terminal_value(start, Player.WHITE))
+        self.assertTrue(-1 < race_evaluator(start, Player.WHITE) < 1)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            ExpectiminimaxSearch(lower=1, upper=0)
+        with self.assertRaises(ValueError):
+            ExpectiminimaxSearch().best_play(Board(), Player.WHITE, (1, 2), depth=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+
+from backgammon.core.player import Player
+from backgammon.selfplay import (
+    SelfPlay, SelfPlayStats, GameResult, RandomPolicy, FirstPlayPolicy, GreedyPolicy, SelfPlayFarm, game_seed
+)
+
+
+class TestSelfPlay(unittest.TestCase):
+    def test_play_game_finishes_with_winner(self):
+        engine = SelfPlay(RandomPolicy(1), GreedyPolicy())
+        result = engine.play_game()
+        self.assertIn(result.winner, (Player.WHITE, Player.BLACK))
+        self.assertIn(result.points, (1, 2, 3))
+        self.assertGreater(result.turns, 0)
+        self.assertEqual(engine.game.board.borne_count(result.winner), 15)
+
+    def test_no_history_strings(self):
+        engine = SelfPlay(FirstPlayPolicy(), FirstPlayPolicy())
+        engine.play_game()
+        self.assertEqual(engine.game.history(), [])
+
+    def test_run_aggregates_stats(self):
+        stats = SelfPlay(RandomPolicy(2), RandomPolicy(3)).run(5)
+        self.assertEqual(stats.games, 5)
+        self.assertEqual(stats.wins[Player.WHITE] + stats.wins[Player.BLACK] + stats.unfinished, 5)
+        self.assertGreater(stats.average_length, 0)
+        self.assertGreater(stats.games_per_second, 0)
+        self.assertIn("partidas/s", str(stats))
+
+    def test_max_turns_marks_unfinished(self):
+        result = SelfPlay(FirstPlayPolicy(), FirstPlayPolicy(), max_turns=2).play_game()
+        self.assertIsNone(result.winner)
+        self.assertEqual(result.points, 0)
+
+    def test_stats_rates_and_merge(self):
+        a = SelfPlayStats()
+        a.add(GameResult(Player.WHITE, 2, 40))
+        a.add(GameResult(Player.BLACK, 1, 20))
+        b = SelfPlayStats()
+        b.add(GameResult(Player.WHITE, 3, 30))
+        a.merge(b)
+        self.assertEqual(a.games, 3)
+        self.assertAlmostEqual(a.win_rate(Player.WHITE), 2 / 3)
+        self.assertAlmostEqual(a.gammon_rate(Player.WHITE), 1 / 3)
+        self.assertAlmostEqual(a.backgammon_rate(Player.WHITE), 1 / 3)
+        self.assertAlmostEqual(a.average_length, 30)
+
+    def test_seeded_games_are_reproducible(self):
+        a = SelfPlay(RandomPolicy(), RandomPolicy()).run(3, seed=11)
+        b = SelfPlay(RandomPolicy(), RandomPolicy()).run(3, seed=11)
+        self.assertEqual(a.total_turns, b.total_turns)
+        self.assertEqual(a.wins, b.wins)
+
+    def test_game_seed_streams_are_distinct(self):
+        seeds = {game_seed(5, i) for i in range(1000)}
+        self.assertEqual(len(seeds), 1000)
+        self.assertNotEqual(game_seed(5, 0), game_seed(6, 0))
+
+    def test_farm_result_independent_of_worker_count(self):
+        one = SelfPlayFarm(workers=1, chunk_size=2).run(6, seed=3)
+        two = SelfPlayFarm(workers=2, chunk_size=2).run(6, seed=3)
+        self.assertEqual(one.games, 6)
+        self.assertEqual((one.total_turns, one.wins, one.gammons), (two.total_turns, two.wins, two.gammons))
+
+    def test_farm_progress_and_bad_policy(self):
+        seen = []
+        SelfPlayFarm(workers=1, chunk_size=2).run(4, seed=1, on_progress=lambda st: seen.append(st.games))
+        self.assertEqual(seen, [2, 4])
+        with self.assertRaises(ValueError):
+            SelfPlayFarm(white="nope")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,178 @@
+import asyncio
+import json
+import unittest
+from unittest.mock import AsyncMock, MagicMock
+
+from backgammon.core.dice import Dice
+from backgammon.core.exceptions import InvalidCommand, GameNotStrated, DiceNotRolled
+from backgammon.server.server import GameServer, Lobby, Table, error_message
+
+
+def scripted_table(rolls) -> Table:
+    table = Table("t1")
+    table.game.__dice__ = Dice.scripted(rolls)
+    return table
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTable(unittest.TestCase):
+    def test_cli_verbs(self):
+        table = scripted_table([(5, 2), (3, 1)])
+        with self.assertRaises(GameNotStrated):
+            table.handle("roll", [])
+        response = table.handle("start", ["Ana", "Beto"])
+        self.assertEqual(response["state"]["names"], {"WHITE": "Ana", "BLACK": "Beto"})
+        self.assertEqual(table.handle("roll", [])["draw"], [5, 2])
+        response = table.handle("roll", [])
+        self.assertEqual((response["roll"], response["state"]["remaining"]), ([3, 1], [3, 1]))
+        with self.assertRaises(InvalidCommand):
+            table.handle("roll", [])
+        with self.assertRaises(InvalidCommand):
+            table.handle("pass", [])          #Quedan dados y hay movimientos
+        table.handle("move", ["7", "3"])
+        response = table.handle("move", [5, 1])
+        self.assertEqual(response["state"]["remaining"], [])
+        response = table.handle("pass", [])
+        self.assertEqual(response["state"]["player"], "BLACK")
+        self.assertEqual(len(response["state"]["position_id"]), 14)
+        self.assertIn("Juega: BLACK", table.handle("status", [])["status"])
+        self.assertEqual(len(table.handle("board", [])["cells"]), 28)
+        with self.assertRaises(DiceNotRolled):
+            table.handle("pass", [])
+
+    def test_bad_moves(self):
+        table = scripted_table([(5, 2), (3, 1)])
+        table.handle("start", [])
+        table.handle("roll", [])
+        table.handle("roll", [])
+        for args in (["7"], ["x", "3"], ["30", "3"], ["7", "9"], ["7", "4"]):
+            with self.assertRaises(InvalidCommand):
+                table.handle("move", args)
+        with self.assertRaises(InvalidCommand):
+            table.handle("fly", [])
+
+    def test_error_messages(self):
+        self.assertEqual(error_message(InvalidCommand("Uso: roll")), "Uso: roll")
+        self.assertEqual(error_message(GameNotStrated()), "GameNotStrated: La partida todavia no ha comenzado")
+
+
+class TestLobby(unittest.TestCase):
+    def test_create_and_evict(self):
+        clock = FakeClock()
+        lobby = Lobby(max_tables=3, seed=1, clock=clock)
+        first = lobby.create()
+        lobby.create("final")
+        self.assertEqual(lobby.ids(), [first.table_id, "final"])
+        with self.assertRaises(InvalidCommand):
+            lobby.create("final")
+        lobby.create()
+        with self.assertRaises(InvalidCommand):
+            lobby.create()
+        clock.now = 100
+        lobby.get("final").handle("status", [])
+        evicted = lobby.evict_idle(50)
+        self.assertEqual(len(evicted), 2)
+        self.assertEqual(lobby.ids(), ["final"])
+        with self.assertRaises(InvalidCommand):
+            lobby.get(first.table_id)
+
+    def test_seeded_tables_are_reproducible(self):
+        rolls = []
+        for _ in range(2):
+            table = Lobby(seed=9).create("mesa")
+            table.handle("start", [])
+            rolls.append([table.handle("roll", []).get("draw")] + [table.game.dice.roll() for _ in range(5)])
+        self.assertEqual(rolls[0], rolls[1])
+
+
+class TestGameServer(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.server = GameServer(port=0, seed=3)
+        await self.server.start()
+        self.host, self.port = self.server.address
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    async def connect(self):
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+
+        async def request(message=None, raw=None):
+            writer.write(raw if raw is not None else json.dumps(message).encode() + b"\n")
+            await writer.drain()
+            return json.loads(await asyncio.wait_for(reader.readline(), 5))
+        return reader, writer, request
+
+    async def test_protocol(self):
+        _, writer, request = await self.connect()
+        self.assertEqual(await request({"cmd": "ping", "id": 1}), {"pong": True, "ok": True, "id": 1})
+        created = await request({"cmd": "new"})
+        table = created["table"]
+        self.assertTrue(created["ok"])
+        response = await request({"table": table, "cmd": "start", "args": ["Ana", "Beto"], "id": "a"})
+        self.assertEqual((response["ok"], response["id"]), (True, "a"))
+        draw = await request({"table": table, "cmd": "roll"})
+        self.assertIn(draw["state"]["player"], ("WHITE", "BLACK"))
+        error = await request({"table": table, "cmd": "move", "args": ["bar", "3"]})
+        self.assertFalse(error["ok"])
+        self.assertFalse((await request(raw=b"{no es json\n"))["ok"])
+        self.assertFalse((await request({"table": "nada", "cmd": "status"}))["ok"])
+        self.assertEqual((await request({"cmd": "tables"}))["tables"], [table])
+        writer.close()
+
+    def test_invalid_utf8(self):
+        response = self.server.__answer__(b'\xff\xfe{}\n', None)
+        self.assertEqual(response, {"ok": False, "error": "El pedido no es UTF-8 valido"})
+
+    async def test_connection_reset_on_drain(self):
+        reader = MagicMock()
+        reader.readline = AsyncMock(side_effect=[b'{"cmd": "ping"}\n', b""])
+        writer = MagicMock()
+        writer.is_closing.return_value = False
+        writer.transport.get_write_buffer_size.return_value = 0
+        writer.drain = AsyncMock(side_effect=ConnectionResetError())
+        await self.server.__client__(reader, writer)  #No se escapa la excepcion
+        writer.close.assert_called_once()
+        self.assertEqual(reader.readline.await_count, 1)
+        self.assertEqual(self.server.connections, 0)
+
+    async def test_watchers_get_updates(self):
+        _, first, request = await self.connect()
+        table = (await request({"cmd": "new", "args": ["final"]}))["table"]
+        reader2, second, request2 = await self.connect()
+        await request2({"table": table, "cmd": "status"})
+        await request({"table": table, "cmd": "start"})
+        update = json.loads(await asyncio.wait_for(reader2.readline(), 5))
+        self.assertEqual((update["event"], update["cmd"], update["table"]), ("update", "start", "final"))
+        self.assertTrue(update["state"]["started"])
+        self.assertEqual(self.server.connections, 2)
+
+        #Desalojo por inactividad: se avisa a quienes miraban la mesa
+        evicted = self.server.evict_idle(now=float("inf"))
+        self.assertEqual([t.table_id for t in evicted], ["final"])
+        notice = json.loads(await asyncio.wait_for(reader2.readline(), 5))
+        self.assertEqual(notice, {"event": "evicted", "table": "final"})
+        first.close()
+        second.close()
+
+    async def test_many_tables(self):
+        _, writer, request = await self.connect()
+        for _ in range(200):
+            table = (await request({"cmd": "new"}))["table"]
+            await request({"table": table, "cmd": "start"})
+            await request({"table": table, "cmd": "roll"})
+        self.assertEqual(len(self.server.lobby), 200)
+        for table_id in self.server.lobby.ids():
+            self.assertIsNotNone(self.server.lobby.get(table_id).game.current_player)
+        writer.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import copy
+import unittest
+
+from backgammon.core.board import Board
+from backgammon.core.player import Player
+from backgammon.ai.search import ExpectiminimaxSearch
+from backgammon.ai.transposition import TranspositionTable, ENTRY_BYTES, EXACT, LOWER
+from backgammon.tests.test_search import endgame_board, plain_expectimax
+
+
+class TestTranspositionTable(unittest.TestCase):
+    def test_memory_is_capped(self):
+        t = TranspositionTable(max_bytes=10 * ENTRY_BYTES)
+        self.assertEqual(t.capacity, 10)
+        self.assertLessEqual(t.memory_bytes, 10 * ENTRY_BYTES)
+        with self.assertRaises(ValueError):
+            TranspositionTable(max_bytes=ENTRY_BYTES)
+
+    def test_store_and_probe(self):
+        t = TranspositionTable(max_bytes=1024)
+        t.store(12345, 2, 0.25, LOWER)
+        self.assertEqual(t.probe(12345, 2), (0.25, LOWER))
+        self.assertEqual(t.probe(12345, 1), (0.25, LOWER))
+        self.assertIsNone(t.probe(12345, 3))  #Demasiado superficial
+        self.assertIsNone(t.probe(999, 1))
+        self.assertEqual((t.hits, t.misses), (2, 2))
+        self.assertEqual(len(t), 1)
+
+    def test_deeper_entry_survives_in_same_search(self):
+        t = TranspositionTable(max_bytes=2 * ENTRY_BYTES)  #Un solo bucket
+        t.store(1, 3, 0.5)
+        t.store(2, 1, 0.1)
+        t.store(3, 1, 0.2)  #Pisa al 2 (lugar de lo reciente), no al 1
+        self.assertEqual(t.probe(1, 3), (0.5, EXACT))
+        self.assertIsNone(t.probe(2, 1))
+        self.assertEqual(t.probe(3, 1), (0.2, EXACT))
+        self.assertEqual(t.evictions, 1)
+
+    def test_old_generation_is_replaced(self):
+        t = TranspositionTable(max_bytes=2 * ENTRY_BYTES)
+        t.store(1, 3, 0.5)
+        t.store(2, 2, 0.1)
+        t.new_search()
+        t.store(3, 1, 0.2)  #El 1 es de la busqueda anterior: baja al otro lugar
+        self.assertEqual(t.probe(3, 1), (0.2, EXACT))
+        self.assertEqual(t.probe(1, 3), (0.5, EXACT))
+        self.assertIsNone(t.probe(2, 1))
+
+    def test_shallower_result_does_not_overwrite(self):
+        t = TranspositionTable(max_bytes=1024)
+        t.store(7, 3, 0.5)
+        t.store(7, 1, 0.9)
+        self.assertEqual(t.probe(7, 1), (0.5, EXACT))
+
+    def test_clear(self):
+        t = TranspositionTable(max_bytes=1024)
+        t.store(7, 1, 0.5)
+        t.clear()
+        self.assertEqual(len(t), 0)
+        self.assertEqual(t.stats()["stores"], 0)
+
+    def test_copy_protocol(self):
+        t = TranspositionTable(max_bytes=1024)
+        t.store(7, 1, 0.5)
+        self.assertEqual(copy.copy(t).probe(7, 1), (0.5, EXACT))
+
+
+class TestSearchWithTable(unittest.TestCase):
+    def test_same_value_as_plain_expectimax(self):
+        b = endgame_board()
+        expected = plain_expectimax(ExpectiminimaxSearch(), b, Player.WHITE, 2)
+        search = ExpectiminimaxSearch(table=TranspositionTable(max_bytes=1 << 20))
+        self.assertAlmostEqual(search.chance_value(b, Player.WHITE, 2), expected)
+        self.assertAlmostEqual(search.chance_value(b, Player.WHITE, 2), expected)
+        self.assertGreater(search.table.hits, 0)
+
+    def test_transpositions_save_nodes(self):
+        b = endgame_board()
+        plain = ExpectiminimaxSearch()
+        cached = ExpectiminimaxSearch(table=TranspositionTable(max_bytes=1 << 20))
+        plain.best_play(b, Player.WHITE, (3, 1), depth=3)
+        cached.best_play(b, Player.WHITE, (3, 1), depth=3)
+        self.assertLess(cached.nodes, plain.nodes)
+
+    def test_best_play_unchanged(self):
+        b = Board()
+        plain = ExpectiminimaxSearch().best_play(b, Player.WHITE, (6, 5), depth=2)
+        cached = ExpectiminimaxSearch(table=TranspositionTable(max_bytes=1 << 16)).best_play(
+            b, Player.WHITE, (6, 5), depth=2)
+        self.assertEqual(plain[0], cached[0])
+        self.assertAlmostEqual(plain[1], cached[1])
+
+
+if __name__ == "__main__":
+    unittest.main()